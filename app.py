@@ -3,7 +3,12 @@
 import os
 import sys
 import json
-from flask import Flask, render_template, jsonify, request
+import math
+import threading
+import time
+import uuid
+from flask import Flask, render_template, jsonify, request, Response, make_response
+from markupsafe import escape
 
 # --- Configuração de Path ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -11,39 +16,280 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Importe suas funções de algoritmo
 # ----------------------------------------------------
 from src.algorithms.prim import prim_mst
+from src.algorithms.kruskal import kruskal_mst
+from src.algorithms.boruvka import boruvka_mst
 from src.algorithms.bellman_ford import bellman_ford 
 from src.algorithms.floyd_warshall import floyd_warshall
-from src.dot_parser import parse_dot
+from src.algorithms.dijkstra import dijkstra
+from src.algorithms.johnson import johnson
+from src.algorithms.dag import dag_longest_paths
+from src.algorithms.selector import choose_single_source, choose_all_pairs, choose_mst
+from src.algorithms.dynamic import DynamicShortestPaths, DynamicMST, to_mutable_graph
+from src.algorithms.point_to_point import (
+    DEFAULT_LANDMARKS, POINT_TO_POINT_METHODS, Landmarks, ShortestPathSearch, batch_shortest_paths, shortest_path
+)
+from src.cache import GraphCache, ResultCache, LRUCache, estimate_graph_size
+from src.snapshot import load_graph
+from src.catalog import GraphCatalog
+from src.jobs import JobQueue, JobCancelled, QueueFullError, FINISHED_STATES, DONE
+from src.instrumentation import MetricsRegistry, phase, profiling, start_memory_tracing
+from src.columnar import MSGPACK_MIMETYPE, encode_payload, to_columnar
 
 app = Flask(__name__)
 
+# Início da carga do servidor (para o tempo de inicialização em /ready)
+STARTED_AT = time.perf_counter()
+
 # --- Constantes de Pastas ---
 GRAPH_DIR = os.path.join(BASE_DIR, 'graphs')
 DIGRAPH_DIR = os.path.join(BASE_DIR, 'digraphs')
 
+# --- Cache de grafos já interpretados ---
+# Evita reler e reinterpretar o mesmo arquivo .dot a cada requisição.
+# Os arquivos .dot/.gv são lidos pelo parser em fluxo, direto para a forma
+# compacta (CompactGraph) usada pelos algoritmos; os snapshots .grs são
+# abertos com mmap (ver src/snapshot.py).
+GRAPH_CACHE_MAX_ENTRIES = int(os.environ.get('GRAPH_CACHE_MAX_ENTRIES', 32))
+GRAPH_CACHE_MAX_MB = int(os.environ.get('GRAPH_CACHE_MAX_MB', 256))
+graph_cache = GraphCache(
+    max_entries=GRAPH_CACHE_MAX_ENTRIES,
+    max_bytes=GRAPH_CACHE_MAX_MB * 1024 * 1024,
+    loader=load_graph
+)
+
+# --- Catálogo dos grafos disponíveis ---
+# Índice em memória dos arquivos de GRAPH_DIR e DIGRAPH_DIR (tamanho, mtime,
+# vértices, arestas, pesos negativos, hash e algoritmos recomendados),
+# atualizado por um watcher a cada CATALOG_POLL_SECONDS (ver src/catalog.py).
+# A lista de arquivos é lida uma vez aqui; as estatísticas são calculadas
+# pelo watcher, fora das requisições, lendo os arquivos direto (load_graph):
+# o graph_cache fica só com os grafos que as requisições usam.
+CATALOG_POLL_SECONDS = float(os.environ.get('CATALOG_POLL_SECONDS', 2.0))
+catalog = GraphCatalog(
+    {'undirected': GRAPH_DIR, 'directed': DIGRAPH_DIR},
+    loader=load_graph,
+    interval=CATALOG_POLL_SECONDS
+)
+catalog.scan()
+
+# --- Cache de resultados dos algoritmos ---
+# Reaproveita o resultado de (grafo, algoritmo, vértice inicial) já calculado.
+# Resultados acima de RESULT_CACHE_MAX_MB (consultados em blocos pela página)
+# ficam à parte: só os RESULT_CACHE_LARGE_ENTRIES mais recentes. Resultados
+# com as matrizes em disco (FLOYD_WARSHALL_MEMORY_MB) somam os arquivos até
+# RESULT_CACHE_SPILL_MAX_MB.
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 64))
+RESULT_CACHE_MAX_MB = int(os.environ.get('RESULT_CACHE_MAX_MB', 256))
+RESULT_CACHE_LARGE_ENTRIES = int(os.environ.get('RESULT_CACHE_LARGE_ENTRIES', 2))
+RESULT_CACHE_SPILL_MAX_MB = int(os.environ.get('RESULT_CACHE_SPILL_MAX_MB', 8192))
+result_cache = ResultCache(
+    max_entries=RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=RESULT_CACHE_MAX_MB * 1024 * 1024,
+    large_entries=RESULT_CACHE_LARGE_ENTRIES,
+    max_disk_bytes=RESULT_CACHE_SPILL_MAX_MB * 1024 * 1024
+)
+
+# Modo do Bellman-Ford: 'classic', 'early_exit' ou 'spfa' (ver bellman_ford.py)
+BELLMAN_FORD_MODE = os.environ.get('BELLMAN_FORD_MODE', 'spfa')
+
+# Nº de processos para execuções com várias origens (ex: Dijkstra de cada
+# vértice no Johnson) e para os blocos do Floyd-Warshall em disco.
+# 1 = em série; 0 = todos os núcleos da máquina.
+PARALLEL_WORKERS = int(os.environ.get('PARALLEL_WORKERS', 1)) or None
+
+# Limite de memória (MB) das matrizes V x V do Floyd-Warshall: acima dele,
+# as matrizes vão para arquivos mapeados em FLOYD_WARSHALL_SPILL_DIR (vazio =
+# diretório temporário do sistema) e são processadas em blocos.
+FLOYD_WARSHALL_MEMORY_MB = int(os.environ.get('FLOYD_WARSHALL_MEMORY_MB', 1024))
+FLOYD_WARSHALL_SPILL_DIR = os.environ.get('FLOYD_WARSHALL_SPILL_DIR') or None
+
+# Funções de cada algoritmo, no formato f(graph, start_vertex, progress).
+# 'progress' é o callback de progresso dos jobs (None fora deles); Prim e
+# Dijkstra são rápidos e não o usam.
+ALGORITHM_FUNCTIONS = {
+    'prim': lambda graph, start_vertex, progress: prim_mst(graph, start_vertex),
+    'kruskal': lambda graph, start_vertex, progress: kruskal_mst(graph),
+    'boruvka': lambda graph, start_vertex, progress: boruvka_mst(graph, max_workers=PARALLEL_WORKERS),
+    'bellman_ford': lambda graph, start_vertex, progress: bellman_ford(graph, start_vertex, mode=BELLMAN_FORD_MODE, progress=progress),
+    'dijkstra': lambda graph, start_vertex, progress: dijkstra(graph, start_vertex),
+    'floyd_warshall': lambda graph, start_vertex, progress: floyd_warshall(
+        graph, progress=progress, memory_budget=FLOYD_WARSHALL_MEMORY_MB * 1024 * 1024,
+        max_workers=PARALLEL_WORKERS, spill_dir=FLOYD_WARSHALL_SPILL_DIR
+    ),
+    'johnson': lambda graph, start_vertex, progress: johnson(graph, max_workers=PARALLEL_WORKERS, progress=progress),
+    'dag_longest': lambda graph, start_vertex, progress: dag_longest_paths(graph, start_vertex),
+}
+
+# Algoritmos que não usam vértice inicial
+ALL_PAIRS_ALGORITHMS = ('floyd_warshall', 'johnson')
+FOREST_ALGORITHMS = ('kruskal', 'boruvka')
+
+# Acima deste nº de vértices, a página de resultados não traz a matriz V x V:
+# o navegador busca a matriz em blocos (tiles) pela API /api/all-pairs/tile.
+ALL_PAIRS_INLINE_MAX_VERTICES = int(os.environ.get('ALL_PAIRS_INLINE_MAX_VERTICES', 100))
+TILE_SIZE = 50        # Lado padrão de um bloco (linhas x colunas)
+MAX_TILE_SIZE = 500   # Lado máximo aceito pela API
+STREAM_BLOCK_ROWS = 64  # Linhas da matriz lidas por vez no modo streaming
+
+# Acima deste nº de vértices, a API JSON (/api/run) não traz a matriz
+# entre todos os pares (V² células): use /api/all-pairs/tile ou /stream.
+JSON_ALL_PAIRS_MAX_VERTICES = int(os.environ.get('JSON_ALL_PAIRS_MAX_VERTICES', 2000))
+
+# --- Fila de jobs (execuções longas fora da requisição) ---
+# JOB_WORKERS: jobs executando ao mesmo tempo; JOB_MAX_QUEUED: jobs
+# aguardando (acima disso, novos pedidos recebem 503).
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_MAX_QUEUED = int(os.environ.get('JOB_MAX_QUEUED', 16))
+job_queue = JobQueue(max_workers=JOB_WORKERS, max_queued=JOB_MAX_QUEUED)
+
+# Tempo máximo (s) que GET /api/jobs/<id>?wait=N segura a requisição
+JOB_MAX_WAIT = 30
+
+# --- Sessões dinâmicas (atualização incremental após alterar arestas) ---
+# Cada sessão guarda uma cópia alterável do grafo e o estado do algoritmo
+# (ver src/algorithms/dynamic.py); as menos usadas são descartadas.
+DYNAMIC_MAX_SESSIONS = int(os.environ.get('DYNAMIC_MAX_SESSIONS', 16))
+DYNAMIC_MAX_MB = int(os.environ.get('DYNAMIC_MAX_MB', 256))
+dynamic_sessions = LRUCache(
+    max_entries=DYNAMIC_MAX_SESSIONS,
+    max_bytes=DYNAMIC_MAX_MB * 1024 * 1024,
+    sizeof=lambda session: estimate_graph_size(session['state'].graph) + session['state'].nbytes()
+)
+
+# --- Consultas ponto a ponto em lote (/api/shortest-paths/batch) ---
+# As buscas por origem (paradas cedo, retomáveis) ficam em cache entre as
+# chamadas, por (hash do grafo, origem). BATCH_MAX_PAIRS limita cada lote.
+BATCH_MAX_PAIRS = int(os.environ.get('BATCH_MAX_PAIRS', 10000))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', 1024))
+SEARCH_CACHE_MAX_MB = int(os.environ.get('SEARCH_CACHE_MAX_MB', 128))
+search_cache = LRUCache(
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+    max_bytes=SEARCH_CACHE_MAX_MB * 1024 * 1024,
+    sizeof=lambda search: search.nbytes()
+)
+
+# Marcos (landmarks) do modo ALT de /api/shortest-path, calculados uma vez
+# por (grafo, nº de marcos). MAX_LANDMARKS limita o pré-processamento.
+MAX_LANDMARKS = 32
+LANDMARK_CACHE_MAX_ENTRIES = int(os.environ.get('LANDMARK_CACHE_MAX_ENTRIES', 16))
+landmark_cache = LRUCache(
+    max_entries=LANDMARK_CACHE_MAX_ENTRIES,
+    max_bytes=SEARCH_CACHE_MAX_MB * 1024 * 1024,
+    sizeof=lambda landmarks: landmarks.nbytes()
+)
+
+# --- Modo de produção (grafos pré-carregados, ver wsgi.py) ---
+# Com PRELOAD_GRAPHS=1, todos os grafos de GRAPH_DIR e DIGRAPH_DIR são
+# carregados ao importar o app: com o gunicorn (preload_app), isso acontece
+# uma única vez no processo mestre, e os workers criados pelo fork
+# compartilham os grafos (copy-on-write), sem ler arquivos por requisição.
+PRELOAD_GRAPHS = os.environ.get('PRELOAD_GRAPHS', '0') == '1'
+startup = {
+    'ready': not PRELOAD_GRAPHS,
+    'preloaded': False,
+    'startup_seconds': None,
+    'graphs': [],
+    'errors': []
+}
+
+# --- Instrumentação (tempo por etapa, Server-Timing e /metrics) ---
+# Cada execução de algoritmo é medida por etapa (ver src/instrumentation.py)
+# e somada em 'metrics'. INSTRUMENT_MEMORY=1 liga também os picos de
+# memória por etapa (tracemalloc), que deixa as execuções mais lentas.
+metrics = MetricsRegistry()
+if os.environ.get('INSTRUMENT_MEMORY', '0') == '1':
+    start_memory_tracing()
+
 
 def get_available_graphs():
-    """Lê os diretórios e retorna os arquivos .dot ou .gv"""
-    graphs = []
-    digraphs = []
-    
-    # Tenta ler a pasta de grafos não direcionados
-    try:
-        graphs = [f for f in os.listdir(GRAPH_DIR) if f.endswith('.dot') or f.endswith('.gv')]
-    except FileNotFoundError:
-        print(f"Aviso: Diretório '{GRAPH_DIR}' não encontrado.")
-    except Exception as e:
-        print(f"Erro ao ler GRAPH_DIR: {e}")
+    """Retorna os arquivos .dot, .gv ou .grs listados no catálogo (sem acessar o disco)"""
+    listing = catalog.listing()
+    return listing['undirected'], listing['directed']
 
-    # Tenta ler a pasta de grafos direcionados
-    try:
-        digraphs = [f for f in os.listdir(DIGRAPH_DIR) if f.endswith('.dot') or f.endswith('.gv')]
-    except FileNotFoundError:
-        print(f"Aviso: Diretório '{DIGRAPH_DIR}' não encontrado.")
-    except Exception as e:
-        print(f"Erro ao ler DIGRAPH_DIR: {e}")
-        
-    return graphs, digraphs
+
+def graph_file_exists(filepath):
+    """
+    Verifica se o arquivo do grafo existe.
+
+    Consulta o catálogo em memória; o disco só é acessado para arquivos
+    fora dele (ex: criados depois da última varredura do watcher).
+    """
+    return catalog.contains(filepath) or os.path.exists(filepath)
+
+
+def preload_graphs():
+    """
+    Carrega todos os grafos listados em GRAPH_DIR e DIGRAPH_DIR no cache de
+    grafos, fixos (GraphCache.preload), e registra o resultado em 'startup'
+    (exposto em /ready).
+
+    Também monta o índice rótulo -> inteiro e o hash de conteúdo de cada
+    grafo e preenche o catálogo: feitos aqui, no processo mestre, ficam
+    compartilhados pelos workers em vez de serem refeitos por cada um.
+    """
+    graphs, digraphs = get_available_graphs()
+    for graph_type, directory, names in (('undirected', GRAPH_DIR, graphs), ('directed', DIGRAPH_DIR, digraphs)):
+        for name in names:
+            started = time.perf_counter()
+            filepath = os.path.join(directory, name)
+            try:
+                graph = graph_cache.preload(filepath)
+            except (OSError, ValueError) as e:
+                print(f"Erro [Pré-carga] {name}: {e}")
+                startup['errors'].append({'file': name, 'graph_type': graph_type, 'error': str(e)})
+                continue
+            compact = graph.freeze()
+            compact.index            # Montado no primeiro acesso
+            compact.content_hash()   # Calculado uma vez e guardado
+            catalog.update(filepath, graph, pinned=True)
+            startup['graphs'].append({
+                'file': name,
+                'graph_type': graph_type,
+                'vertices': compact.num_vertices(),
+                'edges': compact.num_edges(),
+                'bytes': estimate_graph_size(compact),
+                'load_ms': round((time.perf_counter() - started) * 1000, 3)
+            })
+
+    startup['preloaded'] = True
+    startup['startup_seconds'] = round(time.perf_counter() - STARTED_AT, 3)
+    startup['ready'] = True
+    print(f"[Pré-carga] {len(startup['graphs'])} grafo(s) carregado(s) em {startup['startup_seconds']} s")
+
+
+def resolve_graph_path(filename, graph_type):
+    """Retorna o caminho do arquivo do grafo conforme o tipo ('directed' ou não)."""
+    if graph_type == 'directed':
+        return os.path.join(DIGRAPH_DIR, filename)
+    return os.path.join(GRAPH_DIR, filename)
+
+
+def compute_algorithm(graph, algo, start_vertex=None, progress=None):
+    """
+    Executa um algoritmo sobre o grafo, reaproveitando o resultado do cache
+    de resultados quando o mesmo grafo/algoritmo/vértice já foi calculado.
+
+    :param graph: Objeto grafo (esperado de graph.py).
+    :param algo: Chave do algoritmo em ALGORITHM_FUNCTIONS.
+    :param start_vertex: Vértice inicial (ignorado pelos algoritmos entre todos os pares).
+    :param progress: Callback opcional de progresso (ver src/jobs.py).
+    :return: Uma cópia do dicionário de resultado do algoritmo.
+    """
+    if algo in ALL_PAIRS_ALGORITHMS or algo in FOREST_ALGORITHMS:
+        start_vertex = None
+    function = ALGORITHM_FUNCTIONS[algo]
+    # Com o resultado no cache, a etapa não tem sub-etapas do algoritmo
+    with phase('algorithm'):
+        return result_cache.get_or_compute(
+            graph, algo, start_vertex,
+            lambda: function(graph, start_vertex, progress)
+        )
+
+
+@app.before_request
+def start_catalog_watcher():
+    """Inicia o watcher do catálogo neste processo (no gunicorn, em cada worker)."""
+    catalog.start()
 
 
 @app.route('/')
@@ -56,18 +302,366 @@ def index():
 def api_get_graphs():
     """API endpoint para o JavaScript buscar os arquivos de grafo."""
     graphs, digraphs = get_available_graphs()
+    details = {'graphs': {}, 'digraphs': {}}
+    for entry in catalog.entries():
+        key = 'digraphs' if entry['graph_type'] == 'directed' else 'graphs'
+        details[key][entry['file']] = entry
     return jsonify({
         'graphs': graphs,
-        'digraphs': digraphs
+        'digraphs': digraphs,
+        'details': details
     })
 
-@app.route('/run-algorithm', methods=['POST'])
-def run_algorithm():
+
+@app.route('/api/catalog', methods=['GET'])
+def api_catalog():
+    """
+    API endpoint com o catálogo dos grafos: tamanho, mtime, vértices, arestas,
+    pesos negativos, hash e algoritmos recomendados de cada arquivo, além do
+    estado do watcher. Aceita ?graph_type=directed|undirected.
+    """
+    graph_type = request.args.get('graph_type')
+    if graph_type not in (None, 'directed', 'undirected'):
+        return jsonify({'success': False, 'error': "graph_type deve ser 'directed' ou 'undirected'."}), 400
+    return jsonify({
+        'success': True,
+        'graphs': catalog.entries(graph_type),
+        'watcher': catalog.stats()
+    })
+
+
+@app.route('/api/cache-stats', methods=['GET'])
+def api_cache_stats():
+    """API endpoint com os contadores do cache de grafos (hits, misses, ...)."""
+    return jsonify({
+        'graph_cache': graph_cache.stats(),
+        'result_cache': result_cache.stats(),
+        'search_cache': search_cache.stats(),
+        'landmark_cache': landmark_cache.stats()
+    })
+
+def load_all_pairs(args):
+    """
+    Carrega (do cache ou calculando) o resultado de um algoritmo entre todos
+    os pares, a partir dos parâmetros da query string: graph_file,
+    graph_type e algorithm ('floyd_warshall', 'johnson' ou 'auto_all_pairs').
+
+    :param args: request.args
+    :return: Tupla (context, None) em caso de sucesso, ou (None, resposta de
+             erro em JSON com o código HTTP).
+    """
+    filename = args.get('graph_file')
+    graph_type = args.get('graph_type')
+    algo = args.get('algorithm', 'floyd_warshall')
+
+    if not filename:
+        return None, (jsonify({'success': False, 'error': 'Parâmetro obrigatório: graph_file.'}), 400)
+    if algo not in ALL_PAIRS_ALGORITHMS and algo != 'auto_all_pairs':
+        return None, (jsonify({'success': False, 'error': f"Algoritmo '{algo}' não calcula todos os pares."}), 400)
+
+    filepath = resolve_graph_path(filename, graph_type)
+    if not graph_file_exists(filepath):
+        return None, (jsonify({'success': False, 'error': f'Arquivo não encontrado: {filename}'}), 404)
+
     try:
-        # 1. Obter dados do JSON enviado pelo JavaScript
-        data = request.get_json()
-        
-        # 2. Ler os dados do dicionário 'data'
+        graph = graph_cache.get(filepath)
+        engine = choose_all_pairs(graph) if algo == 'auto_all_pairs' else algo
+        context = compute_algorithm(graph, engine)
+    except ValueError as ve:
+        return None, (jsonify({'success': False, 'error': f'Erro de Valor (ex: parsing): {ve}'}), 400)
+
+    if not context['success']:
+        return None, (jsonify({'success': False, 'algorithm': context['algorithm'], 'error': context['error']}), 422)
+    return context, None
+
+
+def search_key(compact, source):
+    """Chave da busca de uma origem no search_cache."""
+    return (compact.content_hash(), source, BELLMAN_FORD_MODE)
+
+
+def cached_search(compact, source):
+    """
+    Retorna a busca (ShortestPathSearch) da origem, do cache ou nova.
+
+    A busca guardada continua de onde parou nas próximas consultas.
+    """
+    key = search_key(compact, source)
+    search = search_cache.get(key)
+    if search is None:
+        search = ShortestPathSearch(compact, source, BELLMAN_FORD_MODE)
+        search_cache.put(key, search)
+    return search
+
+
+@app.route('/api/shortest-paths/batch', methods=['POST'])
+def api_batch_shortest_paths():
+    """
+    API endpoint com as distâncias mínimas de muitos pares (origem, destino)
+    em uma única resposta.
+
+    JSON de entrada: graph_file, graph_type, pairs (lista de [origem,
+    destino]) e paths (opcional, true para incluir os caminhos). As
+    distâncias voltam na ordem de 'pairs' (null se não houver caminho).
+    """
+    data = request.get_json() or {}
+    filename = data.get('graph_file')
+    pairs = data.get('pairs')
+
+    if not filename or not isinstance(pairs, list) or not pairs:
+        return jsonify({'success': False, 'error': 'Parâmetros obrigatórios: graph_file e pairs.'}), 400
+    if len(pairs) > BATCH_MAX_PAIRS:
+        return jsonify({'success': False, 'error': f'No máximo {BATCH_MAX_PAIRS} pares por lote.'}), 413
+    if not all(isinstance(pair, list) and len(pair) == 2 for pair in pairs):
+        return jsonify({'success': False, 'error': 'Cada par deve ser uma lista [origem, destino].'}), 400
+    pairs = [(str(u), str(v)) for u, v in pairs]
+
+    filepath = resolve_graph_path(filename, data.get('graph_type'))
+    if not graph_file_exists(filepath):
+        return jsonify({'success': False, 'error': f'Arquivo não encontrado: {filename}'}), 404
+
+    with profiling() as profile:
+        try:
+            with phase('load'):
+                graph = graph_cache.get(filepath)
+        except ValueError as ve:
+            return jsonify({'success': False, 'error': f'Erro de Valor (ex: parsing): {ve}'}), 400
+        result = batch_shortest_paths(graph, pairs, cached_search, with_paths=bool(data.get('paths')))
+        if result['success']:
+            # As buscas cresceram ao expandir (settle): recalcula o tamanho no cache
+            compact = graph.freeze()
+            for source in {compact.index[u] for u, _ in pairs}:
+                search_cache.resize(search_key(compact, source))
+    metrics.record(profile, 'batch')
+
+    if not result['success']:
+        status = 404 if 'missing_vertices' in result else 422
+    else:
+        status = 200
+        # JSON não representa infinito: null indica que não há caminho
+        result['distances'] = [None if d == math.inf else d for d in result['distances']]
+    response = jsonify(result)
+    response.status_code = status
+    response.headers['Server-Timing'] = profile.server_timing()
+    return response
+
+
+def cached_landmarks(compact, num_landmarks):
+    """Retorna os marcos (Landmarks) do grafo, do cache ou calculando-os."""
+    key = (compact.content_hash(), num_landmarks)
+    landmarks = landmark_cache.get(key)
+    if landmarks is None:
+        with phase('landmarks'):
+            landmarks = Landmarks(compact, num_landmarks)
+        landmark_cache.put(key, landmarks)
+    return landmarks
+
+
+@app.route('/api/shortest-path', methods=['POST'])
+def api_shortest_path():
+    """
+    API endpoint com o caminho mínimo de um único par, sem executar o
+    algoritmo a partir da origem no grafo inteiro.
+
+    JSON de entrada: graph_file, graph_type, source, target, method
+    ('dijkstra', 'bidirectional' (padrão), 'astar' ou 'alt'), heuristic
+    (no 'astar': {vértice: estimativa da distância até o destino}) e
+    landmarks (no 'alt': nº de marcos, padrão DEFAULT_LANDMARKS).
+    A resposta inclui 'settled', o nº de vértices definidos pela busca.
+    """
+    data = request.get_json() or {}
+    filename = data.get('graph_file')
+    source = data.get('source')
+    target = data.get('target')
+    method = data.get('method', 'bidirectional')
+    heuristic = data.get('heuristic')
+
+    if not filename or not source or not target:
+        return jsonify({'success': False, 'error': 'Parâmetros obrigatórios: graph_file, source e target.'}), 400
+    if method not in POINT_TO_POINT_METHODS:
+        return jsonify({'success': False, 'error': f"Método desconhecido: '{method}' (use {', '.join(POINT_TO_POINT_METHODS)})."}), 400
+    if heuristic is not None and not isinstance(heuristic, dict):
+        return jsonify({'success': False, 'error': "'heuristic' deve ser um objeto {vértice: estimativa}."}), 400
+    for vertex, estimate in (heuristic or {}).items():
+        if isinstance(estimate, bool) or not isinstance(estimate, (int, float)) \
+                or not math.isfinite(estimate) or estimate < 0:
+            return jsonify({'success': False, 'error': f"'heuristic': estimativa inválida para '{vertex}' ({estimate!r}); use um número finito e não negativo."}), 400
+    try:
+        num_landmarks = min(max(1, int(data.get('landmarks', DEFAULT_LANDMARKS))), MAX_LANDMARKS)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': "'landmarks' deve ser um número inteiro."}), 400
+
+    filepath = resolve_graph_path(filename, data.get('graph_type'))
+    if not graph_file_exists(filepath):
+        return jsonify({'success': False, 'error': f'Arquivo não encontrado: {filename}'}), 404
+
+    with profiling() as profile:
+        try:
+            with phase('load'):
+                graph = graph_cache.get(filepath)
+        except ValueError as ve:
+            return jsonify({'success': False, 'error': f'Erro de Valor (ex: parsing): {ve}'}), 400
+        compact = graph.freeze()
+        landmarks = None
+        if method == 'alt' and not compact.has_negative_weights and compact.num_vertices():
+            landmarks = cached_landmarks(compact, num_landmarks)
+        result = shortest_path(compact, str(source), str(target), method, heuristic, landmarks)
+    metrics.record(profile, result['algorithm'])
+
+    if result['success'] and result['distance'] == math.inf:
+        result['distance'] = None  # JSON não representa infinito
+    response = jsonify(result)
+    response.status_code = 200 if result['success'] else 400
+    response.headers['Server-Timing'] = profile.server_timing()
+    return response
+
+
+def json_distances(rows):
+    """Troca math.inf por None (JSON não representa infinito)."""
+    return [[None if d == math.inf else d for d in row] for row in rows]
+
+
+@app.route('/api/pair', methods=['GET'])
+def api_pair():
+    """
+    API endpoint com a distância e o caminho mínimo de um único par (u, v),
+    a partir do resultado (em cache) de um algoritmo entre todos os pares.
+
+    Parâmetros (query string): graph_file, graph_type, algorithm, source e target.
+    """
+    source = request.args.get('source')
+    target = request.args.get('target')
+    if not source or not target:
+        return jsonify({'success': False, 'error': 'Parâmetros obrigatórios: source e target.'}), 400
+
+    context, error = load_all_pairs(request.args)
+    if error:
+        return error
+
+    results = context['results']
+    try:
+        distance = results.distance(source, target)
+        path = results.path(source, target)
+    except KeyError as e:
+        return jsonify({'success': False, 'error': f'Vértice não encontrado no grafo: {e.args[0]}'}), 404
+
+    return jsonify({
+        'success': True,
+        'algorithm': context['algorithm'],
+        'source': source,
+        'target': target,
+        # JSON não representa infinito: null indica que não há caminho
+        'distance': distance if distance != float('inf') else None,
+        'path': path
+    })
+
+
+@app.route('/api/all-pairs/tile', methods=['GET'])
+def api_all_pairs_tile():
+    """
+    API endpoint paginado: um bloco (tile) da matriz de distâncias.
+
+    Parâmetros (query string): graph_file, graph_type, algorithm,
+    row_start, col_start, rows e cols (tamanho do bloco, padrão TILE_SIZE)
+    e paths=1 para incluir os caminhos do bloco.
+    """
+    context, error = load_all_pairs(request.args)
+    if error:
+        return error
+
+    results = context['results']
+    num_rows = len(results.sources)
+    num_cols = len(results.vertices)
+
+    row_start = max(0, request.args.get('row_start', 0, type=int))
+    col_start = max(0, request.args.get('col_start', 0, type=int))
+    row_count = min(max(1, request.args.get('rows', TILE_SIZE, type=int)), MAX_TILE_SIZE)
+    col_count = min(max(1, request.args.get('cols', TILE_SIZE, type=int)), MAX_TILE_SIZE)
+    row_stop = min(row_start + row_count, num_rows)
+    col_stop = min(col_start + col_count, num_cols)
+
+    row_labels = results.sources[row_start:row_stop]
+    col_labels = results.vertices[col_start:col_stop]
+    tile = {
+        'success': True,
+        'algorithm': context['algorithm'],
+        'num_rows': num_rows,
+        'num_cols': num_cols,
+        'row_start': row_start,
+        'col_start': col_start,
+        'rows': row_labels,
+        'cols': col_labels,
+        'distances': json_distances(results.distance_block(row_start, row_stop, col_start, col_stop))
+    }
+    if request.args.get('paths') == '1':
+        tile['paths'] = [[results.path(u, v) for v in col_labels] for u in row_labels]
+    return jsonify(tile)
+
+
+@app.route('/api/all-pairs/stream', methods=['GET'])
+def api_all_pairs_stream():
+    """
+    API endpoint com a matriz de distâncias completa, enviada em partes
+    (chunked) à medida que é gerada, sem montar a resposta inteira na memória.
+
+    Parâmetros (query string): graph_file, graph_type, algorithm e
+    format: 'ndjson' (padrão; uma linha JSON por origem, precedida de um
+    cabeçalho com os vértices) ou 'html' (uma tabela, linha a linha).
+    """
+    context, error = load_all_pairs(request.args)
+    if error:
+        return error
+
+    results = context['results']
+    sources = results.sources
+    vertices = results.vertices
+    num_cols = len(vertices)
+
+    def row_blocks():
+        """Percorre a matriz em blocos de STREAM_BLOCK_ROWS linhas."""
+        for start in range(0, len(sources), STREAM_BLOCK_ROWS):
+            block = results.distance_block(start, start + STREAM_BLOCK_ROWS, 0, num_cols)
+            yield sources[start:start + STREAM_BLOCK_ROWS], json_distances(block)
+
+    def generate_ndjson():
+        yield json.dumps({'algorithm': context['algorithm'], 'vertices': vertices}, ensure_ascii=False) + '\n'
+        for labels, block in row_blocks():
+            yield ''.join(
+                json.dumps({'source': u, 'distances': row}, ensure_ascii=False) + '\n'
+                for u, row in zip(labels, block)
+            )
+
+    def generate_html():
+        header = ''.join(f'<th>{escape(v)}</th>' for v in vertices)
+        yield f'<table class="results-table"><thead><tr><th>De \\ Para</th>{header}</tr></thead><tbody>\n'
+        for labels, block in row_blocks():
+            yield ''.join(
+                f'<tr><th>{escape(u)}</th>'
+                + ''.join('<td>∞</td>' if d is None else f'<td>{d:.2f}</td>' for d in row)
+                + '</tr>\n'
+                for u, row in zip(labels, block)
+            )
+        yield '</tbody></table>\n'
+
+    if request.args.get('format', 'ndjson') == 'html':
+        return Response(generate_html(), mimetype='text/html')
+    return Response(generate_ndjson(), mimetype='application/x-ndjson')
+
+
+def execute_algorithm(data, progress=None):
+    """
+    Executa o algoritmo pedido (mesmos campos do JSON de /run-algorithm) e
+    monta o contexto do template de resultados.
+
+    Usada tanto na requisição síncrona (/run-algorithm) quanto nos jobs
+    (/api/jobs), onde 'progress' é o callback de progresso do job.
+
+    :param data: Dicionário com graph_file, algorithm, graph_type e start_vertex.
+    :param progress: Callback opcional de progresso (ver src/jobs.py).
+    :return: Tupla (context, status_code) para o results.html.
+    """
+    try:
+        # 1. Ler os dados do dicionário 'data'
         filename = data.get('graph_file')
         algo = data.get('algorithm')
         graph_type = data.get('graph_type')
@@ -78,74 +672,473 @@ def run_algorithm():
             start_vertex = None
 
         if not filename or not algo:
-            return render_template('results.html', success=False, error="Nome do arquivo ou algoritmo faltando."), 400
+            return {'success': False, 'error': "Nome do arquivo ou algoritmo faltando."}, 400
 
-        # 3. Encontrar o caminho do arquivo e carregar o grafo
-        if graph_type == 'directed':
-            filepath = os.path.join(DIGRAPH_DIR, filename)
-        else:
-            filepath = os.path.join(GRAPH_DIR, filename)
+        # 2. Encontrar o caminho do arquivo e carregar o grafo
+        filepath = resolve_graph_path(filename, graph_type)
 
-        if not os.path.exists(filepath):
-            return render_template('results.html', success=False, error=f"Arquivo não encontrado: {filename}"), 404
+        if not graph_file_exists(filepath):
+            return {'success': False, 'error': f"Arquivo não encontrado: {filename}"}, 404
 
-        graph = parse_dot(filepath)
+        with phase('load'):
+            graph = graph_cache.get(filepath)
 
-        # --- 4. Executar o algoritmo selecionado ---
+        # --- 3. Executar o algoritmo selecionado ---
         
         if algo == 'prim':
             if not start_vertex:
-                return render_template('results.html', success=False, algorithm='Prim', error="Vértice inicial não fornecido para o Prim.")
+                return {'success': False, 'algorithm': 'Prim', 'error': "Vértice inicial não fornecido para o Prim."}, 200
             
             # Chama o algoritmo
-            context = prim_mst(graph, start_vertex)
+            context = compute_algorithm(graph, 'prim', start_vertex, progress)
             
             # Adiciona informações extras ao contexto para o template
             context['algorithm'] = 'Prim'
             context['filename'] = filename
             context['start_vertex'] = start_vertex
-            return render_template('results.html', **context)
+            return context, 200
         
+        elif algo in ('kruskal', 'boruvka', 'auto_mst'):
+
+            # No modo automático, escolhe o motor pela densidade do grafo.
+            # Sem vértice inicial, o Prim monta a floresta de todos os componentes.
+            engine = choose_mst(graph) if algo == 'auto_mst' else algo
+
+            # Chama o algoritmo
+            context = compute_algorithm(graph, engine, progress=progress)
+
+            # Adiciona informações extras ao contexto
+            context['filename'] = filename
+            context['engine'] = context['algorithm']
+            context['auto_selected'] = (algo == 'auto_mst')
+            return context, 200
+
         elif algo == 'bellman_ford':
             if not start_vertex:
-                return render_template('results.html', success=False, algorithm='Bellman-Ford', error="Vértice inicial não fornecido para o Bellman-Ford.")
+                return {'success': False, 'algorithm': 'Bellman-Ford', 'error': "Vértice inicial não fornecido para o Bellman-Ford."}, 200
             
             # Chama o algoritmo
-            context = bellman_ford(graph, start_vertex)
+            context = compute_algorithm(graph, 'bellman_ford', start_vertex, progress)
             
             # Adiciona informações extras ao contexto
             context['filename'] = filename
             # (bellman_ford já adiciona 'algorithm' e 'start_vertex' ao context)
-            return render_template('results.html', **context)
-        
-        elif algo == 'floyd_warshall':
+            return context, 200
+
+        elif algo == 'dag_longest':
+            if not start_vertex:
+                return {'success': False, 'algorithm': 'DAG', 'error': "Vértice inicial não fornecido para os caminhos mais longos."}, 200
+
+            # Chama o algoritmo (falha com uma mensagem se o grafo tiver ciclos)
+            context = compute_algorithm(graph, 'dag_longest', start_vertex, progress)
+
+            # Adiciona informações extras ao contexto
+            context['filename'] = filename
+            return context, 200
+
+        elif algo in ('dijkstra', 'auto'):
+            if not start_vertex:
+                return {'success': False, 'algorithm': 'Dijkstra', 'error': "Vértice inicial não fornecido para o Dijkstra."}, 200
+
+            # No modo automático, escolhe o motor pelos pesos (verificados no parsing)
+            engine = choose_single_source(graph) if algo == 'auto' else 'dijkstra'
 
             # Chama o algoritmo
-            context = floyd_warshall(graph)
+            context = compute_algorithm(graph, engine, start_vertex, progress)
 
-            print(context)
+            # Adiciona informações extras ao contexto
+            context['filename'] = filename
+            context['engine'] = context.get('algorithm')
+            context['auto_selected'] = (algo == 'auto')
+            return context, 200
+        
+        elif algo in ('floyd_warshall', 'johnson', 'auto_all_pairs'):
+
+            # No modo automático, escolhe o motor pela densidade do grafo
+            engine = choose_all_pairs(graph) if algo == 'auto_all_pairs' else algo
+
+            # Chama o algoritmo
+            context = compute_algorithm(graph, engine, progress=progress)
 
             # Adiciona informações extras ao contexto
             context['filename'] = filename
-            context['algorithm'] = 'Floyd-Warshall'
+            context.setdefault('algorithm', 'Floyd-Warshall')
+            context['engine'] = context['algorithm']
+            context['auto_selected'] = (algo == 'auto_all_pairs')
 
-            return render_template('results.html', **context)
+            # Grafos grandes: a matriz é buscada em blocos pelo navegador
+            if context['success'] and len(context['results'].vertices) > ALL_PAIRS_INLINE_MAX_VERTICES:
+                context['tiled'] = {
+                    'graph_file': filename,
+                    'graph_type': graph_type or 'undirected',
+                    'algorithm': engine,
+                    'num_vertices': len(context['results'].vertices),
+                    'tile_size': TILE_SIZE
+                }
+
+            return context, 200
         else:
-             return render_template('results.html', success=False, error=f"Erro: Algoritmo '{algo}' desconhecido."), 400
+             return {'success': False, 'error': f"Erro: Algoritmo '{algo}' desconhecido."}, 400
         # -----------------------------------------------------------
 
+    except JobCancelled:
+        raise  # Tratado pela fila de jobs
     except FileNotFoundError:
-        return render_template('results.html', success=False, error=f"Erro: O arquivo .dot não foi encontrado."), 404
+        return {'success': False, 'error': f"Erro: O arquivo .dot não foi encontrado."}, 404
     except ValueError as ve:
         # Erros de parsing do dot_parser ou outros erros de valor
-        return render_template('results.html', success=False, error=f"Erro de Valor (ex: parsing): {ve}"), 400
+        return {'success': False, 'error': f"Erro de Valor (ex: parsing): {ve}"}, 400
     except Exception as e:
         print(f"Ocorreu um erro interno: {e}")
         # Pega a linha do erro para debug
         exc_type, exc_obj, exc_tb = sys.exc_info()
         fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1] # type: ignore
         error_details = f"Erro interno: {e} (em {fname}, linha {exc_tb.tb_lineno})" # type: ignore
-        return render_template('results.html', success=False, error=error_details), 500
+        return {'success': False, 'error': error_details}, 500
+
+
+def profiled_execute(data, progress=None):
+    """
+    Executa execute_algorithm medindo suas etapas (carga, algoritmo, ...).
+
+    A medição é somada nas métricas e vai para o contexto do template
+    (chave 'profile').
+
+    :return: Tupla (context, status_code, profile).
+    """
+    with profiling() as profile:
+        context, status = execute_algorithm(data, progress)
+    context['profile'] = profile.to_dict()
+    metrics.record(profile, context.get('algorithm'))
+    return context, status, profile
+
+
+def render_results(context, status, profile):
+    """
+    Renderiza o results.html medindo a renderização e retorna a resposta
+    com o cabeçalho Server-Timing (etapas da execução + renderização).
+    """
+    with profiling() as render_profile:
+        with phase('render'):
+            html = render_template('results.html', **context)
+    metrics.record(render_profile, context.get('algorithm'))
+
+    response = make_response(html, status)
+    timings = [t for t in (profile.server_timing(), render_profile.server_timing()) if t]
+    response.headers['Server-Timing'] = ', '.join(timings)
+    return response
+
+
+def columnar_response(context, status, profile):
+    """
+    Monta a resposta da API JSON (formato colunar, ver src/columnar.py).
+
+    O formato vem de ?format=json|msgpack (ou do cabeçalho Accept) e o
+    corpo é comprimido com gzip quando o cliente aceita (Accept-Encoding).
+    """
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = 'msgpack' if MSGPACK_MIMETYPE in request.headers.get('Accept', '') else 'json'
+    compress = 'gzip' in request.headers.get('Accept-Encoding', '')
+
+    with profiling() as serialize_profile:
+        with phase('serialize'):
+            try:
+                payload = to_columnar(context, JSON_ALL_PAIRS_MAX_VERTICES)
+                body, mimetype, compressed = encode_payload(payload, fmt, compress)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 406
+    metrics.record(serialize_profile, context.get('algorithm'))
+
+    response = Response(body, status=status, mimetype=mimetype)
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    if compressed:
+        response.headers['Content-Encoding'] = 'gzip'
+    timings = [t for t in (profile.server_timing(), serialize_profile.server_timing()) if t]
+    response.headers['Server-Timing'] = ', '.join(timings)
+    return response
+
+
+@app.route('/run-algorithm', methods=['POST'])
+def run_algorithm():
+    """Executa o algoritmo dentro da requisição e retorna a página de resultados."""
+    return render_results(*profiled_execute(request.get_json()))
+
+
+@app.route('/api/run', methods=['POST'])
+def api_run():
+    """
+    API endpoint com o mesmo JSON de entrada de /run-algorithm, que retorna
+    o resultado em formato colunar (JSON ou MessagePack) em vez do HTML.
+    """
+    return columnar_response(*profiled_execute(request.get_json() or {}))
+
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """
+    API endpoint que cria um job com o mesmo JSON de /run-algorithm e
+    retorna seu id (202) sem esperar a execução.
+    """
+    data = request.get_json() or {}
+    description = {key: data.get(key) for key in ('graph_file', 'graph_type', 'algorithm', 'start_vertex')}
+    try:
+        job = job_queue.submit(profiled_execute, data, description=description)
+    except QueueFullError as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    return jsonify({'success': True, **job.to_dict()}), 202
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """
+    API endpoint com o status e o progresso de um job.
+
+    Com ?wait=N (segundos, até JOB_MAX_WAIT), segura a resposta até o job
+    terminar ou o tempo acabar (long-polling).
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job não encontrado.'}), 404
+
+    wait = min(max(request.args.get('wait', 0, type=float), 0), JOB_MAX_WAIT)
+    if wait:
+        job.wait(wait)
+    return jsonify({'success': True, **job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def api_job_result(job_id):
+    """
+    API endpoint com a página de resultados de um job concluído.
+
+    Com ?format=json ou ?format=msgpack, retorna o resultado no formato
+    colunar de /api/run.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return render_template('results.html', success=False, error='Job não encontrado.'), 404
+    if job.status not in FINISHED_STATES:
+        return render_template('results.html', success=False, error='O job ainda não terminou.'), 409
+    if job.status != DONE:
+        error = job.error or 'O job foi cancelado.'
+        return render_template('results.html', success=False, error=error), 410 if job.error is None else 500
+
+    if request.args.get('format'):
+        return columnar_response(*job.result)
+    return render_results(*job.result)
+
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """
+    Readiness: 200 quando o servidor pode receber requisições (no modo de
+    produção, depois da pré-carga), com os grafos carregados e o tempo de
+    inicialização; 503 enquanto a pré-carga não terminou.
+    """
+    report = dict(startup)
+    report['pid'] = os.getpid()
+    return jsonify(report), 200 if startup['ready'] else 503
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Métricas no formato texto do Prometheus: tempo de relógio e de CPU por
+    etapa e algoritmo, contadores dos algoritmos e o estado dos caches e
+    da fila de jobs.
+    """
+    gauges = {}
+    for name, cache in (('graph_cache', graph_cache), ('result_cache', result_cache), ('search_cache', search_cache),
+                        ('landmark_cache', landmark_cache)):
+        stats = cache.stats()
+        gauges[f'{name}_entries'] = ('Entradas no cache.', stats['entries'])
+        gauges[f'{name}_bytes'] = ('Tamanho estimado do cache (bytes).', stats['bytes'])
+    result_stats = result_cache.stats()
+    gauges['result_cache_large_entries'] = ('Resultados acima do limite do cache (consultados em blocos).',
+                                            result_stats['large_entries'])
+    gauges['result_cache_large_bytes'] = ('Tamanho estimado desses resultados (bytes).', result_stats['large_bytes'])
+    gauges['result_cache_spilled_entries'] = ('Resultados em cache com as matrizes em disco.',
+                                              result_stats['spilled_entries'])
+    gauges['result_cache_spilled_disk_bytes'] = ('Bytes em disco dessas matrizes.', result_stats['spilled_disk_bytes'])
+    jobs = job_queue.stats()
+    for state in ('queued', 'running'):
+        gauges[f'jobs_{state}'] = (f'Jobs no estado {state}.', jobs.get(state, 0))
+    gauges['dynamic_sessions'] = ('Sessões dinâmicas abertas.', dynamic_sessions.stats()['entries'])
+    catalog_stats = catalog.stats()
+    gauges['catalog_graphs'] = ('Grafos no catálogo.', catalog_stats['graphs'])
+    gauges['catalog_pending'] = ('Grafos do catálogo com estatísticas pendentes.', catalog_stats['pending'])
+
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def api_cancel_job(job_id):
+    """API endpoint que cancela um job (na fila ou em execução)."""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job não encontrado.'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+
+@app.route('/api/jobs', methods=['GET'])
+def api_job_stats():
+    """API endpoint com a contagem de jobs por estado e os limites da fila."""
+    return jsonify(job_queue.stats())
+
+
+def dynamic_payload(session, vertices=None):
+    """
+    Monta o JSON com o estado de uma sessão dinâmica.
+
+    :param session: Entrada de dynamic_sessions.
+    :param vertices: Para caminhos mínimos, os vértices incluídos na
+                     resposta (None = todos).
+    :return: dict serializável.
+    """
+    state = session['state']
+    if isinstance(state, DynamicMST):
+        result = state.results()
+        return {key: result[key] for key in ('algorithm', 'status', 'message', 'mst_edges', 'total_cost', 'stats')}
+
+    if state.negative_cycle:
+        return {
+            'algorithm': state.algorithm,
+            'negative_cycle': True,
+            'stats': state.stats,
+            'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
+        }
+    if vertices is None:
+        vertices = list(state.dist)
+    return {
+        'algorithm': state.algorithm,
+        'start_vertex': state.start_vertex,
+        'negative_cycle': False,
+        'stats': state.stats,
+        # JSON não representa infinito: null indica que não há caminho
+        'distances': {x: (None if state.distance(x) == math.inf else state.distance(x)) for x in vertices},
+        'paths': {x: state.path(x) for x in vertices}
+    }
+
+
+def parse_edge_updates(items):
+    """
+    Valida a lista de alterações do JSON: {"u", "v", "weight"} insere ou
+    altera o peso; {"u", "v", "remove": true} remove a aresta.
+
+    :return: Lista de tuplas (u, v, peso ou None).
+    :raises ValueError: Se alguma alteração for inválida.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("'updates' deve ser uma lista não vazia.")
+
+    updates = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or item.get('u') in (None, '') or item.get('v') in (None, ''):
+            raise ValueError(f'Alteração {i}: campos obrigatórios u e v.')
+        # Rótulos são strings (como no .dot): {"u": 1} é o vértice "1"
+        u, v = str(item['u']), str(item['v'])
+        if item.get('remove'):
+            updates.append((u, v, None))
+            continue
+        weight = item.get('weight')
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not math.isfinite(weight):
+            raise ValueError(f'Alteração {i}: peso inválido ({weight!r}).')
+        updates.append((u, v, weight))
+    return updates
+
+
+@app.route('/api/dynamic', methods=['POST'])
+def api_create_dynamic():
+    """
+    API endpoint que cria uma sessão dinâmica: carrega uma cópia do grafo,
+    executa o algoritmo e guarda o estado para as alterações seguintes.
+
+    JSON: graph_file, graph_type, algorithm ('prim', 'dijkstra',
+    'bellman_ford' ou 'auto') e start_vertex.
+    """
+    data = request.get_json() or {}
+    filename = data.get('graph_file')
+    algo = data.get('algorithm')
+    start_vertex = data.get('start_vertex')
+    if not filename or not start_vertex:
+        return jsonify({'success': False, 'error': 'Campos obrigatórios: graph_file e start_vertex.'}), 400
+    if algo not in ('prim', 'dijkstra', 'bellman_ford', 'auto'):
+        return jsonify({'success': False, 'error': f"Algoritmo '{algo}' não tem modo dinâmico."}), 400
+
+    filepath = resolve_graph_path(filename, data.get('graph_type'))
+    if not graph_file_exists(filepath):
+        return jsonify({'success': False, 'error': f'Arquivo não encontrado: {filename}'}), 404
+
+    try:
+        graph = to_mutable_graph(graph_cache.get(filepath))
+        if algo == 'prim':
+            state = DynamicMST(graph, str(start_vertex))
+        else:
+            state = DynamicShortestPaths(graph, str(start_vertex))
+    except ValueError as ve:
+        return jsonify({'success': False, 'error': str(ve)}), 400
+
+    session_id = uuid.uuid4().hex
+    session = {'state': state, 'lock': threading.Lock(), 'graph_file': filename}
+    dynamic_sessions.put(session_id, session)
+    return jsonify({'success': True, 'session_id': session_id, **dynamic_payload(session)}), 201
+
+
+@app.route('/api/dynamic/<session_id>', methods=['GET'])
+def api_dynamic_results(session_id):
+    """API endpoint com o resultado completo de uma sessão dinâmica."""
+    session = dynamic_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Sessão não encontrada.'}), 404
+    with session['lock']:
+        return jsonify({'success': True, 'session_id': session_id, **dynamic_payload(session)})
+
+
+@app.route('/api/dynamic/<session_id>/updates', methods=['POST'])
+def api_dynamic_updates(session_id):
+    """
+    API endpoint que aplica um lote de alterações de arestas ao grafo da
+    sessão e retorna só o que mudou: os vértices com nova distância/caminho
+    (caminhos mínimos) ou as arestas que entraram/saíram da árvore (Prim).
+
+    JSON: {"updates": [{"u": "a", "v": "b", "weight": 3}, {"u": "b", "v": "c", "remove": true}]}
+    """
+    session = dynamic_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Sessão não encontrada.'}), 404
+
+    try:
+        updates = parse_edge_updates((request.get_json() or {}).get('updates'))
+    except ValueError as ve:
+        return jsonify({'success': False, 'error': str(ve)}), 400
+
+    state = session['state']
+    with session['lock']:
+        try:
+            changes = state.apply_updates(updates)
+        except KeyError as e:
+            # O lote inteiro é recusado: nenhuma alteração foi aplicada
+            return jsonify({'success': False, 'error': f'Aresta não encontrada: {e.args[0]}. Nenhuma alteração do lote foi aplicada.'}), 409
+        # O grafo e o estado cresceram (ou diminuíram): recalcula o tamanho no LRU
+        dynamic_sessions.resize(session_id)
+
+        if isinstance(state, DynamicMST):
+            added, removed = changes
+            return jsonify({'success': True, 'added': added, 'removed': removed, **dynamic_payload(session)})
+        return jsonify({'success': True, 'changed': changes, **dynamic_payload(session, changes)})
+
+
+@app.route('/api/dynamic/<session_id>', methods=['DELETE'])
+def api_delete_dynamic(session_id):
+    """API endpoint que descarta uma sessão dinâmica."""
+    if dynamic_sessions.pop(session_id) is None:
+        return jsonify({'success': False, 'error': 'Sessão não encontrada.'}), 404
+    return jsonify({'success': True})
+
+
+if PRELOAD_GRAPHS:
+    preload_graphs()
 
 
 if __name__ == '__main__':
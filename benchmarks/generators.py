@@ -0,0 +1,199 @@
+"""
+Geradores de grafos sintéticos (com semente fixa) para os benchmarks.
+
+Cada gerador monta um Graph diretamente; write_dot() grava o grafo em um
+arquivo .dot, em um formato que o parse_dot também aceita (um comando por
+linha). Os vértices se chamam v0, v1, ... e os pesos são inteiros.
+
+Famílias:
+- erdos_renyi: arestas sorteadas uniformemente entre pares de vértices;
+- grid: malha quadrada com pesos aleatórios, como uma malha viária;
+- scale_free: Barabási-Albert (poucos vértices com grau muito alto);
+- dag: grafo acíclico direcionado com pesos negativos.
+
+Nos grafos direcionados de scale_free e dag, v0 alcança (quase) todos os
+vértices: serve de origem para os algoritmos de uma única origem.
+
+Gerar um arquivo (ex: para testar o servidor com um grafo grande):
+    python benchmarks/generators.py erdos_renyi 10000 -o graphs/er10000.dot
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+# Permite executar o script direto da raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.graph import Graph
+
+
+def _new_graph(num_vertices, directed):
+    """Cria o grafo com os vértices v0 .. v{n-1}, na ordem."""
+    graph = Graph(directed=directed)
+    for i in range(num_vertices):
+        graph.add_vertex(f'v{i}')
+    return graph
+
+
+def erdos_renyi(num_vertices, avg_degree=8, directed=False, seed=0, max_weight=100):
+    """
+    Grafo aleatório de Erdős–Rényi (modelo G(n, m)).
+
+    :param num_vertices: Número de vértices.
+    :param avg_degree: Grau médio (arestas por vértice, somando entrada e saída).
+    :param directed: Define se o grafo é direcionado.
+    :param seed: Semente do gerador aleatório.
+    :param max_weight: Peso máximo (os pesos vão de 1 a max_weight).
+    :return: Um objeto Graph.
+    """
+    rng = random.Random(seed)
+    graph = _new_graph(num_vertices, directed)
+    if num_vertices < 2:
+        return graph
+    for _ in range(num_vertices * avg_degree // 2):
+        u = rng.randrange(num_vertices)
+        v = rng.randrange(num_vertices - 1)
+        if v >= u:  # Sorteia v != u sem repetir o sorteio
+            v += 1
+        graph.add_edge(f'v{u}', f'v{v}', rng.randint(1, max_weight))
+    return graph
+
+
+def grid(num_vertices, directed=False, seed=0, max_weight=100):
+    """
+    Malha quadrada (lado = raiz de num_vertices), como uma malha viária: cada
+    vértice liga-se aos vizinhos da direita e de baixo. No grafo direcionado,
+    cada rua tem os dois sentidos, com pesos independentes.
+
+    :param num_vertices: Número aproximado de vértices (arredondado para
+                         o quadrado perfeito mais próximo abaixo).
+    :return: Um objeto Graph.
+    """
+    rng = random.Random(seed)
+    side = max(1, math.isqrt(num_vertices))
+    graph = _new_graph(side * side, directed)
+    for row in range(side):
+        for col in range(side):
+            u = row * side + col
+            neighbors = []
+            if col + 1 < side:
+                neighbors.append(u + 1)
+            if row + 1 < side:
+                neighbors.append(u + side)
+            for v in neighbors:
+                graph.add_edge(f'v{u}', f'v{v}', rng.randint(1, max_weight))
+                if directed:
+                    graph.add_edge(f'v{v}', f'v{u}', rng.randint(1, max_weight))
+    return graph
+
+
+def scale_free(num_vertices, edges_per_vertex=3, directed=False, seed=0, max_weight=100):
+    """
+    Grafo livre de escala (Barabási–Albert): cada novo vértice se liga a
+    'edges_per_vertex' vértices já existentes, escolhidos com probabilidade
+    proporcional ao grau. No grafo direcionado, as arestas vão do vértice
+    escolhido para o novo (dos antigos para os novos), para que a partir dos
+    primeiros vértices se alcance o grafo.
+
+    :return: Um objeto Graph.
+    """
+    rng = random.Random(seed)
+    graph = _new_graph(num_vertices, directed)
+    # Cada vértice aparece em 'endpoints' uma vez por aresta que toca:
+    # sortear uma posição da lista equivale a sortear pelo grau
+    endpoints = list(range(min(edges_per_vertex, num_vertices)))
+    for u in range(len(endpoints), num_vertices):
+        chosen = set()
+        while len(chosen) < min(edges_per_vertex, u):
+            chosen.add(rng.choice(endpoints))
+        for v in chosen:
+            if directed:
+                graph.add_edge(f'v{v}', f'v{u}', rng.randint(1, max_weight))
+            else:
+                graph.add_edge(f'v{u}', f'v{v}', rng.randint(1, max_weight))
+            endpoints.append(v)
+        endpoints.extend([u] * len(chosen))
+    return graph
+
+
+def dag(num_vertices, avg_degree=4, seed=0, min_weight=-10, max_weight=50):
+    """
+    Grafo acíclico direcionado com pesos negativos: os vértices são
+    embaralhados em uma ordem topológica e toda aresta vai de um vértice
+    para outro mais adiante nela (logo não há ciclos negativos).
+
+    v0 é o primeiro da ordem, e cada vértice seguinte recebe uma aresta de
+    algum anterior: a partir de v0 se alcança o grafo inteiro. As demais
+    arestas ligam pares sorteados.
+
+    :return: Um objeto Graph direcionado.
+    """
+    rng = random.Random(seed)
+    graph = _new_graph(num_vertices, directed=True)
+    if num_vertices < 2:
+        return graph
+    order = list(range(1, num_vertices))
+    rng.shuffle(order)
+    order.insert(0, 0)
+    for j in range(1, num_vertices):
+        i = rng.randrange(j)
+        graph.add_edge(f'v{order[i]}', f'v{order[j]}', rng.randint(min_weight, max_weight))
+    for _ in range(num_vertices * avg_degree // 2 - (num_vertices - 1)):
+        i, j = sorted(rng.sample(range(num_vertices), 2))
+        graph.add_edge(f'v{order[i]}', f'v{order[j]}', rng.randint(min_weight, max_weight))
+    return graph
+
+
+# Nome da família -> gerador f(num_vertices, directed, seed)
+FAMILIES = {
+    'erdos_renyi': lambda n, directed, seed: erdos_renyi(n, directed=directed, seed=seed),
+    'grid': lambda n, directed, seed: grid(n, directed=directed, seed=seed),
+    'scale_free': lambda n, directed, seed: scale_free(n, directed=directed, seed=seed),
+    'dag': lambda n, directed, seed: dag(n, seed=seed),
+}
+
+
+def write_dot(graph, filepath, name='benchmark'):
+    """
+    Grava o grafo em um arquivo DOT (um comando por linha).
+
+    No grafo não direcionado, cada aresta é escrita uma única vez.
+
+    :param graph: Objeto Graph.
+    :param filepath: Caminho do arquivo a ser criado.
+    :param name: Nome do grafo no cabeçalho.
+    """
+    op = '->' if graph.directed else '--'
+    index = {label: i for i, label in enumerate(graph.adj_list)}
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(f"{'digraph' if graph.directed else 'graph'} {name} {{\n")
+        for u, neighbors in graph.adj_list.items():
+            if not neighbors:
+                f.write(f'  {u};\n')
+            for v, weight in neighbors.items():
+                if not graph.directed and index[v] < index[u]:
+                    continue  # Já escrita a partir de v
+                weight = int(weight) if weight.is_integer() else weight
+                f.write(f'  {u} {op} {v} [weight={weight}];\n')
+        f.write('}\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera um grafo sintético em formato DOT.')
+    parser.add_argument('family', choices=sorted(FAMILIES), help='Família do grafo.')
+    parser.add_argument('vertices', type=int, help='Número de vértices.')
+    parser.add_argument('-o', '--output', required=True, help='Arquivo .dot de saída.')
+    parser.add_argument('--directed', action='store_true', help='Gera um grafo direcionado.')
+    parser.add_argument('--seed', type=int, default=0, help='Semente do gerador aleatório.')
+    args = parser.parse_args()
+
+    graph = FAMILIES[args.family](args.vertices, args.directed, args.seed)
+    write_dot(graph, args.output, name=args.family)
+    num_edges = sum(len(neighbors) for neighbors in graph.adj_list.values())
+    print(f"[Gerador] {args.output}: {len(graph.adj_list)} vértices, {num_edges} arestas armazenadas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark de vazão (MB/s) dos parsers de arquivos DOT.
+
+Compara o parse_dot (regex por linha) com o parse_dot_stream (caminho
+rápido por linha, com o tokenizador em fluxo como reserva), montando um
+Graph e um CompactGraph (compact=True).
+
+Os arquivos são gerados com uma semente fixa, em um formato que o parse_dot
+também aceita (um comando por linha), para que os três façam o mesmo
+trabalho. São duas cargas:
+- 'simples': a -> b [weight=N];
+- 'atributos': listas de atributos longas antes do peso, que forçam o
+  retrocesso (backtracking) do '\\[.*?weight' da regex.
+
+Uso:
+    python benchmarks/parser_throughput.py [--edges 200000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Permite executar o script direto da raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dot_parser import parse_dot
+from src.dot_stream_parser import parse_dot_stream
+
+PARSERS = {
+    'regex (parse_dot)': parse_dot,
+    # O que o servidor fazia antes do parser em fluxo: Graph + freeze()
+    'regex + freeze()': lambda filepath: parse_dot(filepath).freeze(),
+    'stream (Graph)': parse_dot_stream,
+    'stream (CompactGraph)': lambda filepath: parse_dot_stream(filepath, compact=True),
+}
+
+
+def write_dot(filepath, num_edges, num_vertices, long_attributes, seed=0):
+    """
+    Gera um digrafo aleatório (semente fixa) no formato DOT.
+
+    :param filepath: Caminho do arquivo a ser criado.
+    :param num_edges: Número de arestas.
+    :param num_vertices: Número de vértices sorteados.
+    :param long_attributes: Se True, inclui atributos extras antes do peso.
+    :param seed: Semente do gerador aleatório.
+    """
+    rng = random.Random(seed)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('digraph benchmark {\n')
+        for _ in range(num_edges):
+            u = rng.randrange(num_vertices)
+            v = rng.randrange(num_vertices)
+            weight = rng.randint(1, 99)
+            if long_attributes:
+                f.write(f'  v{u} -> v{v} [color=blue, style=dashed, penwidth=2, arrowhead=normal, weight={weight}];\n')
+            else:
+                f.write(f'  v{u} -> v{v} [weight={weight}];\n')
+        f.write('}\n')
+
+
+def measure(parser, filepath, repeat):
+    """
+    Mede a vazão de um parser (melhor tempo entre 'repeat' execuções).
+
+    :return: Vazão em MB/s.
+    """
+    size_mb = os.path.getsize(filepath) / 1e6
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(filepath)
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--edges', type=int, default=200000, help='Número de arestas por arquivo.')
+    arg_parser.add_argument('--vertices', type=int, default=50000, help='Número de vértices sorteados.')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Execuções por parser (vale a melhor).')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for workload, long_attributes in (('simples', False), ('atributos', True)):
+            filepath = os.path.join(tmp, f'{workload}.dot')
+            write_dot(filepath, args.edges, args.vertices, long_attributes)
+            size_mb = os.path.getsize(filepath) / 1e6
+            print(f"Carga '{workload}': {args.edges} arestas, {size_mb:.1f} MB")
+            for name, parser in PARSERS.items():
+                print(f"  {name:<24} {measure(parser, filepath, args.repeat):6.2f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
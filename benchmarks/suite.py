@@ -0,0 +1,359 @@
+"""
+Suíte de benchmarks dos motores em grafos sintéticos (ver generators.py).
+
+Para cada motor, família de grafos e tamanho, mede o melhor tempo entre
+'--repeat' execuções, a vazão (operações por segundo, com a unidade de
+trabalho de cada motor em OPS_UNITS) e a memória (RSS). Cada caso roda em
+um processo próprio, para que o pico de RSS seja só dele; a coluna impressa
+é o quanto o pico passou da memória já ocupada depois da preparação (grafo
+gerado e compactado), ou seja, só a do motor.
+
+Também estima o expoente de escala de cada motor/família: a inclinação da
+reta log(tempo) x log(nº de vértices) (≈ 1 para algoritmos lineares,
+≈ 3 para o Floyd-Warshall).
+
+O resultado é gravado em JSON e pode ser comparado com o de outro commit:
+    python benchmarks/suite.py -o antes.json
+    (muda o código)
+    python benchmarks/suite.py -o depois.json --compare antes.json
+
+Uso:
+    python benchmarks/suite.py [--quick] [--engines prim_mst,bellman_ford] [--repeat 3]
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Permite executar o script direto da raiz do projeto
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+try:
+    import resource
+except ImportError:  # Windows: sem medição de RSS
+    resource = None
+
+from benchmarks.generators import FAMILIES, write_dot
+from src.algorithms.bellman_ford import bellman_ford
+from src.algorithms.floyd_warshall import HAS_NUMPY, floyd_warshall
+from src.algorithms.prim import prim_mst
+from src.dot_parser import parse_dot
+from src.dot_stream_parser import parse_dot_stream
+
+# Motor -> (famílias com o grafo direcionado ou não, tamanhos (nº de
+# vértices), tamanhos com --quick)
+#
+# Os tamanhos do Floyd-Warshall dependem do NumPy: com a versão vetorizada,
+# grafos pequenos medem só o custo fixo da chamada (expoente ≈ 1, não 3).
+UNDIRECTED_FAMILIES = {'erdos_renyi': False, 'grid': False, 'scale_free': False}
+CASES = {
+    'parse_dot': ({**UNDIRECTED_FAMILIES, 'dag': True}, [2000, 8000, 32000], [250, 1000, 4000]),
+    'parse_dot_stream': ({**UNDIRECTED_FAMILIES, 'dag': True}, [2000, 8000, 32000], [250, 1000, 4000]),
+    'prim_mst': (UNDIRECTED_FAMILIES, [2000, 8000, 32000], [250, 1000, 4000]),
+    'bellman_ford': ({'erdos_renyi': True, 'grid': True, 'scale_free': True, 'dag': True},
+                     [1000, 4000, 16000], [250, 1000, 4000]),
+    'floyd_warshall': ({'erdos_renyi': True, 'grid': True, 'dag': True},
+                       *(([400, 800, 1600], [200, 400, 800]) if HAS_NUMPY else ([100, 200, 400], [50, 100, 200]))),
+}
+
+# Unidade de trabalho de cada motor (para as operações por segundo)
+OPS_UNITS = {
+    'parse_dot': 'arestas',
+    'parse_dot_stream': 'arestas',
+    'prim_mst': 'arestas',
+    'bellman_ford': 'arestas examinadas (stats.edges_scanned)',
+    'floyd_warshall': 'relaxamentos (V³)',
+}
+
+# Diferença de tempo (fração) a partir da qual a comparação destaca o caso
+COMPARE_THRESHOLD = 0.10
+
+
+def _peak_rss_mb():
+    """Pico de memória (RSS) do processo atual, em MB (None se indisponível)."""
+    try:
+        # Linux: VmHWM, que _reset_peak_rss() consegue zerar
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _reset_peak_rss():
+    """
+    Faz o pico de RSS voltar ao uso atual (Linux >= 4.0), para que a
+    preparação do caso não conte no pico do motor. Em outros sistemas o pico
+    não muda e a diferença medida é só o que passar dele.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _reach(compact, source):
+    """Nº de vértices alcançáveis a partir de 'source' (busca em largura)."""
+    offsets, targets = compact.offsets, compact.targets
+    seen = bytearray(compact.num_vertices())
+    seen[source] = 1
+    queue = deque([source])
+    reached = 1
+    while queue:
+        u = queue.popleft()
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            if not seen[v]:
+                seen[v] = 1
+                reached += 1
+                queue.append(v)
+    return reached
+
+
+def source_vertex(compact):
+    """
+    Origem dos motores de uma única origem: entre v0 e o vértice de maior
+    grau de saída, o que alcança mais vértices. Uma origem que não alcança
+    quase nada mede uma execução vazia (ex: v0 sem arestas de saída).
+
+    :return: Tupla (rótulo, nº de vértices alcançados).
+    """
+    degrees = compact.out_degrees()
+    candidates = {0, max(range(len(degrees)), key=degrees.__getitem__)}
+    reach = {i: _reach(compact, i) for i in sorted(candidates)}
+    best = max(reach, key=reach.get)
+    return compact.labels[best], reach[best]
+
+
+def run_case(engine, family, directed, num_vertices, repeat, seed, bellman_ford_mode, bellman_ford_dag=True):
+    """
+    Executa um caso (no processo do pool) e retorna suas medidas.
+
+    :return: dict com o motor, a família, o tamanho do grafo e as medidas.
+    """
+    graph = FAMILIES[family](num_vertices, directed, seed)
+    num_edges = sum(len(neighbors) for neighbors in graph.adj_list.values())
+    num_vertices = len(graph.adj_list)
+
+    source, reached = None, None
+    with tempfile.TemporaryDirectory() as tmp:
+        # --- Preparação (fora da medição) ---
+        if engine.startswith('parse_dot'):
+            filepath = os.path.join(tmp, f'{family}.dot')
+            write_dot(graph, filepath, name=family)
+            del graph
+            parser = parse_dot if engine == 'parse_dot' else parse_dot_stream
+            function = lambda: parser(filepath)
+            ops = num_edges
+        else:
+            # Os algoritmos executam sobre a forma compacta, como no servidor
+            compact = graph.freeze()
+            del graph
+            if engine in ('prim_mst', 'bellman_ford'):
+                source, reached = source_vertex(compact)
+            if engine == 'prim_mst':
+                function = lambda: prim_mst(compact, source)
+            elif engine == 'bellman_ford':
+                function = lambda: bellman_ford(compact, source, mode=bellman_ford_mode, dag=bellman_ford_dag)
+            else:
+                function = lambda: floyd_warshall(compact)
+            ops = num_vertices ** 3 if engine == 'floyd_warshall' else num_edges
+
+        # Memória depois da preparação: a do motor é o que o pico passar disso
+        gc.collect()
+        _reset_peak_rss()
+        setup_rss = _peak_rss_mb()
+
+        # --- Medição (melhor tempo) ---
+        best = math.inf
+        stats = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+            stats = result.get('stats') if isinstance(result, dict) else None
+            del result
+        peak_rss = _peak_rss_mb()
+
+    mode = None
+    if engine == 'bellman_ford':
+        # O trabalho feito de fato, e o modo usado: em grafos acíclicos o
+        # Bellman-Ford troca '--bellman-ford-mode' pelo modo 'dag'
+        ops = stats['edges_scanned']
+        mode = stats['mode']
+
+    return {
+        'engine': engine,
+        'family': family,
+        'directed': directed,
+        'vertices': num_vertices,
+        'edges': num_edges,
+        'source': source,
+        'reached': reached,
+        'mode': mode,
+        'seconds': best,
+        'ops': ops,
+        'ops_per_sec': ops / best if best > 0 else None,
+        'peak_rss_mb': peak_rss,
+        'setup_rss_mb': setup_rss,
+        'engine_rss_mb': peak_rss - setup_rss if peak_rss is not None else None,
+    }
+
+
+def scaling_exponents(results):
+    """
+    Estima o expoente de escala de cada motor/família pelos mínimos
+    quadrados de log(tempo) x log(nº de vértices).
+
+    :return: dict motor -> {família: expoente}.
+    """
+    groups = {}
+    for r in results:
+        if r['seconds'] > 0:
+            groups.setdefault((r['engine'], r['family']), []).append(
+                (math.log(r['vertices']), math.log(r['seconds']))
+            )
+
+    exponents = {}
+    for (engine, family), points in groups.items():
+        if len(points) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if var_x == 0:
+            continue
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+        exponents.setdefault(engine, {})[family] = round(slope, 3)
+    return exponents
+
+
+def git_commit():
+    """Commit atual do repositório (None fora de um repositório git)."""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def compare(current, baseline):
+    """
+    Imprime a razão entre os tempos atuais e os de um JSON anterior, para
+    os casos presentes nos dois (mesmo motor, família e nº de vértices).
+    """
+    previous = {(r['engine'], r['family'], r['vertices']): r for r in baseline['results']}
+    print(f"\nComparação com {baseline['meta'].get('commit') or 'a execução anterior'}:")
+    for r in current['results']:
+        old = previous.get((r['engine'], r['family'], r['vertices']))
+        if old is None or not old['seconds']:
+            continue
+        ratio = r['seconds'] / old['seconds']
+        flag = ''
+        if ratio > 1 + COMPARE_THRESHOLD:
+            flag = '  (mais lento)'
+        elif ratio < 1 - COMPARE_THRESHOLD:
+            flag = '  (mais rápido)'
+        print(f"  {r['engine']:<18} {r['family']:<12} {r['vertices']:>7}  "
+              f"{old['seconds']:9.4f}s -> {r['seconds']:9.4f}s  x{ratio:5.2f}{flag}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Suíte de benchmarks dos motores em grafos sintéticos.')
+    arg_parser.add_argument('--engines', default=','.join(CASES),
+                            help=f"Motores separados por vírgula (padrão: todos: {','.join(CASES)}).")
+    arg_parser.add_argument('--families', default=None,
+                            help=f"Famílias separadas por vírgula (padrão: todas: {','.join(FAMILIES)}).")
+    arg_parser.add_argument('--quick', action='store_true', help='Usa tamanhos menores (execução rápida).')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Execuções por caso (vale a melhor).')
+    arg_parser.add_argument('--seed', type=int, default=0, help='Semente dos geradores.')
+    arg_parser.add_argument('--bellman-ford-mode', default='spfa', help='Modo do Bellman-Ford (padrão: spfa, o do servidor).')
+    arg_parser.add_argument('--no-dag', action='store_true',
+                            help="Não troca o modo do Bellman-Ford por 'dag' em grafos acíclicos (dag, scale_free).")
+    arg_parser.add_argument('-o', '--output', default=None,
+                            help='Arquivo JSON de saída (padrão: benchmark-<commit>.json).')
+    arg_parser.add_argument('--compare', default=None, help='JSON de uma execução anterior para comparar.')
+    args = arg_parser.parse_args()
+
+    engines = args.engines.split(',')
+    unknown = [e for e in engines if e not in CASES]
+    if unknown:
+        arg_parser.error(f"Motor(es) desconhecido(s): {', '.join(unknown)}")
+    families = args.families.split(',') if args.families else list(FAMILIES)
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': HAS_NUMPY,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'quick': args.quick,
+            'bellman_ford_mode': args.bellman_ford_mode,
+            'bellman_ford_dag': not args.no_dag,
+            'ops_units': OPS_UNITS,
+        },
+        'results': [],
+    }
+
+    print(f"{'motor':<18} {'família':<12} {'vértices':>8} {'arestas':>9} {'tempo (s)':>10} {'ops/s':>12} {'RSS (MB)':>9}")
+    print('(RSS: pico de memória do motor, acima da ocupada pela preparação do caso)')
+    for engine in engines:
+        engine_families, sizes, quick_sizes = CASES[engine]
+        if args.quick:
+            sizes = quick_sizes
+        for family, directed in engine_families.items():
+            if family not in families:
+                continue
+            for size in sizes:
+                # Um processo novo por caso: o pico de RSS medido é só deste caso
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    r = executor.submit(
+                        run_case, engine, family, directed, size,
+                        args.repeat, args.seed, args.bellman_ford_mode, not args.no_dag
+                    ).result()
+                report['results'].append(r)
+                rss = f"{r['engine_rss_mb']:9.1f}" if r['engine_rss_mb'] is not None else f"{'-':>9}"
+                print(f"{engine:<18} {family:<12} {r['vertices']:>8} {r['edges']:>9} "
+                      f"{r['seconds']:>10.4f} {r['ops_per_sec'] or 0:>12.0f} {rss}"
+                      + (f"  modo {r['mode']}" if r['mode'] else ''))
+
+    report['scaling'] = scaling_exponents(report['results'])
+    print('\nExpoentes de escala (tempo ~ V^k):')
+    for engine, by_family in report['scaling'].items():
+        print(f"  {engine:<18} " + ', '.join(f'{family}={k:.2f}' for family, k in by_family.items()))
+
+    output = args.output or f"benchmark-{commit or 'local'}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'\nResultados gravados em {output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
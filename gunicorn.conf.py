@@ -0,0 +1,42 @@
+"""
+Configuração do gunicorn para o modo de produção (ver wsgi.py).
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Variáveis de ambiente: PORT (padrão 8080), WEB_CONCURRENCY (nº de
+workers, padrão 1) e WEB_THREADS (threads por worker).
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+
+# Um único worker por padrão: os jobs (/api/jobs), as sessões dinâmicas e
+# os caches ficam na memória do processo, e os workers do gunicorn aceitam
+# conexões do mesmo socket, então a consulta de um job pode cair em outro
+# worker (404). A concorrência vem das threads, que atendem requisições
+# rápidas e long-polling (/api/jobs/<id>?wait=N); os algoritmos pesados
+# usam os processos de PARALLEL_WORKERS. Mais de um worker só serve para
+# quem não usa a fila de jobs nem a API dinâmica.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', 8))
+
+# Importa o app (e pré-carrega os grafos) no mestre, antes do fork: os
+# workers herdam os grafos já carregados e os compartilham (copy-on-write).
+preload_app = True
+
+# Execuções longas devem usar a fila de jobs (/api/jobs)
+timeout = 120
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Registra o resultado da pré-carga quando o mestre está pronto."""
+    from app import startup
+    server.log.info(
+        f"{len(startup['graphs'])} grafo(s) pré-carregado(s) em {startup['startup_seconds']} s; "
+        f"{len(startup['errors'])} erro(s)"
+    )
@@ -0,0 +1,8 @@
+#!/bin/sh
+. .venv/bin/activate
+
+# Define a porta 8080 como padrão se $PORT não estiver definida
+export PORT=${PORT:-8080}
+
+echo "Iniciando servidor de produção (gunicorn) na porta $PORT..."
+exec gunicorn -c gunicorn.conf.py wsgi:app
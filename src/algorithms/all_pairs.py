@@ -0,0 +1,247 @@
+"""
+Resultado compacto dos algoritmos de caminhos mínimos entre vários pares
+(Floyd-Warshall, Johnson e multi_source).
+
+Em vez de montar dicionários com a distância e o caminho completo de cada
+par (O(V³) de trabalho e memória no pior caso), o resultado guarda apenas
+uma matriz densa de distâncias e uma de "saltos" (próximo vértice ou
+predecessor), indexadas por inteiros. Um caminho só é reconstruído quando
+é acessado.
+
+O objeto se comporta como o antigo dicionário 'results' ({'vertices',
+'distances', 'paths'}), então o template continua funcionando sem mudanças.
+"""
+import math
+from collections.abc import Mapping
+
+# Tipos de matriz de saltos
+NEXT_HOP = 'next'        # hops[i][j] = próximo vértice de i até j (Floyd-Warshall)
+PREDECESSOR = 'pred'     # hops[s][j] = predecessor de j a partir de s (Dijkstra/Bellman-Ford)
+
+# Marca "sem caminho" nas matrizes de saltos
+NO_HOP = -1
+
+
+class AllPairsResult(Mapping):
+    """
+    Distâncias e caminhos mínimos a partir de um conjunto de origens.
+
+    - distance(u, v) e path(u, v): consulta de um único par;
+    - distances[u][v] e paths[u][v]: visões preguiçosas no formato do template
+      ('Infinito' para distâncias inalcançáveis, None para caminhos inexistentes).
+    """
+
+    def __init__(self, vertices, dist_rows, hop_rows, hops=NEXT_HOP, sources=None):
+        """
+        :param vertices: Lista de rótulos (índice -> rótulo).
+        :param dist_rows: Uma linha de distâncias por origem (math.inf se
+                          inalcançável); ex: lista de array('d'), matriz NumPy
+                          ou visão de um numpy.memmap (matriz em disco).
+        :param hop_rows: Uma linha de saltos por origem (NO_HOP se não houver),
+                         no mesmo formato de 'dist_rows'.
+        :param hops: NEXT_HOP (matriz de próximos vértices, exige todas as
+                     origens) ou PREDECESSOR (árvore de caminhos de cada origem).
+        :param sources: Rótulos das origens, na ordem das linhas
+                        (None = todos os vértices).
+        """
+        self.vertices = vertices
+        self.index = {label: i for i, label in enumerate(vertices)}
+        self._all_sources = sources is None
+        self.sources = list(vertices) if sources is None else list(sources)
+        self.row_index = {label: r for r, label in enumerate(self.sources)}
+        self.hops = hops
+        self._dist_rows = dist_rows
+        self._hop_rows = hop_rows
+
+        self.distances = _DistanceView(self)
+        self.paths = _PathView(self)
+
+    # --- Consulta de um par ---
+
+    def _locate(self, u, v):
+        """Converte (u, v) em (linha de u, índice de v); KeyError se não existirem."""
+        if u not in self.row_index:
+            raise KeyError(u)
+        if v not in self.index:
+            raise KeyError(v)
+        return self.row_index[u], self.index[v]
+
+    def distance(self, u, v):
+        """
+        Retorna a distância mínima de u até v.
+
+        :return: float (math.inf se v for inalcançável a partir de u).
+        """
+        r, j = self._locate(u, v)
+        return float(self._dist_rows[r][j])
+
+    def path(self, u, v):
+        """
+        Reconstrói o caminho mínimo de u até v.
+
+        :return: Lista [u, ..., v] ou None se não houver caminho.
+        """
+        r, j = self._locate(u, v)
+        if self._dist_rows[r][j] == math.inf:
+            return None
+        if self.hops == NEXT_HOP:
+            return self._follow_next(self.index[u], j)
+        return self._follow_predecessors(r, self.index[u], j)
+
+    def _follow_next(self, i, j):
+        """Segue a matriz de próximos vértices de i até j."""
+        vertices = self.vertices
+        hop_rows = self._hop_rows
+        if hop_rows[i][j] < 0:
+            return None
+        path = [vertices[i]]
+        while i != j:
+            i = int(hop_rows[i][j])
+            if i < 0:
+                return None
+            path.append(vertices[i])
+        return path
+
+    def _follow_predecessors(self, r, source, j):
+        """Volta pelos predecessores de j até a origem (linha r)."""
+        vertices = self.vertices
+        predecessors = self._hop_rows[r]
+        path = []
+        curr = j
+        while curr >= 0:
+            path.append(vertices[curr])
+            if curr == source:
+                return path[::-1]  # Inverte para [origem, ..., destino]
+            curr = int(predecessors[curr])
+        return None  # Inacessível
+
+    # --- Consulta por blocos (paginação) ---
+
+    def distance_block(self, row_start, row_stop, col_start, col_stop):
+        """
+        Retorna as distâncias de um bloco da matriz, sem montar a matriz toda.
+
+        As linhas seguem a ordem de 'sources' e as colunas a de 'vertices';
+        os limites são cortados nas dimensões da matriz.
+
+        :return: Lista de listas de float (math.inf se inalcançável).
+        """
+        row_stop = min(row_stop, len(self.sources))
+        rows = self._dist_rows
+        return [rows[r][col_start:col_stop].tolist() for r in range(row_start, row_stop)]
+
+    def hop_block(self, row_start, row_stop, col_start, col_stop):
+        """
+        Retorna os saltos (próximo vértice ou predecessor, conforme 'hops')
+        de um bloco da matriz, com os mesmos limites de distance_block.
+
+        :return: Lista de listas de int (NO_HOP se não houver caminho).
+        """
+        row_stop = min(row_stop, len(self.sources))
+        rows = self._hop_rows
+        return [rows[r][col_start:col_stop].tolist() for r in range(row_start, row_stop)]
+
+    # --- Interface de dicionário (formato antigo de 'results') ---
+
+    def _keys(self):
+        if self._all_sources:
+            return ('vertices', 'distances', 'paths')
+        return ('vertices', 'sources', 'distances', 'paths')
+
+    def __getitem__(self, key):
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def nbytes(self):
+        """
+        Estima quantos bytes as matrizes ocupam em memória (usado pelo cache).
+
+        :return: int
+        """
+        total = 0
+        for rows in (self._dist_rows, self._hop_rows):
+            if _is_mapped(rows):
+                continue  # A matriz fica em disco, fora da memória do processo
+            if hasattr(rows, 'nbytes'):  # Matriz NumPy
+                total += rows.nbytes
+            else:
+                total += sum(row.itemsize * len(row) for row in rows)
+        return total + 150 * len(self.vertices)
+
+    def disk_bytes(self):
+        """
+        Quantos bytes as matrizes mapeadas em disco (numpy.memmap) ocupam
+        (usado pelo cache, com um limite próprio).
+
+        :return: int (0 se as matrizes estão em memória)
+        """
+        return sum(rows.nbytes for rows in (self._dist_rows, self._hop_rows) if _is_mapped(rows))
+
+
+def _is_mapped(rows):
+    """Verifica se a matriz é (ou é uma visão de) um numpy.memmap."""
+    return hasattr(rows, 'filename') or hasattr(getattr(rows, 'base', None), 'filename')
+
+
+class _DistanceView(Mapping):
+    """distances[u][v]: distância ou 'Infinito', calculada no acesso."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def __getitem__(self, u):
+        return _Row(self._result, self._result.row_index[u], display_distance)
+
+    def __iter__(self):
+        return iter(self._result.sources)
+
+    def __len__(self):
+        return len(self._result.sources)
+
+
+class _PathView(Mapping):
+    """paths[u][v]: caminho mínimo reconstruído no acesso."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def __getitem__(self, u):
+        result = self._result
+        return _Row(result, result.row_index[u], lambda _, j: result.path(u, result.vertices[j]))
+
+    def __iter__(self):
+        return iter(self._result.sources)
+
+    def __len__(self):
+        return len(self._result.sources)
+
+
+class _Row(Mapping):
+    """Uma linha (origem fixa) de uma das visões, indexada pelo rótulo do destino."""
+
+    def __init__(self, result, r, value):
+        self._result = result
+        self._r = r
+        self._value = value
+
+    def __getitem__(self, v):
+        return self._value(self._result._dist_rows[self._r], self._result.index[v])
+
+    def __iter__(self):
+        return iter(self._result.vertices)
+
+    def __len__(self):
+        return len(self._result.vertices)
+
+
+def display_distance(row, j):
+    """Distância no formato do template: float ou 'Infinito'."""
+    d = float(row[j])
+    return d if d != math.inf else 'Infinito'
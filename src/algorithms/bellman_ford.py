@@ -1,20 +1,45 @@
 import math
 import sys
+from collections import deque
 
-def bellman_ford(graph, start_vertex):
+from ..instrumentation import count, phase
+from .dag import critical_path, dag_relax
+from .paths import build_single_source_results
+
+# Modos de execução disponíveis ('dag' só vale para grafos acíclicos)
+MODES = ('classic', 'early_exit', 'spfa')
+DAG_MODE = 'dag'
+
+
+def bellman_ford(graph, start_vertex, mode='classic', progress=None, dag=True):
     """
     Executa o algoritmo de Bellman-Ford para encontrar os caminhos mínimos
     a partir de um vértice de origem em um grafo ponderado.
 
     Detecta ciclos de custo negativo acessíveis a partir da origem.
 
-    Assume que a API do objeto 'graph' é:
-    - graph.get_vertices(): Retorna uma lista/set de todos os vértices.
-    - graph.get_neighbors(v): Retorna um dict {vizinho: peso, ...}
+    Aceita um Graph ou um CompactGraph: em ambos os casos o algoritmo
+    executa sobre a forma compacta (graph.freeze()), com vértices indexados
+    por inteiros.
+
+    Modos:
+    - 'classic': sempre executa as |V| - 1 passadas sobre todas as arestas.
+    - 'early_exit': para assim que uma passada não relaxar nenhuma aresta.
+    - 'spfa': fila FIFO com os vértices cuja distância mudou (só as arestas
+      que saem deles são examinadas na passada seguinte).
 
-    :param graph: Objeto grafo (esperado de graph.py).
+    Se o grafo for acíclico (DAG), o modo é trocado automaticamente por
+    'dag': uma única passada em ordem topológica, O(V + E) (ver dag.py). O
+    resultado traz também o caminho crítico (mais longo) a partir da origem.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
     :param start_vertex: O vértice de origem.
-    :return: Um dicionário contendo os caminhos, custos e status.
+    :param mode: 'classic', 'early_exit' ou 'spfa'.
+    :param progress: Função opcional chamada com a fração concluída (0 a 1);
+                     se ela lançar uma exceção, a execução é interrompida.
+    :param dag: Se False, não usa o modo 'dag' mesmo em grafos acíclicos.
+    :return: Um dicionário contendo os caminhos, custos, status e
+             estatísticas ('stats': passadas e relaxamentos).
     """
 
     # --- 1. Validação e Inicialização ---
@@ -22,9 +47,16 @@ def bellman_ford(graph, start_vertex):
     # O algoritmo executará em grafos não direcionados.
     # Se um grafo não direcionado tiver uma aresta de peso negativo,
     # isso criará um ciclo negativo (ex: a <-> b), que será
-    # detectado corretamente pela Etapa 4.
+    # detectado corretamente.
+
+    if mode not in MODES:
+        raise ValueError(f"Modo do Bellman-Ford desconhecido: '{mode}'.")
 
-    vertices = graph.get_vertices()
+    # Trabalha sobre a forma compacta (CSR): vértices são índices inteiros
+    # e as arestas ficam nos arrays offsets/targets/weights.
+    with phase('freeze'):
+        compact = graph.freeze()
+    vertices = compact.labels
     if not vertices:
         return {
             'success': False, 
@@ -32,87 +64,198 @@ def bellman_ford(graph, start_vertex):
             'error': 'O grafo está vazio.'
         }
 
-    if start_vertex not in vertices:
+    if not compact.has_vertex(start_vertex):
         return {
             'success': False, 
             'algorithm': 'Bellman-Ford',
             'error': f'O vértice inicial "{start_vertex}" não foi encontrado no grafo.'
         }
 
-    # Coleta todas as arestas do grafo no formato (u, v, peso)
-    edges = []
-    for u in vertices:
-        for v, weight in graph.get_neighbors(u).items():
-            edges.append((u, v, weight))
+    # Grafo acíclico: a ordem topológica (guardada junto do grafo) dispensa as passadas
+    if dag and compact.directed:
+        with phase('topological_order'):
+            if compact.is_acyclic():
+                mode = DAG_MODE
 
-    # --- 2. Inicialização (INITIALIZE-SINGLE-SOURCE) ---
-    distances = {v: math.inf for v in vertices}
-    predecessors = {v: None for v in vertices}
-    
-    distances[start_vertex] = 0
-    
-    num_vertices = len(vertices)
+    source = compact.index[start_vertex]
+    with phase('relax'):
+        distances, predecessors, negative_cycle, stats = bellman_ford_arrays(compact, source, mode, progress)
+    count('passes', stats['passes'])
+    count('relaxations', stats['relaxations'])
+    count('edges_scanned', stats['edges_scanned'])
 
-    # --- 3. Relaxamento (V-1 iterações) ---
-    
-    # Itera |V| - 1 vezes
-    for _ in range(num_vertices - 1):
-        # Itera sobre todas as arestas do grafo
-        for u, v, weight in edges:
-            # Etapa de Relaxamento (RELAX)
-            if distances[u] != math.inf and distances[v] > distances[u] + weight:
-                distances[v] = distances[u] + weight
-                predecessors[v] = u
-
-    # --- 4. Detecção de Ciclo Negativo ---
-    
-    # Itera uma |V|-ésima vez
-    for u, v, weight in edges:
-        # Se ainda for possível relaxar uma aresta, há um ciclo negativo
-        if distances[u] != math.inf and distances[v] > distances[u] + weight:
-            return {
-                'success': False, # Falha, pois os caminhos mínimos não são bem definidos
-                'algorithm': 'Bellman-Ford',
-                'negative_cycle': True,
-                'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
-            }
+    if negative_cycle:
+        return {
+            'success': False, # Falha, pois os caminhos mínimos não são bem definidos
+            'algorithm': 'Bellman-Ford',
+            'negative_cycle': True,
+            'stats': stats,
+            'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
+        }
 
     # --- 5. Preparação dos Resultados ---
     
     # Se não houver ciclo negativo, formata a saída
     
-    display_distances = {v: (d if d != math.inf else 'Infinito') for v, d in distances.items()}
-    
-    paths = {}
-    for vertex in vertices:
-        if distances[vertex] == math.inf:
-            paths[vertex] = None
-            continue
+    with phase('paths'):
+        display_distances, paths = build_single_source_results(
+            vertices, distances, predecessors, source
+        )
 
-        path = []
-        curr = vertex
-        while curr is not None:
-            path.append(curr)
-            if curr == start_vertex:
-                break
-            curr = predecessors.get(curr)
-        
-        if path and path[-1] == start_vertex:
-            paths[vertex] = path[::-1] # Inverte para [start, ..., end]
-        else:
-            if vertex == start_vertex:
-                paths[vertex] = [start_vertex]
-            else:
-                paths[vertex] = None # Inacessível
-
-    return {
+    result = {
         'success': True,
         'algorithm': 'Bellman-Ford',
         'start_vertex': start_vertex,
         'negative_cycle': False,
         'message': 'Caminhos mínimos encontrados com sucesso.',
+        'stats': stats,
         'results': {
             'distances': display_distances,
             'paths': paths
         }
-    }
\ No newline at end of file
+    }
+    if mode == DAG_MODE:
+        with phase('critical_path'):
+            result['critical_path'] = critical_path(compact, source)
+    return result
+
+
+def bellman_ford_arrays(compact, source, mode='classic', progress=None):
+    """
+    Núcleo do Bellman-Ford sobre um CompactGraph, com vértices como índices.
+
+    :param compact: Objeto CompactGraph.
+    :param source: Índice do vértice de origem.
+    :param mode: 'classic', 'early_exit', 'spfa' ou 'dag' (só em grafos acíclicos).
+    :param progress: Função opcional chamada com a fração concluída (0 a 1).
+    :return: Tupla (distances, predecessors, negative_cycle, stats).
+    """
+    if mode == DAG_MODE:
+        # Sem ciclos, não há ciclo negativo
+        distances, predecessors, stats = dag_relax(compact, source)
+        return distances, predecessors, False, stats
+
+    # --- 2. Inicialização (INITIALIZE-SINGLE-SOURCE) ---
+    num_vertices = compact.num_vertices()
+    distances = [math.inf] * num_vertices
+    predecessors = [None] * num_vertices
+    
+    distances[source] = 0
+
+    stats = {'mode': mode, 'passes': 0, 'relaxations': 0, 'edges_scanned': 0}
+
+    # --- 3 e 4. Relaxamento e Detecção de Ciclo Negativo ---
+    if mode == 'spfa':
+        negative_cycle = _relax_spfa(compact, source, distances, predecessors, stats, progress)
+    else:
+        negative_cycle = _relax_passes(
+            compact, distances, predecessors, stats, early_exit=(mode == 'early_exit'),
+            progress=progress
+        )
+
+    return distances, predecessors, negative_cycle, stats
+
+
+def _relax_passes(compact, distances, predecessors, stats, early_exit, progress=None):
+    """
+    Bellman-Ford por passadas: até |V| - 1 passadas sobre todas as arestas e
+    uma passada extra para detectar ciclos negativos.
+
+    :return: True se houver ciclo negativo alcançável a partir da origem.
+    """
+    num_vertices = len(distances)
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+
+    # --- 3. Relaxamento (V-1 iterações) ---
+
+    # Itera |V| - 1 vezes
+    for _ in range(num_vertices - 1):
+        stats['passes'] += 1
+        changed = False
+        # Itera sobre todas as arestas do grafo (agrupadas por origem)
+        for u in range(num_vertices):
+            du = distances[u]
+            if du == math.inf:
+                continue
+            start, end = offsets[u], offsets[u + 1]
+            stats['edges_scanned'] += end - start
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                # Etapa de Relaxamento (RELAX)
+                if distances[v] > du + weight:
+                    distances[v] = du + weight
+                    predecessors[v] = u
+                    stats['relaxations'] += 1
+                    changed = True
+                    if v == u:  # laço negativo (u -> u): dist[u] mudou
+                        du = distances[u]
+
+        # Nenhuma distância mudou: as próximas passadas (inclusive a de
+        # detecção de ciclo negativo) também não mudariam nada.
+        if early_exit and not changed:
+            return False
+        if progress:
+            progress(stats['passes'] / num_vertices)
+
+    # --- 4. Detecção de Ciclo Negativo ---
+    
+    # Itera uma |V|-ésima vez
+    for u in range(num_vertices):
+        du = distances[u]
+        if du == math.inf:
+            continue
+        start, end = offsets[u], offsets[u + 1]
+        for v, weight in zip(targets[start:end], weights[start:end]):
+            # Se ainda for possível relaxar uma aresta, há um ciclo negativo
+            if distances[v] > du + weight:
+                return True
+    return False
+
+
+def _relax_spfa(compact, source, distances, predecessors, stats, progress=None):
+    """
+    Bellman-Ford com fila (SPFA, "Shortest Path Faster Algorithm").
+
+    Cada passada examina apenas as arestas que saem dos vértices cuja
+    distância mudou na passada anterior. Um ciclo negativo é detectado
+    pelo número de arestas do caminho atual até cada vértice: se chegar a
+    |V|, o caminho repete um vértice e, portanto, contém um ciclo negativo.
+
+    :return: True se houver ciclo negativo alcançável a partir da origem.
+    """
+    num_vertices = len(distances)
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+
+    path_edges = [0] * num_vertices  # Nº de arestas do caminho atual até v
+    in_queue = [False] * num_vertices
+    queue = deque([source])
+    in_queue[source] = True
+
+    while queue:
+        # Cada "passada" processa os vértices enfileirados na passada anterior
+        stats['passes'] += 1
+        next_queue = deque()
+        for u in queue:
+            in_queue[u] = False
+            du = distances[u]
+            start, end = offsets[u], offsets[u + 1]
+            stats['edges_scanned'] += end - start
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                # Etapa de Relaxamento (RELAX)
+                if distances[v] > du + weight:
+                    distances[v] = du + weight
+                    predecessors[v] = u
+                    stats['relaxations'] += 1
+                    path_edges[v] = path_edges[u] + 1
+                    if path_edges[v] >= num_vertices:
+                        return True
+                    if v == u:  # laço negativo (u -> u)
+                        return True
+                    if not in_queue[v]:
+                        in_queue[v] = True
+                        next_queue.append(v)
+        queue = next_queue
+        if progress:
+            # No pior caso são |V| passadas (a fração é uma estimativa)
+            progress(min(stats['passes'] / num_vertices, 1.0))
+
+    return False
@@ -0,0 +1,302 @@
+"""
+Floyd-Warshall em blocos (tiles), com as matrizes em disco.
+
+Para grafos cuja matriz V x V não cabe na memória, as matrizes de distância
+(float64) e de próximo vértice (int32) ficam em arquivos mapeados
+(numpy.memmap) e só blocos B x B são carregados por vez. Para cada bloco
+diagonal k (vértices intermediários do bloco k), a rodada tem três fases:
+
+1. o bloco diagonal (k, k);
+2. os blocos da linha k e da coluna k, que dependem só do bloco (k, k);
+3. os demais blocos (i, j), que dependem dos blocos (i, k) e (k, j).
+
+Os blocos de uma mesma fase são independentes e podem ser processados em
+paralelo por um ProcessPoolExecutor: cada processo abre os mesmos arquivos
+(pelo 'initializer' do pool, como no multi_source.py) e grava o seu bloco
+direto no mapeamento compartilhado.
+
+O lado B dos blocos é escolhido pelo limite de memória (choose_block_size):
+cada tarefa mantém cerca de TILE_BYTES_PER_CELL * B² bytes em memória.
+
+Sem ciclos negativos, as distâncias são as mesmas do Floyd-Warshall
+comum; havendo caminhos mínimos empatados, o caminho retornado pode ser
+outro, de mesmo custo.
+
+Com arestas de peso <= 0 pode haver ciclos de peso zero, e a ordem dos
+blocos pode deixar um ciclo na matriz de próximos vértices (os empates
+são resolvidos em momentos diferentes em cada bloco). Nesse caso uma
+terceira matriz (nº de arestas do caminho, int32) desempata: entre dois
+caminhos de mesmo custo fica o de menos arestas.
+"""
+import math
+import os
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from ..instrumentation import count, phase
+from .all_pairs import NO_HOP
+
+# NumPy é obrigatório nesta versão (numpy.memmap)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Bytes por célula das duas matrizes (distância float64 + próximo vértice int32)
+BYTES_PER_CELL = 12
+
+# Bytes por célula da matriz de nº de arestas (desempate, ver acima)
+HOP_COUNT_BYTES_PER_CELL = 4
+
+# Bytes por célula de um bloco mantidos por uma tarefa: blocos (i, j), (i, k)
+# e (k, j) com as distâncias e os saltos, mais os temporários (candidato e
+# máscara de melhora). Com o desempate, mais os blocos de nº de arestas, o
+# candidato e uma máscara. Ver _relax_tile.
+TILE_BYTES_PER_CELL = 41
+TILE_HOP_COUNT_BYTES_PER_CELL = 17
+
+MIN_BLOCK_SIZE = 16
+
+# Arquivos mapeados do processo trabalhador (definidos por _init_worker)
+_worker_matrices = None
+
+
+def matrix_bytes(num_vertices):
+    """Retorna quantos bytes as matrizes V x V (distância e próximo vértice) ocupam."""
+    return BYTES_PER_CELL * num_vertices * num_vertices
+
+
+def choose_block_size(num_vertices, memory_budget, max_workers=1, count_hops=False):
+    """
+    Escolhe o lado B dos blocos para que as tarefas simultâneas caibam no
+    limite de memória.
+
+    :param num_vertices: Nº de vértices.
+    :param memory_budget: Limite de memória (bytes) para os blocos em uso.
+    :param max_workers: Nº de tarefas simultâneas (processos).
+    :param count_hops: Se o desempate pelo nº de arestas será usado.
+    :return: int entre MIN_BLOCK_SIZE e num_vertices.
+    """
+    cell_bytes = TILE_BYTES_PER_CELL + (TILE_HOP_COUNT_BYTES_PER_CELL if count_hops else 0)
+    size = int(math.sqrt(memory_budget / (cell_bytes * max(1, max_workers))))
+    return max(1, min(num_vertices, max(MIN_BLOCK_SIZE, size)))
+
+
+_MATRIX_DTYPES = (np.float64, np.int32, np.int32) if HAS_NUMPY else ()
+
+
+def _open_matrices(paths, num_vertices):
+    """Abre (leitura e escrita) as matrizes gravadas em disco, na ordem de 'paths'."""
+    shape = (num_vertices, num_vertices)
+    return [np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+            for path, dtype in zip(paths, _MATRIX_DTYPES)]
+
+
+def _init_worker(paths, num_vertices, bounds):
+    """Abre os arquivos das matrizes uma única vez, quando o processo do pool é criado."""
+    global _worker_matrices
+    _worker_matrices = (_open_matrices(paths, num_vertices), bounds)
+
+
+def _relax_in_worker(task):
+    """Tarefa executada no processo do pool: (k, i, j)."""
+    matrices, bounds = _worker_matrices
+    _relax_tile(matrices, bounds, *task)
+
+
+def _relax_tile(matrices, bounds, k, i, j):
+    """
+    Relaxa o bloco (i, j) pelos vértices intermediários do bloco k.
+
+    O bloco é copiado para a memória, atualizado e gravado de volta. Nas
+    fases 1 e 2 (i == k ou j == k) o bloco (i, k) ou (k, j) é o próprio
+    bloco (i, j), atualizado no lugar, como no Floyd-Warshall comum.
+
+    :param matrices: Lista [dist, next_vertex] ou [dist, next_vertex, hop_count]
+                     de numpy.memmap (hop_count: nº de arestas, para desempate).
+    :param bounds: Lista de slices com as faixas de vértices de cada bloco.
+    """
+    dist, next_vertex = matrices[0], matrices[1]
+    hop_count = matrices[2] if len(matrices) > 2 else None
+    rows, cols, middle = bounds[i], bounds[j], bounds[k]
+    d_ij = np.array(dist[rows, cols])
+    n_ij = np.array(next_vertex[rows, cols])
+    if j == k:
+        d_ik, n_ik = d_ij, n_ij
+    else:
+        d_ik, n_ik = np.array(dist[rows, middle]), np.array(next_vertex[rows, middle])
+    d_kj = d_ij if i == k else np.array(dist[middle, cols])
+
+    candidate = np.empty_like(d_ij)
+    improved = np.empty(d_ij.shape, dtype=bool)
+    if hop_count is not None:
+        h_ij = np.array(hop_count[rows, cols])
+        h_ik = h_ij if j == k else np.array(hop_count[rows, middle])
+        h_kj = h_ij if i == k else np.array(hop_count[middle, cols])
+        hop_candidate = np.empty_like(h_ij)
+        tie = np.empty(d_ij.shape, dtype=bool)
+
+    # Com ciclos negativos as distâncias podem chegar a -inf (e inf + -inf = NaN)
+    with np.errstate(over='ignore', invalid='ignore'):
+        for m in range(d_ik.shape[1]):
+            # candidate[a][b] = dist[a][m] + dist[m][b]
+            np.add(d_ik[:, m, None], d_kj[None, m, :], out=candidate)
+            np.less(candidate, d_ij, out=improved)
+            if hop_count is not None:
+                # Empate no custo (e alcançável): vence o caminho com menos arestas
+                np.add(h_ik[:, m, None], h_kj[None, m, :], out=hop_candidate)
+                np.equal(candidate, d_ij, out=tie)
+                tie &= hop_candidate < h_ij
+                tie &= candidate < np.inf
+                improved |= tie
+                np.copyto(h_ij, hop_candidate, where=improved)
+            np.fmin(d_ij, candidate, out=d_ij)
+            # next_vertex[a][b] = next_vertex[a][m] onde houve melhora
+            np.copyto(n_ij, n_ik[:, m, None], where=improved)
+
+    dist[rows, cols] = d_ij
+    next_vertex[rows, cols] = n_ij
+    if hop_count is not None:
+        hop_count[rows, cols] = h_ij
+
+
+def _create_matrix_file(spill_dir, prefix):
+    """Cria um arquivo temporário vazio para uma matriz e retorna o caminho."""
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix='.mmap', dir=spill_dir)
+    os.close(fd)
+    return path
+
+
+def _release_file(matrix, path):
+    """
+    Remove o arquivo de uma matriz que continua em uso (pelo resultado).
+
+    No POSIX o arquivo pode ser apagado já: o mapeamento continua válido e o
+    espaço é liberado quando ele é fechado. Em outros sistemas, o arquivo é
+    apagado quando a matriz é descartada.
+    """
+    try:
+        os.unlink(path)
+    except OSError:
+        weakref.finalize(matrix, _remove_quietly, path)
+
+
+def _remove_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def blocked_floyd_warshall_arrays(compact, memory_budget, max_workers=1, spill_dir=None,
+                                  block_size=None, progress=None):
+    """
+    Executa o Floyd-Warshall em blocos sobre matrizes em disco.
+
+    :param compact: Objeto CompactGraph.
+    :param memory_budget: Limite de memória (bytes) para os blocos em uso.
+    :param max_workers: Nº de processos para os blocos de cada fase
+                        (1 = em série, None = todos os núcleos).
+    :param spill_dir: Diretório dos arquivos das matrizes (None = o
+                      diretório temporário do sistema).
+    :param block_size: Lado dos blocos (None = escolhido pelo limite de memória).
+    :param progress: Função opcional chamada com a fração concluída (0 a 1);
+                     se ela lançar uma exceção, a execução é interrompida.
+    :return: Tupla (dist, next_vertex) de numpy.memmap V x V, indexadas
+             como o grafo compacto; os arquivos são apagados quando as
+             matrizes são descartadas.
+    :raises ImportError: Se o NumPy não estiver instalado.
+    """
+    if not HAS_NUMPY:
+        raise ImportError('NumPy não está instalado.')
+
+    n = compact.num_vertices()
+    # Ciclos de peso zero só existem com arestas de peso <= 0
+    min_weight = compact.weight_range()[0]
+    count_hops = min_weight is not None and min_weight <= 0
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if block_size is None:
+        block_size = choose_block_size(n, memory_budget, max_workers, count_hops)
+    bounds = [slice(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+    num_blocks = len(bounds)
+    # Com menos blocos por fase que processos, os processos extras ficariam parados
+    max_workers = max(1, min(max_workers, (num_blocks - 1) ** 2))
+
+    prefixes = ('fw-dist-', 'fw-next-', 'fw-hops-')[:3 if count_hops else 2]
+    paths = []
+    executor = None
+    completed = False
+    try:
+        # --- 1. Inicialização das matrizes em disco, por faixas de linhas ---
+        with phase('init'):
+            for prefix in prefixes:
+                paths.append(_create_matrix_file(spill_dir, prefix))
+            shape = (n, n)
+            matrices = [np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+                        for path, dtype in zip(paths, _MATRIX_DTYPES)]
+            dist, next_vertex = matrices[0], matrices[1]
+            for rows in bounds:
+                dist[rows] = np.inf
+                next_vertex[rows] = NO_HOP
+                # Diagonal primeiro, depois as arestas (como na versão em memória)
+                diagonal = np.arange(rows.start, rows.stop)
+                dist[diagonal, diagonal] = 0.0
+            sources = np.frombuffer(compact.edge_sources(), dtype=np.int32)
+            targets = np.frombuffer(compact.targets, dtype=np.int32)
+            dist[sources, targets] = np.frombuffer(compact.weights, dtype=np.float64)
+            next_vertex[sources, targets] = targets
+            if count_hops:
+                # O arquivo novo já vem zerado: só as arestas têm 1
+                matrices[2][sources, targets] = 1
+            for matrix in matrices:
+                matrix.flush()
+
+        if max_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(paths, n, bounds)
+            )
+
+        def run(tasks):
+            if executor is None:
+                for task in tasks:
+                    _relax_tile(matrices, bounds, *task)
+            else:
+                # Consome o iterador para esperar a fase inteira (e propagar erros)
+                for _ in executor.map(_relax_in_worker, tasks):
+                    pass
+
+        # --- 2. Rodadas (uma por bloco diagonal), em três fases ---
+        with phase('k_loop'):
+            others = range(num_blocks)
+            for k in range(num_blocks):
+                run([(k, k, k)])
+                run([(k, k, j) for j in others if j != k] + [(k, i, k) for i in others if i != k])
+                run([(k, i, j) for i in others if i != k for j in others if j != k])
+                # Grava as páginas alteradas: no disco, elas podem sair da memória
+                for matrix in matrices:
+                    matrix.flush()
+                if progress:
+                    progress((k + 1) / num_blocks)
+        count('tiles', num_blocks ** 3)
+        count('pair_checks', n ** 3)
+        completed = True
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if not completed:
+            # Interrompido (erro ou cancelamento): as matrizes não serão usadas
+            for path in paths:
+                _remove_quietly(path)
+
+    # A matriz de desempate só é usada durante a execução
+    if count_hops:
+        _release_file(matrices.pop(), paths[2])
+    _release_file(dist, paths[0])
+    _release_file(next_vertex, paths[1])
+    return dist, next_vertex
@@ -0,0 +1,161 @@
+"""
+Algoritmo de Borůvka para a floresta geradora mínima.
+
+A cada rodada, cada componente escolhe sua aresta de saída mais leve e
+todas as escolhidas entram na floresta de uma vez; o nº de componentes cai
+pelo menos pela metade, então são no máximo log2(V) rodadas.
+
+A busca das arestas mais leves de uma rodada é independente por vértice:
+os vértices são divididos em faixas que podem ser examinadas em paralelo
+por um ProcessPoolExecutor. Como no multi_source.py, o grafo compacto é
+enviado uma única vez para cada processo (pelo 'initializer' do pool); a
+cada rodada, as tarefas recebem só o componente de cada vértice.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ..instrumentation import count, phase
+from .spanning import build_forest_result
+from .union_find import UnionFind
+
+# Grafo compacto do processo trabalhador (definido por _init_worker)
+_worker_graph = None
+
+
+def _init_worker(compact):
+    """Recebe o grafo uma única vez, quando o processo do pool é criado."""
+    global _worker_graph
+    _worker_graph = compact
+
+
+def cheapest_edges(compact, component, start, stop):
+    """
+    Encontra a aresta de saída mais leve de cada componente, olhando as
+    arestas dos vértices start .. stop - 1.
+
+    Os empates são desfeitos pela chave (peso, menor índice, maior índice),
+    uma ordem total das arestas: sem ela, dois componentes poderiam
+    escolher arestas de mesmo peso que fecham um ciclo.
+
+    :param compact: Objeto CompactGraph.
+    :param component: Sequência com o componente (representante) de cada vértice.
+    :param start: Primeiro vértice da faixa.
+    :param stop: Fim (exclusivo) da faixa.
+    :return: dict componente -> (peso, u, v), com u < v.
+    """
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+    directed = compact.directed
+    best = {}
+    for u in range(start, stop):
+        cu = component[u]
+        start_edge, end_edge = offsets[u], offsets[u + 1]
+        for v, weight in zip(targets[start_edge:end_edge], weights[start_edge:end_edge]):
+            cv = component[v]
+            if cu == cv:
+                continue
+            # Compara o peso antes de montar a chave completa (caso comum)
+            current = best.get(cu)
+            if current is None or weight < current[0] or (
+                    weight == current[0] and (min(u, v), max(u, v)) < current[1:]):
+                best[cu] = (weight, u, v) if u < v else (weight, v, u)
+            if directed:
+                # Em um digrafo, o componente de v pode não ter arestas de
+                # saída próprias (no não direcionado, a aresta v -> u existe)
+                current = best.get(cv)
+                if current is None or weight < current[0] or (
+                        weight == current[0] and (min(u, v), max(u, v)) < current[1:]):
+                    best[cv] = (weight, u, v) if u < v else (weight, v, u)
+    return best
+
+
+def _cheapest_in_worker(task):
+    """Tarefa executada no processo do pool: (component, start, stop)."""
+    component, start, stop = task
+    return cheapest_edges(_worker_graph, component, start, stop)
+
+
+def boruvka_mst(graph, max_workers=1):
+    """
+    Executa o algoritmo de Borůvka para encontrar a floresta geradora mínima
+    de um grafo não direcionado e ponderado (uma árvore por componente).
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param max_workers: Nº de processos para examinar as arestas de cada
+                        rodada (1 = em série, None = todos os núcleos).
+    :return: Um dicionário no mesmo formato do prim_mst, com o nº de
+             componentes em 'components'.
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    labels = compact.labels
+    num_vertices = compact.num_vertices()
+    if not num_vertices:
+        return {
+            'success': False,
+            'algorithm': 'Borůvka',
+            'error': 'O grafo está vazio.'
+        }
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, num_vertices))
+
+    components = UnionFind(num_vertices)
+    mst_edges = []
+    total_cost = 0
+
+    executor = None
+    if max_workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(compact,)
+        )
+    # Faixas de vértices de cada tarefa (algumas por processo, para equilibrar)
+    step = -(-num_vertices // (max_workers * 4))
+    ranges = [(start, min(start + step, num_vertices)) for start in range(0, num_vertices, step)]
+
+    # --- 2. Rodadas ---
+
+    rounds = 0
+    try:
+        while True:
+            rounds += 1
+            component = array('i', (components.find(x) for x in range(num_vertices)))
+
+            # Aresta mais leve de cada componente (em paralelo, por faixas)
+            with phase('cheapest'):
+                if executor is None:
+                    partials = [cheapest_edges(compact, component, 0, num_vertices)]
+                else:
+                    tasks = ((component, start, stop) for start, stop in ranges)
+                    partials = executor.map(_cheapest_in_worker, tasks)
+
+                best = {}
+                for partial in partials:
+                    for c, key in partial.items():
+                        current = best.get(c)
+                        if current is None or key < current:
+                            best[c] = key
+
+            # Nenhum componente tem aresta de saída: a floresta está completa
+            if not best:
+                break
+
+            # Todas as arestas escolhidas entram na floresta de uma vez
+            for weight, u, v in sorted(set(best.values())):
+                if components.union(u, v):
+                    mst_edges.append((labels[u], labels[v], weight))
+                    total_cost += weight
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    count('rounds', rounds)
+
+    # --- 3. Retorno ---
+
+    return build_forest_result('Borůvka', mst_edges, total_cost, components.count)
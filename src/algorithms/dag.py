@@ -0,0 +1,162 @@
+"""
+Caminhos mínimos e mais longos em grafos acíclicos direcionados (DAG).
+
+Num DAG, relaxar as arestas de cada vértice uma única vez, em ordem
+topológica, já resolve os caminhos a partir de uma origem em O(V + E),
+mesmo com pesos negativos (não há ciclos, logo nem ciclos negativos). O
+Bellman-Ford usa esta relaxação automaticamente quando o grafo é acíclico
+(modo 'dag', ver bellman_ford.py).
+
+Trocando a comparação do relaxamento, a mesma passada calcula os caminhos
+mais longos, que em grafos de agendamento (tarefas e dependências) dão o
+caminho crítico: a sequência de tarefas que define a duração total.
+"""
+import math
+
+from ..instrumentation import count, phase
+from .paths import build_single_source_results
+
+
+def dag_relax(compact, source, longest=False):
+    """
+    Relaxa as arestas de cada vértice em ordem topológica.
+
+    :param compact: Objeto CompactGraph acíclico.
+    :param source: Índice do vértice de origem.
+    :param longest: Se True, calcula os caminhos mais longos.
+    :return: Tupla (distances, predecessors, stats); distances traz math.inf
+             (ou -math.inf, se longest) para os vértices inalcançáveis.
+    :raises ValueError: Se o grafo tiver ciclo.
+    """
+    order = compact.topological_order()
+    if order is None:
+        raise ValueError('O grafo possui ciclos: a ordem topológica não existe.')
+
+    num_vertices = compact.num_vertices()
+    unreachable = -math.inf if longest else math.inf
+    distances = [unreachable] * num_vertices
+    predecessors = [None] * num_vertices
+    distances[source] = 0
+
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+    relaxations = 0
+    edges_scanned = 0
+    for u in order:
+        du = distances[u]
+        # Vértices antes da origem na ordem (ou fora do seu alcance) ficam de fora
+        if du == unreachable:
+            continue
+        start, end = offsets[u], offsets[u + 1]
+        edges_scanned += end - start
+        for v, weight in zip(targets[start:end], weights[start:end]):
+            # Etapa de Relaxamento (RELAX), no sentido pedido
+            candidate = du + weight
+            if (distances[v] < candidate) if longest else (distances[v] > candidate):
+                distances[v] = candidate
+                predecessors[v] = u
+                relaxations += 1
+
+    stats = {'mode': 'dag', 'passes': 1, 'relaxations': relaxations, 'edges_scanned': edges_scanned}
+    return distances, predecessors, stats
+
+
+def critical_path(compact, source):
+    """
+    Retorna o caminho crítico a partir da origem: o mais longo entre todos
+    os caminhos que saem dela.
+
+    :param compact: Objeto CompactGraph acíclico.
+    :param source: Índice do vértice de origem.
+    :return: dict {'path': [rótulos], 'length': custo, 'target': rótulo final}.
+    """
+    distances, predecessors, _ = dag_relax(compact, source, longest=True)
+    return _critical_path(compact.labels, distances, predecessors)
+
+
+def _critical_path(labels, distances, predecessors):
+    """Monta o caminho crítico a partir das distâncias mais longas."""
+    # Destino mais distante (em empate, o de menor índice)
+    target = max(range(len(distances)), key=distances.__getitem__)
+    path = []
+    curr = target
+    while curr is not None:
+        path.append(labels[curr])
+        curr = predecessors[curr]
+    return {
+        'path': path[::-1],
+        'length': distances[target],
+        'target': labels[target]
+    }
+
+
+def dag_longest_paths(graph, start_vertex):
+    """
+    Calcula os caminhos mais longos a partir de uma origem em um grafo
+    acíclico direcionado, em O(V + E), e o caminho crítico.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param start_vertex: O vértice de origem.
+    :return: Um dicionário no formato do bellman_ford ('results' com as
+             distâncias e os caminhos mais longos), com 'longest': True e o
+             caminho crítico em 'critical_path'.
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    vertices = compact.labels
+    if not vertices:
+        return {
+            'success': False,
+            'algorithm': 'DAG',
+            'error': 'O grafo está vazio.'
+        }
+
+    if not compact.has_vertex(start_vertex):
+        return {
+            'success': False,
+            'algorithm': 'DAG',
+            'error': f'O vértice inicial "{start_vertex}" não foi encontrado no grafo.'
+        }
+
+    with phase('topological_order'):
+        acyclic = compact.is_acyclic()
+    if not acyclic:
+        return {
+            'success': False,
+            'algorithm': 'DAG',
+            'error': 'O grafo possui ciclos: caminhos mais longos só são calculados em grafos acíclicos direcionados (DAG).'
+        }
+
+    # --- 2. Relaxamento em ordem topológica ---
+
+    source = compact.index[start_vertex]
+    with phase('relax'):
+        distances, predecessors, stats = dag_relax(compact, source, longest=True)
+    count('relaxations', stats['relaxations'])
+    count('edges_scanned', stats['edges_scanned'])
+
+    # --- 3. Preparação dos Resultados ---
+
+    with phase('paths'):
+        path = _critical_path(vertices, distances, predecessors)
+        # Inalcançáveis: -inf vira 'Infinito' (sem caminho) como nos demais
+        display_distances, paths = build_single_source_results(
+            vertices, [math.inf if d == -math.inf else d for d in distances], predecessors, source
+        )
+
+    return {
+        'success': True,
+        'algorithm': 'DAG',
+        'longest': True,
+        'start_vertex': start_vertex,
+        'negative_cycle': False,
+        'message': 'Caminhos mais longos encontrados com sucesso.',
+        'stats': stats,
+        'critical_path': path,
+        'results': {
+            'distances': display_distances,
+            'paths': paths
+        }
+    }
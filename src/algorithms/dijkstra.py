@@ -0,0 +1,155 @@
+import heapq
+import math
+
+from ..instrumentation import count, phase
+from .heap import RadixHeap
+from .paths import build_single_source_results
+
+
+def dijkstra(graph, start_vertex, heap='auto'):
+    """
+    Executa o algoritmo de Dijkstra para encontrar os caminhos mínimos
+    a partir de um vértice de origem em um grafo com pesos não negativos.
+
+    Complexidade O((V + E) log V) com heap binário, contra O(V * E) do
+    Bellman-Ford. Com pesos inteiros pode usar um radix heap.
+
+    Aceita um Graph ou um CompactGraph: em ambos os casos o algoritmo
+    executa sobre a forma compacta (graph.freeze()).
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param start_vertex: O vértice de origem.
+    :param heap: 'binary' (heapq), 'radix' (pesos inteiros) ou 'auto'.
+    :return: Um dicionário no mesmo formato do bellman_ford.
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    vertices = compact.labels
+    if not vertices:
+        return {
+            'success': False,
+            'algorithm': 'Dijkstra',
+            'error': 'O grafo está vazio.'
+        }
+
+    if not compact.has_vertex(start_vertex):
+        return {
+            'success': False,
+            'algorithm': 'Dijkstra',
+            'error': f'O vértice inicial "{start_vertex}" não foi encontrado no grafo.'
+        }
+
+    if compact.has_negative_weights:
+        return {
+            'success': False,
+            'algorithm': 'Dijkstra',
+            'error': 'O grafo possui arestas de peso negativo. Use o Bellman-Ford.'
+        }
+
+    if heap == 'auto':
+        heap = 'radix' if radix_heap_fits(compact) else 'binary'
+
+    # --- 2. Algoritmo Principal ---
+
+    source = compact.index[start_vertex]
+    stats = {}
+    with phase('relax'):
+        distances, predecessors = dijkstra_arrays(compact, source, heap=heap, stats=stats)
+    count('heap_pushes', stats['heap_pushes'])
+    count('heap_pops', stats['heap_pops'])
+
+    # --- 3. Preparação dos Resultados ---
+
+    with phase('paths'):
+        display_distances, paths = build_single_source_results(
+            vertices, distances, predecessors, source
+        )
+
+    return {
+        'success': True,
+        'algorithm': 'Dijkstra',
+        'start_vertex': start_vertex,
+        'negative_cycle': False,
+        'heap': 'Radix heap' if heap == 'radix' else 'Heap binário',
+        'message': 'Caminhos mínimos encontrados com sucesso.',
+        'results': {
+            'distances': display_distances,
+            'paths': paths
+        }
+    }
+
+
+def radix_heap_fits(compact):
+    """
+    Verifica se o radix heap serve para o grafo: pesos inteiros e qualquer
+    distância (no máximo o maior peso vezes V - 1 arestas) abaixo de
+    RadixHeap.MAX_KEY.
+
+    :param compact: Objeto CompactGraph (pesos não negativos).
+    :return: bool
+    """
+    max_weight = compact.weight_range()[1]
+    if max_weight is None:
+        return True
+    if max_weight * max(1, compact.num_vertices() - 1) >= RadixHeap.MAX_KEY:
+        return False
+    return all(w.is_integer() for w in compact.weights)
+
+
+def dijkstra_arrays(compact, source, heap='binary', stats=None):
+    """
+    Núcleo do Dijkstra sobre um CompactGraph, com vértices como índices.
+
+    Usa "remoção preguiçosa": um vértice pode entrar várias vezes na fila
+    e as entradas desatualizadas são ignoradas ao saírem.
+
+    :param compact: Objeto CompactGraph (pesos não negativos).
+    :param source: Índice do vértice de origem.
+    :param heap: 'binary' (heapq) ou 'radix' (pesos inteiros).
+    :param stats: dict opcional que recebe as operações de heap
+                  ('heap_pushes' e 'heap_pops').
+    :return: Tupla (distances, predecessors), listas indexadas por vértice.
+    """
+    num_vertices = compact.num_vertices()
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+
+    distances = [math.inf] * num_vertices
+    predecessors = [None] * num_vertices
+    settled = [False] * num_vertices
+    distances[source] = 0
+
+    if heap == 'radix':
+        queue = RadixHeap()
+        push, pop = queue.push, queue.pop
+    else:
+        queue = []
+        push = lambda key, item: heapq.heappush(queue, (key, item))
+        pop = lambda: heapq.heappop(queue)
+
+    push(0, source)
+    pushes = 1
+    pops = 0
+    while queue:
+        du, u = pop()
+        pops += 1
+        if settled[u]:
+            continue
+        settled[u] = True
+
+        start, end = offsets[u], offsets[u + 1]
+        for v, weight in zip(targets[start:end], weights[start:end]):
+            # Etapa de Relaxamento (RELAX)
+            new_dist = du + weight
+            if new_dist < distances[v]:
+                distances[v] = new_dist
+                predecessors[v] = u
+                push(new_dist, v)
+                pushes += 1
+
+    if stats is not None:
+        stats['heap_pushes'] = pushes
+        stats['heap_pops'] = pops
+    return distances, predecessors
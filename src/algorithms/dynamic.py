@@ -0,0 +1,686 @@
+"""
+Atualização incremental (dinâmica) de caminhos mínimos e da MST.
+
+Os grafos mudam poucas arestas por vez, mas dijkstra/bellman_ford/prim_mst
+recomeçam do zero a cada execução. As classes deste módulo guardam o estado
+da execução anterior e, a cada alteração de aresta, recalculam apenas a
+região afetada:
+
+- DynamicShortestPaths (distâncias e árvore de caminhos mínimos de uma origem):
+  - inserção ou redução de peso de (u, v): se dist[u] + peso melhora dist[v],
+    a melhora se propaga a partir de v, visitando só os vértices cuja
+    distância cai;
+  - remoção ou aumento de peso de uma aresta da árvore: só a subárvore abaixo
+    de v perde as distâncias; cada vértice dela é religado pelo melhor
+    vizinho de entrada e a correção se propaga a partir daí;
+  - alterações em arestas fora da árvore que não melhoram nada custam O(1).
+- DynamicMST (floresta geradora mínima de um grafo não direcionado):
+  - inserção ou redução de peso: se a aresta fecha um ciclo na árvore, a
+    aresta mais pesada do ciclo é trocada por ela (propriedade do ciclo);
+  - remoção ou aumento de peso de uma aresta da árvore: a árvore se divide
+    em duas partes, religadas pela aresta mais leve entre elas
+    (propriedade do corte).
+
+As duas classes alteram o Graph recebido: use to_mutable_graph() para obter
+uma cópia do grafo (ex: de um CompactGraph do cache).
+"""
+import heapq
+import itertools
+import math
+from collections import deque
+
+from ..graph import Graph
+from .bellman_ford import bellman_ford_arrays
+from .dijkstra import dijkstra_arrays
+from .paths import build_single_source_results
+
+# Estimativas (em bytes) do estado das classes, sem contar o grafo (usadas em
+# nbytes() para limitar a memória das sessões). Não precisam ser exatas.
+PATHS_BYTES_PER_VERTEX = 500  # dist, pred, hops e o set de filhos
+INCOMING_BYTES_PER_VERTEX = 64  # Vizinhos de entrada (grafo direcionado)
+INCOMING_BYTES_PER_EDGE = 30
+MST_BYTES_PER_VERTEX = 220  # tree (arestas da floresta nos dois sentidos)
+
+
+def to_mutable_graph(graph):
+    """
+    Retorna uma cópia alterável (Graph) de um Graph ou CompactGraph.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :return: Um objeto Graph independente do original.
+    """
+    if isinstance(graph, Graph):
+        return graph.copy()
+    return Graph.from_compact(graph)
+
+
+def check_updates(graph, updates):
+    """
+    Verifica, sem alterar o grafo, se todas as remoções de um lote encontram
+    a aresta (considerando as alterações anteriores do próprio lote).
+
+    :param graph: Objeto Graph.
+    :param updates: Sequência de tuplas (u, v, peso); peso None remove a aresta.
+    :raises KeyError: Com (u, v) da primeira remoção de aresta inexistente.
+    """
+    present = {}  # aresta -> existe após as alterações anteriores do lote
+    for u, v, weight in updates:
+        key = (u, v) if graph.directed else frozenset((u, v))
+        if weight is not None:
+            present[key] = True
+            continue
+        exists = present.get(key)
+        if exists is None:
+            exists = v in graph.get_neighbors(u)
+        if not exists:
+            raise KeyError((u, v))
+        present[key] = False
+
+
+class DynamicShortestPaths:
+    """
+    Caminhos mínimos a partir de uma origem, mantidos entre alterações do grafo.
+
+    A primeira execução usa o dijkstra_arrays (ou o bellman_ford_arrays, se
+    houver pesos negativos). Depois dela, update_edge/remove_edge corrigem
+    só a parte afetada. Se uma alteração criar um ciclo negativo, o estado
+    fica inválido ('negative_cycle') e a próxima alteração recalcula tudo.
+    """
+
+    def __init__(self, graph, start_vertex):
+        """
+        :param graph: Objeto Graph (alterado pelas atualizações).
+        :param start_vertex: O vértice de origem.
+        :raises ValueError: Se o grafo estiver vazio ou a origem não existir.
+        """
+        if not graph.adj_list:
+            raise ValueError('O grafo está vazio.')
+        if start_vertex not in graph.adj_list:
+            raise ValueError(f'O vértice inicial "{start_vertex}" não foi encontrado no grafo.')
+
+        self.graph = graph
+        self.start_vertex = start_vertex
+        self.algorithm = None
+        self.negative_cycle = False
+        self.stats = {'updates': 0, 'full_recomputes': 0, 'vertices_touched': 0}
+
+        # Estado por rótulo: distância, predecessor na árvore, nº de arestas
+        # do caminho (para detectar ciclos negativos) e filhos na árvore
+        self.dist = {}
+        self.pred = {}
+        self.hops = {}
+        self.children = {}
+
+        # Vizinhos de entrada de cada vértice (no grafo não direcionado, são
+        # os próprios vizinhos)
+        if graph.directed:
+            self._incoming = {v: {} for v in graph.adj_list}
+            for u, neighbors in graph.adj_list.items():
+                for v, weight in neighbors.items():
+                    self._incoming[v][u] = weight
+        else:
+            self._incoming = graph.adj_list
+
+        self._changed = {}  # rótulo -> (distância, predecessor) antes do lote
+        self._counter = itertools.count()  # Desempate das entradas do heap
+        self._recompute()
+        self._changed.clear()
+
+    # --- Alterações do grafo ---
+
+    def update_edge(self, u, v, weight):
+        """
+        Insere a aresta (u, v) ou altera seu peso, corrigindo os caminhos.
+
+        :param u: Vértice de origem (criado se não existir).
+        :param v: Vértice de destino (criado se não existir).
+        :param weight: Novo peso da aresta.
+        """
+        weight = float(weight)
+        old_weight = self.graph.get_neighbors(u).get(v)
+        self.graph.add_edge(u, v, weight)
+        self.stats['updates'] += 1
+
+        arcs = self._arcs(u, v)
+        for a, b in arcs:
+            self._register_vertex(a)
+            self._register_vertex(b)
+            if self._incoming is not self.graph.adj_list:
+                self._incoming[b][a] = weight
+
+        if self.negative_cycle:
+            self._recompute()
+            return
+
+        for a, b in arcs:
+            if a == b:
+                # Laço: só importa se for negativo e alcançável (ciclo negativo)
+                if weight < 0 and self.dist[a] != math.inf:
+                    self.negative_cycle = True
+                    return
+                continue
+            if old_weight is not None and weight > old_weight and self.pred[b] == a:
+                # Aumento de peso de uma aresta da árvore
+                self._repair_subtree(b)
+            elif self.dist[a] + weight < self.dist[b]:
+                # Inserção ou redução de peso que melhora o caminho até b
+                if not self._relax(a, b, self.dist[a] + weight):
+                    return
+                self._propagate([(self.dist[b], next(self._counter), b)])
+            if self.negative_cycle:
+                return
+
+    def remove_edge(self, u, v):
+        """
+        Remove a aresta (u, v), corrigindo os caminhos que passavam por ela.
+
+        :raises KeyError: Se a aresta não existir.
+        """
+        self.graph.remove_edge(u, v)
+        self.stats['updates'] += 1
+
+        arcs = self._arcs(u, v)
+        if self._incoming is not self.graph.adj_list:
+            for a, b in arcs:
+                self._incoming[b].pop(a, None)
+
+        if self.negative_cycle:
+            self._recompute()
+            return
+
+        for a, b in arcs:
+            if a != b and self.pred[b] == a:
+                self._repair_subtree(b)
+                if self.negative_cycle:
+                    return
+
+    def apply_updates(self, updates):
+        """
+        Aplica um lote de alterações. O lote é verificado antes: se alguma
+        remoção não encontrar a aresta, nenhuma alteração é aplicada.
+
+        :param updates: Sequência de tuplas (u, v, peso); peso None remove a aresta.
+        :return: Lista dos rótulos cuja distância ou caminho mudou no lote.
+        :raises KeyError: Se uma aresta removida não existir (ver check_updates).
+        """
+        check_updates(self.graph, updates)
+        self._changed.clear()
+        for u, v, weight in updates:
+            if weight is None:
+                self.remove_edge(u, v)
+            else:
+                self.update_edge(u, v, weight)
+
+        changed = [
+            x for x, (old_dist, old_pred) in self._changed.items()
+            if self.dist[x] != old_dist or self.pred[x] != old_pred
+        ]
+        self.stats['vertices_touched'] = len(self._changed)
+        self._changed.clear()
+        return changed
+
+    # --- Consultas ---
+
+    def nbytes(self):
+        """
+        Estima quantos bytes o estado ocupa em memória, sem contar o grafo
+        (que cresce junto com as alterações).
+
+        :return: int
+        """
+        total = len(self.dist) * PATHS_BYTES_PER_VERTEX
+        if self._incoming is not self.graph.adj_list:
+            total += len(self._incoming) * INCOMING_BYTES_PER_VERTEX
+            total += sum(map(len, self._incoming.values())) * INCOMING_BYTES_PER_EDGE
+        return total
+
+    def distance(self, vertex):
+        """Distância mínima da origem até 'vertex' (math.inf se inalcançável)."""
+        return self.dist[vertex]
+
+    def path(self, vertex):
+        """
+        Caminho mínimo da origem até 'vertex'.
+
+        :return: Lista [origem, ..., vertex] ou None se não houver caminho.
+        """
+        if self.negative_cycle or self.dist[vertex] == math.inf:
+            return None
+        path = [vertex]
+        while vertex != self.start_vertex:
+            vertex = self.pred[vertex]
+            path.append(vertex)
+        return path[::-1]
+
+    def results(self):
+        """
+        Retorna o resultado completo no mesmo formato do bellman_ford/dijkstra.
+
+        :return: dict com 'success', 'algorithm', 'results', etc.
+        """
+        if self.negative_cycle:
+            return {
+                'success': False,
+                'algorithm': self.algorithm,
+                'negative_cycle': True,
+                'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
+            }
+
+        vertices = list(self.dist)
+        index = {label: i for i, label in enumerate(vertices)}
+        distances = [self.dist[x] for x in vertices]
+        predecessors = [None if self.pred[x] is None else index[self.pred[x]] for x in vertices]
+        display_distances, paths = build_single_source_results(
+            vertices, distances, predecessors, index[self.start_vertex]
+        )
+        return {
+            'success': True,
+            'algorithm': self.algorithm,
+            'start_vertex': self.start_vertex,
+            'negative_cycle': False,
+            'dynamic': True,
+            'message': 'Caminhos mínimos encontrados com sucesso.',
+            'stats': dict(self.stats),
+            'results': {
+                'distances': display_distances,
+                'paths': paths
+            }
+        }
+
+    # --- Internos ---
+
+    def _arcs(self, u, v):
+        """Arcos (origem, destino) afetados pela aresta (u, v)."""
+        if self.graph.directed or u == v:
+            return [(u, v)]
+        return [(u, v), (v, u)]
+
+    def _register_vertex(self, x):
+        """Inclui no estado um vértice criado por uma alteração (inalcançável)."""
+        if x not in self.dist:
+            self._changed[x] = (math.inf, None)
+            self.dist[x] = math.inf
+            self.pred[x] = None
+            self.hops[x] = 0
+            self.children[x] = set()
+            if self._incoming is not self.graph.adj_list:
+                self._incoming[x] = {}
+
+    def _remember(self, x):
+        """Guarda o estado de x antes da primeira mudança no lote."""
+        if x not in self._changed:
+            self._changed[x] = (self.dist[x], self.pred[x])
+
+    def _relax(self, a, b, new_dist):
+        """
+        Pendura b em a na árvore com a nova distância.
+
+        :return: False se a melhora indicar um ciclo negativo.
+        """
+        hops = self.hops[a] + 1
+        if b == self.start_vertex or hops >= len(self.dist):
+            # A origem melhorou ou o caminho repete vértices: ciclo negativo
+            self.negative_cycle = True
+            return False
+
+        self._remember(b)
+        parent = self.pred[b]
+        if parent is not None:
+            self.children[parent].discard(b)
+        self.pred[b] = a
+        self.children[a].add(b)
+        self.dist[b] = new_dist
+        self.hops[b] = hops
+        return True
+
+    def _propagate(self, queue):
+        """
+        Propaga melhoras de distância a partir dos vértices da fila (heap de
+        tuplas (distância, desempate, vértice)), como no Dijkstra.
+
+        Com pesos negativos um vértice pode ser revisitado (correção de
+        rótulos), mas só enquanto sua distância cair.
+        """
+        dist = self.dist
+        adj_list = self.graph.adj_list
+        while queue:
+            d, _, x = heapq.heappop(queue)
+            if d > dist[x]:
+                continue  # Entrada desatualizada
+            for y, weight in adj_list[x].items():
+                new_dist = d + weight
+                if new_dist < dist[y]:
+                    if not self._relax(x, y, new_dist):
+                        return
+                    heapq.heappush(queue, (new_dist, next(self._counter), y))
+
+    def _repair_subtree(self, root):
+        """
+        Recalcula as distâncias da subárvore de 'root', cujo caminho pela
+        árvore ficou mais caro (ou deixou de existir).
+        """
+        # --- 1. Desliga a subárvore ---
+        affected = []
+        stack = [root]
+        while stack:
+            x = stack.pop()
+            affected.append(x)
+            stack.extend(self.children[x])
+
+        for x in affected:
+            self._remember(x)
+            parent = self.pred[x]
+            if parent is not None:
+                self.children[parent].discard(x)
+            self.pred[x] = None
+            self.dist[x] = math.inf
+
+        # --- 2. Religa cada vértice pelo melhor vizinho de entrada ---
+        # (vizinhos de fora da subárvore têm distâncias corretas; os de
+        # dentro estão com infinito e são corrigidos na propagação)
+        queue = []
+        for x in affected:
+            best, best_parent = math.inf, None
+            for p, weight in self._incoming[x].items():
+                if self.dist[p] + weight < best:
+                    best, best_parent = self.dist[p] + weight, p
+            if best_parent is not None and best_parent != x:
+                if not self._relax(best_parent, x, best):
+                    return
+                queue.append((best, next(self._counter), x))
+
+        # --- 3. Propaga a partir dos vértices religados ---
+        heapq.heapify(queue)
+        self._propagate(queue)
+
+    def _recompute(self):
+        """Recalcula tudo do zero (execução inicial ou após um ciclo negativo)."""
+        for x in self.dist:
+            self._remember(x)
+
+        compact = self.graph.freeze()
+        labels = compact.labels
+        source = compact.index[self.start_vertex]
+        if compact.has_negative_weights:
+            self.algorithm = 'Bellman-Ford'
+            distances, predecessors, negative_cycle, _ = bellman_ford_arrays(compact, source, mode='spfa')
+        else:
+            self.algorithm = 'Dijkstra'
+            distances, predecessors = dijkstra_arrays(compact, source)
+            negative_cycle = False
+        self.stats['full_recomputes'] += 1
+
+        self.negative_cycle = negative_cycle
+        self.dist = {labels[i]: d for i, d in enumerate(distances)}
+        self.pred = {labels[i]: (None if p is None else labels[p]) for i, p in enumerate(predecessors)}
+        self.children = {x: set() for x in labels}
+        self.hops = dict.fromkeys(labels, 0)
+        if negative_cycle:
+            return  # A árvore pode ter ciclos: só é refeita no próximo recálculo
+
+        for x, parent in self.pred.items():
+            if parent is not None:
+                self.children[parent].add(x)
+
+        # Nº de arestas de cada caminho, descendo a árvore a partir da origem
+        queue = deque([self.start_vertex])
+        while queue:
+            x = queue.popleft()
+            for child in self.children[x]:
+                self.hops[child] = self.hops[x] + 1
+                queue.append(child)
+
+
+class DynamicMST:
+    """
+    Floresta geradora mínima de um grafo não direcionado, mantida entre
+    alterações do grafo. O resultado (results()) é a árvore do componente
+    do vértice inicial, como no prim_mst.
+    """
+
+    def __init__(self, graph, start_vertex):
+        """
+        :param graph: Objeto Graph não direcionado (alterado pelas atualizações).
+        :param start_vertex: Vértice inicial (define o componente do resultado).
+        :raises ValueError: Se o grafo for direcionado, estiver vazio ou a
+                            origem não existir.
+        """
+        if graph.directed:
+            raise ValueError('A MST dinâmica exige um grafo não direcionado.')
+        if not graph.adj_list:
+            raise ValueError('O grafo está vazio.')
+        if start_vertex not in graph.adj_list:
+            raise ValueError(f'O vértice inicial "{start_vertex}" não foi encontrado no grafo.')
+
+        self.graph = graph
+        self.start_vertex = start_vertex
+        self.stats = {'updates': 0, 'swaps': 0}
+
+        # Arestas da floresta: tree[u] = {v: peso}, nos dois sentidos
+        self.tree = {x: {} for x in graph.adj_list}
+        # Arestas tocadas no lote atual: {u, v} -> (u, v, peso antes do lote)
+        self._touched = {}
+
+        # Prim a partir do vértice inicial e, em seguida, dos demais componentes
+        visited = set()
+        for root in itertools.chain([start_vertex], graph.adj_list):
+            if root not in visited:
+                self._prim_component(root, visited)
+        self._touched.clear()
+
+    # --- Alterações do grafo ---
+
+    def update_edge(self, u, v, weight):
+        """
+        Insere a aresta (u, v) ou altera seu peso, corrigindo a árvore.
+
+        :param u: Vértice (criado se não existir).
+        :param v: Vértice (criado se não existir).
+        :param weight: Novo peso da aresta.
+        """
+        weight = float(weight)
+        old_weight = self.graph.get_neighbors(u).get(v)
+        self.graph.add_edge(u, v, weight)
+        self.stats['updates'] += 1
+        for x in (u, v):
+            self.tree.setdefault(x, {})
+        if u == v:
+            return  # Laços nunca entram na árvore
+
+        if v in self.tree[u]:
+            # Aresta da árvore: atualiza o peso; se aumentou, outra aresta
+            # do corte pode ficar mais leve que ela
+            self._unlink(u, v)
+            if old_weight is not None and weight > old_weight:
+                self._reconnect(u, v)
+            else:
+                self._link(u, v, weight)
+            return
+
+        # Aresta fora da árvore: troca pela mais pesada do ciclo, se for mais leve
+        path = self._tree_path(u, v)
+        if path is None:
+            self._link(u, v, weight)  # Une dois componentes
+            return
+        heaviest = max(zip(path, path[1:]), key=lambda edge: self.tree[edge[0]][edge[1]])
+        if self.tree[heaviest[0]][heaviest[1]] > weight:
+            self._unlink(*heaviest)
+            self._link(u, v, weight)
+            self.stats['swaps'] += 1
+
+    def remove_edge(self, u, v):
+        """
+        Remove a aresta (u, v); se ela estava na árvore, procura a substituta.
+
+        :raises KeyError: Se a aresta não existir.
+        """
+        self.graph.remove_edge(u, v)
+        self.stats['updates'] += 1
+        if v in self.tree[u]:
+            self._unlink(u, v)
+            self._reconnect(u, v)
+
+    def apply_updates(self, updates):
+        """
+        Aplica um lote de alterações. O lote é verificado antes: se alguma
+        remoção não encontrar a aresta, nenhuma alteração é aplicada.
+
+        :param updates: Sequência de tuplas (u, v, peso); peso None remove a aresta.
+        :return: Tupla (arestas que entraram, arestas que saíram da árvore),
+                 listas de (u, v, peso).
+        :raises KeyError: Se uma aresta removida não existir (ver check_updates).
+        """
+        check_updates(self.graph, updates)
+        self._touched.clear()
+        for u, v, weight in updates:
+            if weight is None:
+                self.remove_edge(u, v)
+            else:
+                self.update_edge(u, v, weight)
+
+        added, removed = [], []
+        for u, v, old_weight in self._touched.values():
+            new_weight = self.tree[u].get(v)
+            if new_weight == old_weight:
+                continue
+            if old_weight is not None:
+                removed.append((u, v, old_weight))
+            if new_weight is not None:
+                added.append((u, v, new_weight))
+        self._touched.clear()
+        return added, removed
+
+    # --- Consultas ---
+
+    def nbytes(self):
+        """
+        Estima quantos bytes o estado (a floresta) ocupa em memória, sem
+        contar o grafo.
+
+        :return: int
+        """
+        return len(self.tree) * MST_BYTES_PER_VERTEX
+
+    def results(self):
+        """
+        Retorna a árvore do componente do vértice inicial, no mesmo formato
+        do prim_mst.
+
+        :return: dict com 'success', 'mst_edges', 'total_cost', etc.
+        """
+        mst_edges = []
+        total_cost = 0
+        visited = {self.start_vertex}
+        queue = deque([self.start_vertex])
+        while queue:
+            u = queue.popleft()
+            for v, weight in self.tree[u].items():
+                if v not in visited:
+                    visited.add(v)
+                    mst_edges.append((u, v, weight))
+                    total_cost += weight
+                    queue.append(v)
+
+        result = {
+            'success': True,
+            'algorithm': 'Prim',
+            'dynamic': True,
+            'mst_edges': mst_edges,
+            'total_cost': total_cost,
+            'stats': dict(self.stats)
+        }
+        if len(visited) != len(self.graph.adj_list):
+            result['status'] = 'Grafo não conectado'
+            result['message'] = f'MST encontrada apenas para o componente conectado de "{self.start_vertex}".'
+        else:
+            result['status'] = 'Conectado'
+            result['message'] = 'Árvore Geradora Mínima encontrada com sucesso.'
+        return result
+
+    # --- Internos ---
+
+    def _prim_component(self, root, visited):
+        """Prim a partir de 'root' (mesma lógica do prim_mst), marcando os visitados."""
+        adj_list = self.graph.adj_list
+        visited.add(root)
+        min_heap = [(weight, root, v) for v, weight in adj_list[root].items()]
+        heapq.heapify(min_heap)
+        while min_heap:
+            weight, u, v = heapq.heappop(min_heap)
+            if v in visited:
+                continue
+            visited.add(v)
+            self._link(u, v, weight)
+            for neighbor, new_weight in adj_list[v].items():
+                if neighbor not in visited:
+                    heapq.heappush(min_heap, (new_weight, v, neighbor))
+
+    def _touch(self, u, v):
+        """Guarda o peso de (u, v) na árvore antes da primeira mudança no lote."""
+        key = frozenset((u, v))
+        if key not in self._touched:
+            self._touched[key] = (u, v, self.tree[u].get(v))
+
+    def _link(self, u, v, weight):
+        self._touch(u, v)
+        self.tree[u][v] = weight
+        self.tree[v][u] = weight
+
+    def _unlink(self, u, v):
+        self._touch(u, v)
+        del self.tree[u][v]
+        del self.tree[v][u]
+
+    def _tree_path(self, u, v):
+        """
+        Caminho de u até v na floresta (busca em largura).
+
+        :return: Lista [u, ..., v] ou None se estiverem em componentes diferentes.
+        """
+        parent = {u: None}
+        queue = deque([u])
+        while queue:
+            x = queue.popleft()
+            if x == v:
+                path = []
+                while x is not None:
+                    path.append(x)
+                    x = parent[x]
+                return path[::-1]
+            for y in self.tree[x]:
+                if y not in parent:
+                    parent[y] = x
+                    queue.append(y)
+        return None
+
+    def _component(self, root):
+        """Vértices da árvore que contém 'root'."""
+        seen = {root}
+        stack = [root]
+        while stack:
+            x = stack.pop()
+            for y in self.tree[x]:
+                if y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+        return seen
+
+    def _reconnect(self, u, v):
+        """
+        Após tirar (u, v) da árvore, religa as duas partes pela aresta mais
+        leve do grafo entre elas (se existir).
+        """
+        # Percorre só as arestas da parte menor
+        side_u, side_v = self._component(u), self._component(v)
+        side = side_u if len(side_u) <= len(side_v) else side_v
+        other = side_v if side is side_u else side_u
+
+        best = None
+        for x in side:
+            for y, weight in self.graph.adj_list[x].items():
+                if y in other and (best is None or weight < best[2]):
+                    best = (x, y, weight)
+        if best is not None:
+            self._link(*best)
+            if {best[0], best[1]} != {u, v}:
+                self.stats['swaps'] += 1
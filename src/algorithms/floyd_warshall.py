@@ -1,18 +1,48 @@
 import math
 import sys
+from array import array
 
-def floyd_warshall(graph):
+from ..instrumentation import count, phase
+from .all_pairs import NO_HOP, AllPairsResult
+from .blocked_floyd_warshall import blocked_floyd_warshall_arrays, matrix_bytes
+
+# NumPy é opcional: sem ele, usa-se a implementação em Python puro.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+def floyd_warshall(graph, use_numpy=None, progress=None, memory_budget=None, max_workers=1, spill_dir=None):
     """
     Executa o algoritmo de Floyd-Warshall para encontrar os caminhos mínimos
     entre todos os pares de vértices em um grafo ponderado (direcionado ou não).
 
-    Detecta ciclos de custo negativo e reconstrói os caminhos mínimos.
+    Detecta ciclos de custo negativo. Os caminhos mínimos não são montados
+    aqui: o resultado (AllPairsResult) guarda as matrizes de distância e de
+    próximo vértice e reconstrói cada caminho apenas quando ele é acessado.
+
+    Se o NumPy estiver instalado, usa a versão vetorizada (matrizes densas
+    indexadas por inteiros); caso contrário, usa a versão em Python puro.
+    Se as matrizes V x V passarem de 'memory_budget', usa a versão em
+    blocos com as matrizes em disco (ver blocked_floyd_warshall.py).
 
     Assume que a API do objeto 'graph' é:
     - graph.get_vertices(): Retorna uma lista/set de todos os vértices.
-    - graph.get_neighbors(v): Retorna um dict {vizinho: peso, ...}
+    - graph.freeze(): Retorna a forma compacta (CSR) do grafo, na mesma
+      ordem de vértices.
 
-    :param graph: Objeto grafo (esperado de graph.py).
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param use_numpy: True/False força o motor; None escolhe automaticamente.
+    :param progress: Função opcional chamada com a fração concluída (0 a 1);
+                     se ela lançar uma exceção, a execução é interrompida.
+    :param memory_budget: Limite de memória (bytes) para as matrizes; None = sem limite.
+    :param max_workers: Nº de processos da versão em blocos (1 = em série,
+                        None = todos os núcleos).
+    :param spill_dir: Diretório dos arquivos da versão em blocos (None = o
+                      diretório temporário do sistema).
     :return: Um dicionário contendo as distâncias mínimas, caminhos e status.
     """
 
@@ -28,85 +58,271 @@ def floyd_warshall(graph):
 
     # Lista ordenada para indexação estável
     vertices = list(vertices)
+
+    if memory_budget is not None and matrix_bytes(len(vertices)) > memory_budget:
+        if not HAS_NUMPY:
+            return {
+                'success': False,
+                'algorithm': 'Floyd-Warshall',
+                'error': 'A matriz de distâncias não cabe no limite de memória e a versão em disco exige o NumPy.'
+            }
+        return _floyd_warshall_blocked(graph, vertices, memory_budget, max_workers, spill_dir, progress)
+
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy:
+        if not HAS_NUMPY:
+            raise ImportError('NumPy não está instalado.')
+        return _floyd_warshall_numpy(graph, vertices, progress)
+    return _floyd_warshall_python(graph, vertices, progress)
+
+
+def _floyd_warshall_python(graph, vertices, progress=None):
+    """
+    Versão em Python puro: matrizes como listas de linhas indexadas por
+    inteiros (os índices do grafo compacto), iniciadas direto dos arrays CSR.
+
+    :param graph: Objeto grafo (esperado de graph.py).
+    :param vertices: Lista de vértices (define a ordem dos resultados).
+    :param progress: Função opcional chamada com a fração concluída.
+    :return: O dicionário de resultado de floyd_warshall.
+    """
     n = len(vertices)
 
-    # Criação das matrizes de distância e predecessor
-    dist = {u: {v: math.inf for v in vertices} for u in vertices}
-    next_vertex = {u: {v: None for v in vertices} for u in vertices}
+    # Criação das matrizes de distância e de próximo vértice
+    with phase('init'):
+        compact = graph.freeze()
+        dist = [[math.inf] * n for _ in range(n)]
+        next_vertex = [[NO_HOP] * n for _ in range(n)]
 
-    # Inicializa as distâncias com os pesos das arestas
-    for u in vertices:
-        dist[u][u] = 0
-        for v, weight in graph.get_neighbors(u).items():
+        # Inicializa as distâncias com os pesos das arestas (a origem de cada
+        # aresta vem do metadado edge_sources, guardado junto do grafo)
+        for u in range(n):
+            dist[u][u] = 0
+        for u, v, weight in zip(compact.edge_sources(), compact.targets, compact.weights):
             dist[u][v] = weight
             next_vertex[u][v] = v
 
     # --- 2. Algoritmo Principal (Dinâmica de Programação) ---
     # Itera sobre todos os vértices intermediários
-    for k in vertices:
-        for i in vertices:
-            for j in vertices:
+    with phase('k_loop'):
+        for k in range(n):
+            row_k = dist[k]
+            negative_pivot = row_k[k] < 0
+            for i in range(n):
+                row_i = dist[i]
+                next_i = next_vertex[i]
                 # Evita operações desnecessárias
-                if dist[i][k] == math.inf or dist[k][j] == math.inf:
+                if row_i[k] == math.inf:
                     continue
 
-                new_dist = dist[i][k] + dist[k][j]
-                if new_dist < dist[i][j]:
-                    dist[i][j] = new_dist
-                    next_vertex[i][j] = next_vertex[i][k]
+                if negative_pivot:
+                    # Com dist[k][k] < 0, dist[i][k] e a linha k mudam durante a
+                    # iteração: relê os valores a cada j
+                    for j in range(n):
+                        if row_i[k] == math.inf or row_k[j] == math.inf:
+                            continue
+                        new_dist = row_i[k] + row_k[j]
+                        if new_dist < row_i[j]:
+                            row_i[j] = new_dist
+                            next_i[j] = next_i[k]
+                    continue
+
+                d_ik = row_i[k]
+                hop = next_i[k]
+                for j in range(n):
+                    d_kj = row_k[j]
+                    if d_kj == math.inf:
+                        continue
+                    new_dist = d_ik + d_kj
+                    if new_dist < row_i[j]:
+                        row_i[j] = new_dist
+                        next_i[j] = hop
+            if progress:
+                progress((k + 1) / n)
+    count('k_iterations', n)
+    count('pair_checks', n ** 3)
 
     # --- 3. Detecção de Ciclos Negativos ---
     # Um ciclo negativo existe se dist[v][v] < 0 para algum vértice v
-    negative_cycles = []
-    for v in vertices:
-        if dist[v][v] < 0:
-            negative_cycles.append(v)
+    negative_cycles = [vertices[v] for v in range(n) if dist[v][v] < 0]
 
     if negative_cycles:
+        return _negative_cycle_result(negative_cycles)
+
+    # --- 4. Preparação e Retorno dos Resultados ---
+    # Converte as linhas para arrays compactos (os caminhos são
+    # reconstruídos sob demanda pelo AllPairsResult)
+    with phase('result'):
+        dist_rows = [array('d', row) for row in dist]
+        next_rows = [array('i', row) for row in next_vertex]
+
+    return _success_result(AllPairsResult(vertices, dist_rows, next_rows))
+
+
+def _floyd_warshall_numpy(graph, vertices, progress=None):
+    """
+    Versão vetorizada com NumPy.
+
+    Os rótulos dos vértices são mapeados para índices inteiros e as matrizes
+    'dist' e 'next_vertex' são arrays densos. Cada iteração de k é uma única
+    atualização por broadcast (np.minimum), sem laços Python em i e j.
+
+    :param graph: Objeto grafo (esperado de graph.py).
+    :param vertices: Lista de vértices (define a ordem dos resultados).
+    :param progress: Função opcional chamada com a fração concluída.
+    :return: O dicionário de resultado de floyd_warshall.
+    """
+    n = len(vertices)
+    with phase('init'):
+        compact = graph.freeze()
+
+        # Criação das matrizes (NO_HOP em next_vertex significa "sem caminho")
+        dist = np.full((n, n), np.inf)
+        next_vertex = np.full((n, n), NO_HOP, dtype=np.int32)
+
+        # Inicializa as distâncias com os pesos das arestas, direto dos arrays CSR
+        # (mesma ordem da versão em Python: diagonal primeiro, depois as arestas)
+        np.fill_diagonal(dist, 0.0)
+        sources = np.frombuffer(compact.edge_sources(), dtype=np.int32)
+        targets = np.frombuffer(compact.targets, dtype=np.int32)
+        dist[sources, targets] = np.frombuffer(compact.weights, dtype=np.float64)
+        next_vertex[sources, targets] = targets
+
+    # --- 2. Algoritmo Principal (uma atualização vetorizada por k) ---
+    with phase('k_loop'):
+        candidate = np.empty_like(dist)
+        improved = np.empty((n, n), dtype=bool)
+        # Com ciclos negativos as distâncias podem chegar a -inf (e inf + -inf = NaN)
+        with np.errstate(over='ignore', invalid='ignore'):
+            for k in range(n):
+                if dist[k, k] < 0:
+                    # Já existe ciclo negativo passando por k: reproduz exatamente a
+                    # ordem da versão em Python (que atualiza a matriz "in-place").
+                    _relax_negative_pivot(dist, next_vertex, k)
+                else:
+                    # candidate[i][j] = dist[i][k] + dist[k][j]
+                    np.add(dist[:, k, None], dist[None, k, :], out=candidate)
+                    np.less(candidate, dist, out=improved)
+                    # fmin = minimum que ignora NaN (inf + -inf), como o 'continue' em Python
+                    np.fmin(dist, candidate, out=dist)
+                    # next_vertex[i][j] = next_vertex[i][k] onde houve melhora
+                    np.copyto(next_vertex, next_vertex[:, k, None], where=improved)
+                if progress:
+                    progress((k + 1) / n)
+    count('k_iterations', n)
+    count('pair_checks', n ** 3)
+
+    # --- 3. Detecção de Ciclos Negativos ---
+    diagonal = np.diagonal(dist)
+    if (diagonal < 0).any():
+        negative_cycles = [vertices[i] for i in np.flatnonzero(diagonal < 0)]
+        return _negative_cycle_result(negative_cycles)
+
+    # --- 4. Preparação e Retorno dos Resultados ---
+    # As matrizes densas vão direto para o resultado (caminhos sob demanda)
+    return _success_result(AllPairsResult(vertices, dist, next_vertex))
+
+
+def _floyd_warshall_blocked(graph, vertices, memory_budget, max_workers, spill_dir, progress=None):
+    """
+    Versão em blocos, com as matrizes em disco (numpy.memmap).
+
+    O resultado (AllPairsResult) lê as distâncias e os caminhos direto dos
+    arquivos mapeados, como nas demais versões.
+
+    :param graph: Objeto grafo (esperado de graph.py).
+    :param vertices: Lista de vértices (define a ordem dos resultados).
+    :param memory_budget: Limite de memória (bytes) para os blocos em uso.
+    :param max_workers: Nº de processos (None = todos os núcleos).
+    :param spill_dir: Diretório dos arquivos das matrizes.
+    :param progress: Função opcional chamada com a fração concluída.
+    :return: O dicionário de resultado de floyd_warshall.
+    """
+    try:
+        dist, next_vertex = blocked_floyd_warshall_arrays(
+            graph.freeze(), memory_budget, max_workers=max_workers, spill_dir=spill_dir, progress=progress
+        )
+    except OSError as e:
+        # Ex: sem espaço em disco para as matrizes
         return {
             'success': False,
             'algorithm': 'Floyd-Warshall',
-            'negative_cycle': True,
-            'error': f'Ciclo(s) de custo negativo detectado(s) envolvendo: {negative_cycles}'
+            'error': f'Erro ao gravar as matrizes em disco: {e}'
         }
 
-    # --- 4. Reconstrução dos Caminhos ---
-    def reconstruct_path(u, v):
-        """Reconstrói o caminho mínimo de u até v usando a matriz next_vertex."""
-        if next_vertex[u][v] is None:
-            return None
-        path = [u]
-        while u != v:
-            u = next_vertex[u][v]
-            if u is None:
-                return None
-            path.append(u)
-        return path
-
-    paths = {}
-    for i in vertices:
-        paths[i] = {}
-        for j in vertices:
-            if dist[i][j] != math.inf:
-                paths[i][j] = reconstruct_path(i, j)
-            else:
-                paths[i][j] = None
-
-    # --- 5. Preparação e Retorno dos Resultados ---
-    display_dist = {
-        i: {j: (dist[i][j] if dist[i][j] != math.inf else 'Infinito') for j in vertices}
-        for i in vertices
+    # --- 3. Detecção de Ciclos Negativos ---
+    diagonal = np.diagonal(dist)
+    if (diagonal < 0).any():
+        negative_cycles = [vertices[i] for i in np.flatnonzero(diagonal < 0)]
+        return _negative_cycle_result(negative_cycles)
+
+    # --- 4. Preparação e Retorno dos Resultados ---
+    # As matrizes em disco vão direto para o resultado (caminhos sob demanda).
+    # Visões ndarray: cada acesso a um memmap cria outro memmap, bem mais lento.
+    return _success_result(AllPairsResult(vertices, dist.view(np.ndarray), next_vertex.view(np.ndarray)))
+
+
+def _relax_negative_pivot(dist, next_vertex, k):
+    """
+    Executa a iteração k quando dist[k][k] < 0, na mesma ordem da versão em
+    Python (linhas i < k, depois a linha k, depois as linhas i > k).
+
+    Com dist[k][k] >= 0 a linha e a coluna k não mudam durante a iteração e
+    a atualização vetorizada simples é equivalente; com dist[k][k] < 0 elas
+    mudam no meio da iteração, o que altera quais vértices terminam com
+    dist[v][v] < 0.
+    """
+    row_old = dist[k].copy()
+    dkk_old = row_old[k]
+    dkk_new = dkk_old + dkk_old
+
+    # Linha k: dist[k][j] = min(dist[k][j], dist[k][k] + dist[k][j]),
+    # onde dist[k][k] já foi atualizado para j > k
+    row_new = row_old.copy()
+    candidate = np.empty_like(row_old)
+    candidate[:k] = dkk_old + row_old[:k]
+    candidate[k] = dkk_new
+    candidate[k + 1:] = dkk_new + row_old[k + 1:]
+    improved = candidate < row_old
+    row_new[improved] = candidate[improved]
+
+    def relax_rows(rows, row_k, dkk):
+        block = dist[rows]
+        col_k = block[:, k].copy()
+        col_k_new = col_k + dkk
+        col_k_new = np.where(col_k_new < col_k, col_k_new, col_k)
+        candidate = np.empty_like(block)
+        candidate[:, :k] = col_k[:, None] + row_k[None, :k]
+        candidate[:, k] = col_k_new
+        candidate[:, k + 1:] = col_k_new[:, None] + row_k[None, k + 1:]
+        improved = candidate < block
+        np.copyto(block, candidate, where=improved)
+        np.copyto(next_vertex[rows], next_vertex[rows, k, None], where=improved)
+
+    relax_rows(slice(0, k), row_old, dkk_old)
+    dist[k] = row_new
+    next_vertex[k][improved] = next_vertex[k, k]
+    relax_rows(slice(k + 1, None), row_new, dkk_new)
+
+
+def _negative_cycle_result(negative_cycles):
+    """Monta o dicionário de falha por ciclo(s) de custo negativo."""
+    return {
+        'success': False,
+        'algorithm': 'Floyd-Warshall',
+        'negative_cycle': True,
+        'error': f'Ciclo(s) de custo negativo detectado(s) envolvendo: {negative_cycles}'
     }
 
+
+def _success_result(results):
+    """Monta o dicionário de sucesso com o AllPairsResult."""
     return {
         'success': True,
         'algorithm': 'Floyd-Warshall',
         'message': 'Caminhos mínimos entre todos os pares encontrados com sucesso.',
         'negative_cycle': False,
-        'results': {
-            'vertices': vertices,
-            'distances': display_dist,
-            'paths': paths
-        }
+        'results': results
     }
 
@@ -0,0 +1,196 @@
+"""
+Estruturas de fila de prioridade usadas pelos algoritmos.
+
+O heap binário padrão é o módulo 'heapq' da biblioteca padrão; aqui ficam
+as variações que ele não oferece.
+"""
+
+
+class RadixHeap:
+    """
+    Radix heap: fila de prioridade monotônica para chaves inteiras não negativas.
+
+    Só aceita inserções com chave >= à última chave removida (o que sempre
+    vale no Dijkstra com pesos inteiros não negativos). Cada elemento desce
+    de balde no máximo ~64 vezes, então push é O(1) e pop é O(log C)
+    amortizado, onde C é a maior chave.
+
+    As chaves podem ser floats com valor inteiro (ex: 5.0), menores que
+    MAX_KEY (os baldes cobrem chaves de 64 bits).
+    """
+
+    NUM_BUCKETS = 65
+    MAX_KEY = 2 ** (NUM_BUCKETS - 1)
+
+    def __init__(self):
+        self._buckets = [[] for _ in range(self.NUM_BUCKETS)]
+        self._last = 0  # Última chave removida
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, key, item):
+        """
+        Insere um item com a chave dada.
+
+        :param key: Chave inteira (ou float inteiro) >= última chave removida
+                    e < MAX_KEY.
+        :param item: O item associado à chave.
+        """
+        if key < self._last:
+            raise ValueError('RadixHeap: chave menor que a última chave removida.')
+        if key >= self.MAX_KEY:
+            raise ValueError('RadixHeap: chave maior que 64 bits.')
+        self._buckets[(int(key) ^ self._last).bit_length()].append((key, item))
+        self._size += 1
+
+    def pop(self):
+        """
+        Remove e retorna o par (chave, item) de menor chave.
+
+        :raises IndexError: Se o heap estiver vazio.
+        """
+        if not self._size:
+            raise IndexError('pop de um RadixHeap vazio')
+
+        buckets = self._buckets
+        if not buckets[0]:
+            # Redistribui o primeiro balde não vazio a partir da sua menor chave
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            self._last = int(min(key for key, _ in bucket))
+            for key, item in bucket:
+                buckets[(int(key) ^ self._last).bit_length()].append((key, item))
+
+        self._size -= 1
+        return buckets[0].pop()
+
+
+class IndexedMinHeap:
+    """
+    Heap binário mínimo indexado, com redução de chave (decrease-key).
+
+    Os itens são inteiros de 0 a capacity - 1 e cada um aparece no heap no
+    máximo uma vez: em vez de inserir uma nova entrada quando a chave de um
+    item diminui (como na remoção preguiçosa com heapq), a entrada existente
+    sobe no heap. Assim o heap nunca passa de 'capacity' entradas.
+
+    As chaves podem ser de qualquer tipo comparável (ex: tuplas).
+    """
+
+    def __init__(self, capacity):
+        """
+        :param capacity: Nº de itens possíveis (itens de 0 a capacity - 1).
+        """
+        self._heap = []                # Itens, na ordem do heap
+        self._keys = [None] * capacity
+        self._pos = [-1] * capacity    # Posição de cada item no heap (-1 = fora)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item):
+        return self._pos[item] >= 0
+
+    def key(self, item):
+        """Retorna a chave atual de um item que está no heap."""
+        return self._keys[item]
+
+    def push(self, key, item):
+        """
+        Insere um item que ainda não está no heap.
+
+        :raises ValueError: Se o item já estiver no heap.
+        """
+        if self._pos[item] >= 0:
+            raise ValueError(f'IndexedMinHeap: o item {item} já está no heap.')
+        self._keys[item] = key
+        self._heap.append(item)
+        self._pos[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def decrease_key(self, item, key):
+        """
+        Reduz a chave de um item que está no heap.
+
+        :raises ValueError: Se a nova chave for maior que a atual.
+        """
+        if key > self._keys[item]:
+            raise ValueError('IndexedMinHeap: a nova chave é maior que a atual.')
+        self._keys[item] = key
+        self._sift_up(self._pos[item])
+
+    def push_or_decrease(self, key, item):
+        """
+        Insere o item ou, se ele já estiver no heap, reduz sua chave quando
+        a nova for menor.
+
+        :return: True se o heap mudou.
+        """
+        if self._pos[item] < 0:
+            self.push(key, item)
+            return True
+        if key < self._keys[item]:
+            self._keys[item] = key
+            self._sift_up(self._pos[item])
+            return True
+        return False
+
+    def pop(self):
+        """
+        Remove e retorna o par (chave, item) de menor chave.
+
+        :raises IndexError: Se o heap estiver vazio.
+        """
+        heap = self._heap
+        if not heap:
+            raise IndexError('pop de um IndexedMinHeap vazio')
+
+        item = heap[0]
+        last = heap.pop()
+        self._pos[item] = -1
+        if heap:
+            heap[0] = last
+            self._pos[last] = 0
+            self._sift_down(0)
+        return self._keys[item], item
+
+    def _sift_up(self, i):
+        heap, keys, pos = self._heap, self._keys, self._pos
+        item = heap[i]
+        key = keys[item]
+        while i > 0:
+            parent = (i - 1) >> 1
+            parent_item = heap[parent]
+            if not key < keys[parent_item]:
+                break
+            heap[i] = parent_item
+            pos[parent_item] = i
+            i = parent
+        heap[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i):
+        heap, keys, pos = self._heap, self._keys, self._pos
+        size = len(heap)
+        item = heap[i]
+        key = keys[item]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and keys[heap[right]] < keys[heap[child]]:
+                child = right
+            child_item = heap[child]
+            if not keys[child_item] < key:
+                break
+            heap[i] = child_item
+            pos[child_item] = i
+            i = child
+        heap[i] = item
+        pos[item] = i
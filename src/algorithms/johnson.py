@@ -0,0 +1,159 @@
+import math
+from array import array
+
+from ..compact_graph import CompactGraph
+from ..instrumentation import count, phase
+from .bellman_ford import bellman_ford_arrays
+from .all_pairs import NO_HOP, PREDECESSOR, AllPairsResult
+from .multi_source import run_sources
+
+
+def johnson(graph, max_workers=1, progress=None):
+    """
+    Executa o algoritmo de Johnson para encontrar os caminhos mínimos
+    entre todos os pares de vértices em um grafo ponderado.
+
+    Alternativa ao Floyd-Warshall para grafos esparsos: O(V * E log V) em vez
+    de O(V³). Os pesos negativos são eliminados com uma função potencial h
+    (calculada pelo Bellman-Ford a partir de um vértice auxiliar ligado a
+    todos com peso 0) e, em seguida, o Dijkstra é executado a partir de
+    cada vértice com os pesos w'(u, v) = w(u, v) + h(u) - h(v) >= 0.
+
+    Detecta ciclos de custo negativo (na etapa do Bellman-Ford).
+
+    As execuções do Dijkstra podem ser distribuídas entre vários processos
+    (ver multi_source.run_sources).
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param max_workers: Nº de processos (1 = em série, None = todos os núcleos).
+    :param progress: Função opcional chamada com a fração concluída (0 a 1);
+                     se ela lançar uma exceção, a execução é interrompida.
+    :return: Um dicionário no mesmo formato do floyd_warshall.
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    vertices = list(compact.labels)
+    if not vertices:
+        return {
+            'success': False,
+            'algorithm': 'Johnson',
+            'error': 'O grafo está vazio.'
+        }
+
+    # --- 2. Função potencial (Bellman-Ford) ---
+    with phase('potentials'):
+        potentials = johnson_potentials(compact)
+    if potentials is None:
+        return {
+            'success': False,
+            'algorithm': 'Johnson',
+            'negative_cycle': True,
+            'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
+        }
+
+    with phase('reweight'):
+        reweighted = reweight(compact, potentials)
+    shifted = any(potentials)
+
+    # --- 3. Dijkstra a partir de cada vértice ---
+    # Guarda só as linhas de distâncias e predecessores (caminhos sob demanda)
+    dist_rows = []
+    pred_rows = []
+    with phase('dijkstra_all'):
+        for source, distances, predecessors, _ in run_sources(
+                reweighted, range(len(vertices)), 'dijkstra', max_workers):
+            if shifted:
+                distances = restore_distances(distances, potentials, source)
+            dist_rows.append(array('d', distances))
+            pred_rows.append(array('i', (NO_HOP if p is None else p for p in predecessors)))
+            if progress:
+                progress(len(dist_rows) / len(vertices))
+    count('dijkstra_runs', len(vertices))
+
+    # --- 4. Preparação e Retorno dos Resultados ---
+    return {
+        'success': True,
+        'algorithm': 'Johnson',
+        'message': 'Caminhos mínimos entre todos os pares encontrados com sucesso.',
+        'negative_cycle': False,
+        'results': AllPairsResult(vertices, dist_rows, pred_rows, hops=PREDECESSOR)
+    }
+
+
+def johnson_potentials(compact):
+    """
+    Calcula a função potencial h do algoritmo de Johnson.
+
+    Cria um vértice auxiliar q com arestas de peso 0 para todos os vértices e
+    executa o Bellman-Ford a partir de q: h(v) = dist(q, v). Se o grafo não
+    tiver pesos negativos, h = 0 e o Bellman-Ford é dispensado.
+
+    :param compact: Objeto CompactGraph.
+    :return: Lista com h(v) por índice, ou None se houver ciclo negativo.
+    """
+    n = compact.num_vertices()
+    if not compact.has_negative_weights:
+        return [0.0] * n
+
+    # Grafo aumentado: o vértice auxiliar q recebe o índice n
+    offsets = array('q', compact.offsets)
+    offsets.append(offsets[-1] + n)
+    targets = array('i', compact.targets)
+    targets.extend(range(n))
+    weights = array('d', compact.weights)
+    weights.extend([0.0] * n)
+    augmented = CompactGraph(
+        list(compact.labels) + [object()], offsets, targets, weights,
+        directed=True
+    )
+
+    # O vértice q só tem arestas de saída: o grafo aumentado é acíclico se o
+    # original for, e então basta uma passada em ordem topológica
+    mode = 'dag' if compact.directed and compact.is_acyclic() else 'spfa'
+    distances, _, negative_cycle, _ = bellman_ford_arrays(augmented, n, mode=mode)
+    if negative_cycle:
+        return None
+    return distances[:n]
+
+
+def reweight(compact, potentials):
+    """
+    Retorna uma cópia do grafo com os pesos w'(u, v) = w(u, v) + h(u) - h(v).
+
+    Pela desigualdade triangular de h, os novos pesos são não negativos
+    (valores como -1e-16, por erro de arredondamento, viram 0).
+
+    :param compact: Objeto CompactGraph.
+    :param potentials: Lista com h(v) por índice.
+    :return: Um novo CompactGraph (ou o próprio, se h = 0).
+    """
+    if not any(potentials):
+        return compact
+
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+    new_weights = array('d', weights)
+    for u in range(compact.num_vertices()):
+        hu = potentials[u]
+        for k in range(offsets[u], offsets[u + 1]):
+            new_weights[k] = max(0.0, weights[k] + hu - potentials[targets[k]])
+
+    return CompactGraph(compact.labels, offsets, targets, new_weights, directed=compact.directed)
+
+
+def restore_distances(distances, potentials, source):
+    """
+    Desfaz a reponderação: d(s, v) = d'(s, v) - h(s) + h(v).
+
+    :param distances: Distâncias calculadas com os pesos w'.
+    :param potentials: Lista com h(v) por índice.
+    :param source: Índice do vértice de origem.
+    :return: Lista com as distâncias reais (math.inf se inalcançável).
+    """
+    h_source = potentials[source]
+    return [
+        d if d == math.inf else d - h_source + potentials[v]
+        for v, d in enumerate(distances)
+    ]
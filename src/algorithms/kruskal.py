@@ -0,0 +1,67 @@
+from ..instrumentation import count, phase
+from .spanning import build_forest_result
+from .union_find import UnionFind
+
+
+def kruskal_mst(graph):
+    """
+    Executa o algoritmo de Kruskal para encontrar a floresta geradora mínima
+    de um grafo não direcionado e ponderado (uma árvore por componente).
+
+    As arestas são ordenadas por peso e cada uma entra na floresta se ligar
+    dois componentes diferentes, o que é verificado com um union-find
+    (compressão de caminho e união por posto). Complexidade O(E log E),
+    dominada pela ordenação, feita em C pelo sorted().
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :return: Um dicionário no mesmo formato do prim_mst, com o nº de
+             componentes em 'components'.
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    labels = compact.labels
+    num_vertices = compact.num_vertices()
+    if not num_vertices:
+        return {
+            'success': False,
+            'algorithm': 'Kruskal',
+            'error': 'O grafo está vazio.'
+        }
+
+    # Cada aresta não direcionada aparece duas vezes no CSR (u -> v e v -> u):
+    # só a ocorrência com u < v é considerada. Laços nunca entram na árvore.
+    with phase('sort'):
+        sources = compact.edge_sources()
+        targets, weights = compact.targets, compact.weights
+        if compact.directed:
+            edges = [k for k in range(len(targets)) if sources[k] != targets[k]]
+        else:
+            edges = [k for k in range(len(targets)) if sources[k] < targets[k]]
+        edges.sort(key=weights.__getitem__)
+
+    # --- 2. Lógica Principal do Algoritmo ---
+
+    # Nº de componentes do grafo (metadado guardado junto do grafo compacto)
+    num_components = compact.num_components()
+    components = UnionFind(num_vertices)
+    mst_edges = []
+    total_cost = 0
+    with phase('union'):
+        for k in edges:
+            u, v = sources[k], targets[k]
+            if components.union(u, v):
+                weight = weights[k]
+                mst_edges.append((labels[u], labels[v], weight))
+                total_cost += weight
+                # A floresta já liga cada componente do grafo: para cedo
+                if components.count == num_components:
+                    break
+    count('edges_sorted', len(edges))
+    count('mst_edges', len(mst_edges))
+
+    # --- 3. Retorno ---
+
+    return build_forest_result('Kruskal', mst_edges, total_cost, components.count)
@@ -0,0 +1,163 @@
+"""
+Execução de caminhos mínimos a partir de várias origens, em paralelo.
+
+As execuções de origem única (Dijkstra ou Bellman-Ford) são distribuídas em
+um ProcessPoolExecutor. O grafo compacto é enviado uma única vez para cada
+processo, pelo 'initializer' do pool; cada tarefa recebe apenas os índices
+das origens e devolve as listas de distâncias e predecessores.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .all_pairs import NO_HOP, PREDECESSOR, AllPairsResult
+from .bellman_ford import bellman_ford_arrays
+from .dijkstra import dijkstra_arrays
+from .selector import choose_single_source
+
+# Nomes exibidos para cada algoritmo de origem única
+ALGORITHM_NAMES = {
+    'dijkstra': 'Dijkstra',
+    'bellman_ford': 'Bellman-Ford',
+}
+
+# Grafo compacto do processo trabalhador (definido por _init_worker)
+_worker_graph = None
+
+
+def _init_worker(compact):
+    """Recebe o grafo uma única vez, quando o processo do pool é criado."""
+    global _worker_graph
+    _worker_graph = compact
+
+
+def _run_source(compact, algorithm, source):
+    """
+    Executa o algoritmo de origem única a partir de um índice.
+
+    :return: Tupla (source, distances, predecessors, negative_cycle).
+    """
+    if algorithm == 'dijkstra':
+        distances, predecessors = dijkstra_arrays(compact, source)
+        return source, distances, predecessors, False
+    # Em grafos acíclicos, a ordem topológica (guardada junto do grafo) dispensa as passadas
+    mode = 'dag' if compact.directed and compact.is_acyclic() else 'spfa'
+    distances, predecessors, negative_cycle, _ = bellman_ford_arrays(compact, source, mode=mode)
+    return source, distances, predecessors, negative_cycle
+
+
+def _run_in_worker(task):
+    """Tarefa executada no processo do pool: (algorithm, source)."""
+    algorithm, source = task
+    return _run_source(_worker_graph, algorithm, source)
+
+
+def run_sources(compact, sources, algorithm='dijkstra', max_workers=1):
+    """
+    Executa o algoritmo a partir de cada origem, em série ou em paralelo.
+
+    :param compact: Objeto CompactGraph.
+    :param sources: Sequência de índices das origens.
+    :param algorithm: 'dijkstra' (pesos não negativos) ou 'bellman_ford'.
+    :param max_workers: Nº de processos; 1 executa em série no processo
+                        atual e None usa todos os núcleos (os.cpu_count()).
+    :return: Iterador de tuplas (source, distances, predecessors,
+             negative_cycle), na mesma ordem de 'sources'.
+    """
+    sources = list(sources)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(sources))
+
+    if max_workers <= 1:
+        for source in sources:
+            yield _run_source(compact, algorithm, source)
+        return
+
+    # Agrupa várias origens por tarefa para diluir o custo de comunicação
+    chunksize = max(1, len(sources) // (max_workers * 4))
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(compact,)
+    )
+    try:
+        tasks = ((algorithm, source) for source in sources)
+        yield from executor.map(_run_in_worker, tasks, chunksize=chunksize)
+    finally:
+        # Se quem consome parar antes (ex: ciclo negativo), descarta o restante
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def multi_source(graph, start_vertices, algorithm='auto', max_workers=None, progress=None):
+    """
+    Calcula os caminhos mínimos a partir de cada vértice de 'start_vertices'.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param start_vertices: Lista de vértices de origem.
+    :param algorithm: 'dijkstra', 'bellman_ford' ou 'auto' (pelos pesos).
+    :param max_workers: Nº de processos (None = todos os núcleos).
+    :param progress: Função opcional chamada com a fração concluída (0 a 1);
+                     se ela lançar uma exceção, a execução é interrompida.
+    :return: Um dicionário no formato do floyd_warshall, com as linhas
+             restritas às origens ('results.sources').
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    compact = graph.freeze()
+    if algorithm == 'auto':
+        algorithm = choose_single_source(compact)
+    name = ALGORITHM_NAMES[algorithm]
+
+    vertices = list(compact.labels)
+    if not vertices:
+        return {
+            'success': False,
+            'algorithm': name,
+            'error': 'O grafo está vazio.'
+        }
+
+    missing = [v for v in start_vertices if not compact.has_vertex(v)]
+    if missing:
+        return {
+            'success': False,
+            'algorithm': name,
+            'error': f'Vértice(s) inicial(is) não encontrado(s) no grafo: {missing}'
+        }
+
+    if algorithm == 'dijkstra' and compact.has_negative_weights:
+        return {
+            'success': False,
+            'algorithm': name,
+            'error': 'O grafo possui arestas de peso negativo. Use o Bellman-Ford.'
+        }
+
+    # --- 2. Execução (em paralelo) e junção dos resultados ---
+
+    sources = [compact.index[v] for v in start_vertices]
+    dist_rows = []
+    pred_rows = []
+    for source, distances, predecessors, negative_cycle in run_sources(
+            compact, sources, algorithm, max_workers):
+        if negative_cycle:
+            return {
+                'success': False,
+                'algorithm': name,
+                'negative_cycle': True,
+                'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
+            }
+        dist_rows.append(array('d', distances))
+        pred_rows.append(array('i', (NO_HOP if p is None else p for p in predecessors)))
+        if progress:
+            progress(len(dist_rows) / len(sources))
+
+    return {
+        'success': True,
+        'algorithm': name,
+        'negative_cycle': False,
+        'message': 'Caminhos mínimos a partir das origens encontrados com sucesso.',
+        'results': AllPairsResult(
+            vertices, dist_rows, pred_rows, hops=PREDECESSOR, sources=start_vertices
+        )
+    }
@@ -0,0 +1,88 @@
+"""
+Funções auxiliares para montar a saída dos algoritmos de caminho mínimo
+a partir de uma única origem (distâncias e caminhos por vértice).
+"""
+import math
+import sys
+from collections.abc import Mapping
+
+
+def build_single_source_results(vertices, distances, predecessors, source):
+    """
+    Converte os arrays indexados por inteiros no formato usado pelo template:
+    distâncias ('Infinito' se inalcançável) e caminhos [origem, ..., destino].
+
+    Os caminhos não são montados aqui: a visão devolvida reconstrói cada um
+    no acesso, e a API colunar lê os predecessores inteiros direto dela.
+
+    :param vertices: Lista de rótulos (índice -> rótulo).
+    :param distances: Lista de distâncias (math.inf se inalcançável).
+    :param predecessors: Lista com o índice do predecessor (ou None).
+    :param source: Índice do vértice de origem.
+    :return: Tupla (display_distances, paths): dict por rótulo e SingleSourcePaths.
+    """
+    display_distances = {
+        vertices[i]: (d if d != math.inf else 'Infinito') for i, d in enumerate(distances)
+    }
+    return display_distances, SingleSourcePaths(vertices, distances, predecessors, source)
+
+
+class SingleSourcePaths(Mapping):
+    """
+    paths[v]: caminho [origem, ..., v] reconstruído no acesso a partir dos
+    predecessores (None se v é inalcançável).
+    """
+
+    def __init__(self, vertices, distances, predecessors, source):
+        self.vertices = vertices
+        self.distances = distances
+        self.predecessors = predecessors
+        self.source = source
+        self._index = None
+
+    def __getitem__(self, vertex):
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.vertices)}
+        return self.path(self._index[vertex])
+
+    def __iter__(self):
+        return iter(self.vertices)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def path(self, i):
+        """
+        Caminho da origem até o vértice de índice i.
+
+        :param i: Índice do vértice de destino.
+        :return: Lista de rótulos [origem, ..., destino] ou None.
+        """
+        if self.distances[i] == math.inf:
+            return None
+
+        path = []
+        curr = i
+        while curr is not None:
+            path.append(self.vertices[curr])
+            if curr == self.source:
+                return path[::-1] # Inverte para [start, ..., end]
+            curr = self.predecessors[curr]
+        return None # Inacessível
+
+    def predecessor_indices(self, no_hop=-1):
+        """
+        Predecessor de cada vértice no caminho a partir da origem.
+
+        :param no_hop: Valor usado para a origem e os vértices inalcançáveis.
+        :return: Lista de índices, na ordem de self.vertices.
+        """
+        distances, predecessors, source = self.distances, self.predecessors, self.source
+        return [
+            no_hop if i == source or distances[i] == math.inf or predecessors[i] is None else predecessors[i]
+            for i in range(len(self.vertices))
+        ]
+
+    def nbytes(self):
+        """Estimativa de memória: as listas de distâncias e predecessores."""
+        return sys.getsizeof(self.distances) + sys.getsizeof(self.predecessors) + 24 * len(self.distances)
@@ -0,0 +1,503 @@
+"""
+Consultas de caminho mínimo ponto a ponto (origem, destino) em lote.
+
+Em vez de um Dijkstra completo por consulta, os pares são agrupados por
+origem e cada origem tem uma busca "retomável" (ShortestPathSearch): o
+Dijkstra para assim que todos os destinos pedidos estão definitivos
+(settled) e guarda a fila de prioridade. Uma consulta seguinte à mesma
+origem continua de onde a anterior parou, então a busca guardada (ex: em
+um LRUCache do servidor) fica mais útil a cada lote.
+
+Com pesos negativos o Dijkstra não vale: a busca roda o Bellman-Ford
+completo uma única vez (não há como parar cedo) e depois só responde.
+
+Para um único par há também buscas que exploram menos vértices
+(shortest_path), todas com pesos não negativos:
+- 'dijkstra': Dijkstra a partir da origem, parando no destino;
+- 'bidirectional': Dijkstra simultâneo da origem e do destino (este sobre
+  o grafo reverso, CompactGraph.reverse()), parando quando as buscas se
+  encontram;
+- 'astar': A* com uma heurística fornecida (limite inferior da distância
+  até o destino);
+- 'alt': A* com a heurística dos marcos (landmarks) e da desigualdade
+  triangular, pré-calculados uma vez por grafo (Landmarks).
+"""
+import heapq
+import math
+import threading
+from array import array
+
+from ..instrumentation import count, phase
+from .bellman_ford import bellman_ford_arrays
+from .dijkstra import dijkstra_arrays
+
+NO_PREDECESSOR = -1
+
+# Métodos aceitos por shortest_path
+POINT_TO_POINT_METHODS = ('dijkstra', 'bidirectional', 'astar', 'alt')
+
+# Nº padrão de marcos do ALT
+DEFAULT_LANDMARKS = 8
+
+
+class ShortestPathSearch:
+    """
+    Busca de caminhos mínimos a partir de uma origem, expandida sob demanda.
+
+    Thread-safe: duas requisições podem retomar a mesma busca.
+    """
+
+    def __init__(self, compact, source, bellman_ford_mode='spfa'):
+        """
+        :param compact: Objeto CompactGraph.
+        :param source: Índice do vértice de origem.
+        :param bellman_ford_mode: Modo do Bellman-Ford (pesos negativos).
+        """
+        num_vertices = compact.num_vertices()
+        self.compact = compact
+        self.source = source
+        self.distances = array('d', [math.inf]) * num_vertices
+        self.predecessors = array('i', [NO_PREDECESSOR]) * num_vertices
+        self.settled = bytearray(num_vertices)
+        self.negative_cycle = False
+        self._lock = threading.Lock()
+
+        if compact.has_negative_weights:
+            self.algorithm = 'Bellman-Ford'
+            distances, predecessors, self.negative_cycle, _ = bellman_ford_arrays(
+                compact, source, bellman_ford_mode
+            )
+            self.distances = array('d', distances)
+            self.predecessors = array('i', (NO_PREDECESSOR if p is None else p for p in predecessors))
+            self.settled = bytearray(b'\x01') * num_vertices
+            self._heap = []
+        else:
+            self.algorithm = 'Dijkstra'
+            self.distances[source] = 0
+            self._heap = [(0.0, source)]
+
+    @property
+    def complete(self):
+        """True se todos os vértices alcançáveis já estão definitivos."""
+        return not self._heap
+
+    def settle(self, targets):
+        """
+        Continua o Dijkstra até que todos os 'targets' estejam definitivos
+        (ou até a fila esvaziar: os restantes são inalcançáveis).
+
+        :param targets: Índices dos vértices de destino.
+        :return: Nº de vértices definidos nesta chamada.
+        """
+        with self._lock:
+            settled = self.settled
+            wanted = {t for t in targets if not settled[t]}
+            if not wanted or not self._heap:
+                return 0
+
+            distances, predecessors, heap = self.distances, self.predecessors, self._heap
+            offsets, targets_, weights = self.compact.offsets, self.compact.targets, self.compact.weights
+            newly_settled = 0
+            while heap:
+                du, u = heapq.heappop(heap)
+                if settled[u]:
+                    continue
+                settled[u] = 1
+                newly_settled += 1
+
+                start, end = offsets[u], offsets[u + 1]
+                for v, weight in zip(targets_[start:end], weights[start:end]):
+                    new_dist = du + weight
+                    if new_dist < distances[v]:
+                        distances[v] = new_dist
+                        predecessors[v] = u
+                        heapq.heappush(heap, (new_dist, v))
+
+                # Para assim que o último destino pedido fica definitivo
+                if u in wanted:
+                    wanted.discard(u)
+                    if not wanted:
+                        break
+
+            # A busca fica guardada (cache): descarta as entradas obsoletas da
+            # remoção preguiçosa, que podem chegar a O(E). Com o limite de 2V,
+            # o custo da compactação é amortizado pelas inserções.
+            if len(heap) > 2 * len(settled):
+                heap[:] = [(d, v) for d, v in heap if not settled[v] and d == distances[v]]
+                heapq.heapify(heap)
+            return newly_settled
+
+    def distance(self, target):
+        """Distância até 'target' (já definitivo); math.inf se inalcançável."""
+        return self.distances[target]
+
+    def path(self, target):
+        """
+        Caminho da origem até 'target' (já definitivo).
+
+        :return: Lista de índices [origem, ..., target] ou None se inalcançável.
+        """
+        if self.distances[target] == math.inf:
+            return None
+        path = [target]
+        while target != self.source:
+            target = self.predecessors[target]
+            path.append(target)
+        return path[::-1]
+
+    def nbytes(self):
+        """Estima quantos bytes a busca ocupa em memória (usado pelo cache)."""
+        n = len(self.settled)
+        return n * (8 + 4 + 1) + len(self._heap) * 72
+
+
+def batch_shortest_paths(graph, pairs, get_search=None, with_paths=False):
+    """
+    Responde a uma lista de pares (origem, destino), com uma única busca
+    (parando cedo) por origem distinta.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param pairs: Lista de tuplas (origem, destino) com os rótulos.
+    :param get_search: Função f(compact, índice da origem) que retorna a
+                       ShortestPathSearch da origem (ex: de um cache);
+                       None cria uma busca nova por origem.
+    :param with_paths: Se True, inclui o caminho de cada par.
+    :return: Um dicionário com 'distances' (math.inf se inalcançável) e,
+             se pedido, 'paths', na mesma ordem de 'pairs'.
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    name = 'Bellman-Ford' if compact.has_negative_weights else 'Dijkstra'
+
+    missing = sorted({v for pair in pairs for v in pair if not compact.has_vertex(v)})
+    if missing:
+        return {
+            'success': False,
+            'algorithm': name,
+            'missing_vertices': missing,
+            'error': f'Vértice(s) não encontrado(s) no grafo: {missing[:10]}'
+        }
+
+    if get_search is None:
+        get_search = ShortestPathSearch
+
+    # Agrupa os pares por origem: posições dos pares de cada origem
+    index = compact.index
+    by_source = {}
+    for k, (u, v) in enumerate(pairs):
+        by_source.setdefault(index[u], []).append(k)
+
+    # --- 2. Uma busca por origem ---
+
+    labels = compact.labels
+    distances = [math.inf] * len(pairs)
+    paths = [None] * len(pairs) if with_paths else None
+    newly_settled = 0
+    with phase('search'):
+        for source, positions in by_source.items():
+            search = get_search(compact, source)
+            if search.negative_cycle:
+                return {
+                    'success': False,
+                    'algorithm': name,
+                    'negative_cycle': True,
+                    'error': 'Ciclo de custo negativo detectado. Os caminhos mínimos não podem ser calculados.'
+                }
+            targets = [index[pairs[k][1]] for k in positions]
+            newly_settled += search.settle(targets)
+            for k, target in zip(positions, targets):
+                distances[k] = search.distance(target)
+                if with_paths:
+                    path = search.path(target)
+                    paths[k] = None if path is None else [labels[i] for i in path]
+    count('sources', len(by_source))
+    count('vertices_settled', newly_settled)
+
+    # --- 3. Retorno ---
+
+    result = {
+        'success': True,
+        'algorithm': name,
+        'message': 'Caminhos mínimos encontrados com sucesso.',
+        'num_pairs': len(pairs),
+        'num_sources': len(by_source),
+        'distances': distances
+    }
+    if with_paths:
+        result['paths'] = paths
+    return result
+
+
+class Landmarks:
+    """
+    Distâncias pré-calculadas de/para alguns vértices "marcos" (ALT: A*,
+    Landmarks e desigualdade Triangular).
+
+    Para um marco L e qualquer v, t: d(v, t) >= d(L, t) - d(L, v) e
+    d(v, t) >= d(v, L) - d(t, L). O maior desses limites é uma heurística
+    admissível e consistente para o A*.
+    """
+
+    def __init__(self, compact, num_landmarks=DEFAULT_LANDMARKS):
+        """
+        Escolhe os marcos pelo critério do "mais distante": cada novo marco
+        é o vértice mais distante dos já escolhidos (bons marcos ficam na
+        periferia do grafo).
+
+        :param compact: Objeto CompactGraph (pesos não negativos).
+        :param num_landmarks: Nº de marcos.
+        """
+        num_vertices = compact.num_vertices()
+        reverse = compact.reverse()
+        self.landmarks = []
+        self.from_landmark = []  # d(L, v) para cada marco
+        self.to_landmark = []    # d(v, L) para cada marco
+
+        # Distância de cada vértice ao marco mais próximo (para a escolha)
+        nearest = [math.inf] * num_vertices
+        candidate = 0
+        for _ in range(min(num_landmarks, num_vertices)):
+            if self.landmarks:
+                # Mais distante dos marcos já escolhidos, entre os alcançáveis
+                finite = [(d, v) for v, d in enumerate(nearest) if d != math.inf and d > 0]
+                if not finite:
+                    break
+                candidate = max(finite)[1]
+            else:
+                # O primeiro marco é o vértice mais distante do vértice 0
+                distances, _ = dijkstra_arrays(compact, 0)
+                candidate = max(((d, v) for v, d in enumerate(distances) if d != math.inf))[1]
+
+            from_l, _ = dijkstra_arrays(compact, candidate)
+            to_l = from_l if reverse is compact else dijkstra_arrays(reverse, candidate)[0]
+            self.landmarks.append(candidate)
+            self.from_landmark.append(array('d', from_l))
+            self.to_landmark.append(array('d', to_l) if to_l is not from_l else self.from_landmark[-1])
+            for v in range(num_vertices):
+                d = min(from_l[v], to_l[v])
+                if d < nearest[v]:
+                    nearest[v] = d
+
+    def heuristic(self, target):
+        """
+        Retorna a heurística h(v) (limite inferior de d(v, target)).
+
+        :param target: Índice do vértice de destino.
+        :return: Função h(v) -> float.
+        """
+        # Termos que dependem só do destino, calculados uma vez por consulta
+        terms = [
+            (from_l, from_l[target], to_l, to_l[target])
+            for from_l, to_l in zip(self.from_landmark, self.to_landmark)
+        ]
+
+        def h(v):
+            best = 0.0
+            for from_l, from_t, to_l, to_t in terms:
+                from_v = from_l[v]
+                if from_t != math.inf and from_v != math.inf and from_t - from_v > best:
+                    best = from_t - from_v
+                to_v = to_l[v]
+                if to_v != math.inf and to_t != math.inf and to_v - to_t > best:
+                    best = to_v - to_t
+            return best
+        return h
+
+    def nbytes(self):
+        """Estima quantos bytes os marcos ocupam em memória (usado pelo cache)."""
+        arrays = {id(a): a for a in self.from_landmark + self.to_landmark}
+        return sum(8 * len(a) for a in arrays.values())
+
+
+def _build_path(predecessors, source, target):
+    """Volta pelos predecessores de target até a origem (lista de índices)."""
+    path = [target]
+    while target != source:
+        target = predecessors[target]
+        path.append(target)
+    return path[::-1]
+
+
+def astar_search(compact, source, target, heuristic=None):
+    """
+    A* de source até target. Sem heurística, é o Dijkstra com parada no
+    destino.
+
+    Com uma heurística admissível (nunca maior que a distância real) o
+    resultado é ótimo; um vértice pode ser expandido de novo se a
+    heurística não for consistente.
+
+    :param compact: Objeto CompactGraph (pesos não negativos).
+    :param source: Índice da origem.
+    :param target: Índice do destino.
+    :param heuristic: Função h(índice) -> float, ou None (h = 0).
+    :return: Tupla (distância, caminho em índices ou None, nº de vértices expandidos).
+    """
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+    distances = {source: 0.0}
+    predecessors = {}
+    h = heuristic or (lambda v: 0.0)
+    heap = [(h(source), 0.0, source)]
+    expanded = 0
+
+    while heap:
+        _, du, u = heapq.heappop(heap)
+        if du > distances[u]:
+            continue  # Entrada desatualizada
+        expanded += 1
+        if u == target:
+            return du, _build_path(predecessors, source, target), expanded
+
+        start, end = offsets[u], offsets[u + 1]
+        for v, weight in zip(targets[start:end], weights[start:end]):
+            new_dist = du + weight
+            if new_dist < distances.get(v, math.inf):
+                distances[v] = new_dist
+                predecessors[v] = u
+                heapq.heappush(heap, (new_dist + h(v), new_dist, v))
+
+    return math.inf, None, expanded
+
+
+def bidirectional_search(compact, source, target):
+    """
+    Dijkstra bidirecional: uma busca a partir da origem (no grafo) e outra
+    a partir do destino (no grafo reverso), alternando pela fila de menor
+    chave. Para quando a soma dos topos das duas filas alcança o melhor
+    caminho encontrado (mu).
+
+    :param compact: Objeto CompactGraph (pesos não negativos).
+    :param source: Índice da origem.
+    :param target: Índice do destino.
+    :return: Tupla (distância, caminho em índices ou None, nº de vértices definidos).
+    """
+    if source == target:
+        return 0.0, [source], 1
+
+    graphs = (compact, compact.reverse())
+    distances = ({source: 0.0}, {target: 0.0})
+    predecessors = ({}, {})
+    settled = (set(), set())
+    heaps = ([(0.0, source)], [(0.0, target)])
+    best, meeting = math.inf, None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # Avança a busca cuja fila tem a menor chave
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        du, u = heapq.heappop(heaps[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+
+        graph = graphs[side]
+        dist, other = distances[side], distances[1 - side]
+        start, end = graph.offsets[u], graph.offsets[u + 1]
+        for v, weight in zip(graph.targets[start:end], graph.weights[start:end]):
+            new_dist = du + weight
+            if new_dist < dist.get(v, math.inf):
+                dist[v] = new_dist
+                predecessors[side][v] = u
+                heapq.heappush(heaps[side], (new_dist, v))
+            # Caminho origem -> v -> destino passando pelas duas buscas
+            if v in other and new_dist + other[v] < best:
+                best, meeting = new_dist + other[v], v
+
+    num_settled = len(settled[0]) + len(settled[1])
+    if meeting is None:
+        return math.inf, None, num_settled
+
+    # origem -> meeting pelos predecessores da busca direta; meeting ->
+    # destino pelos da busca reversa (o "predecessor" lá é o próximo vértice)
+    path = _build_path(predecessors[0], source, meeting)
+    v = meeting
+    while v != target:
+        v = predecessors[1][v]
+        path.append(v)
+    return best, path, num_settled
+
+
+def shortest_path(graph, source, target, method='bidirectional', heuristic=None, landmarks=None):
+    """
+    Caminho mínimo de um único par (origem, destino).
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param source: Rótulo da origem.
+    :param target: Rótulo do destino.
+    :param method: Um de POINT_TO_POINT_METHODS.
+    :param heuristic: No 'astar': dict {rótulo: estimativa da distância até
+                      o destino} ou função f(rótulo); vértices ausentes do
+                      dict valem 0. Deve ser admissível.
+    :param landmarks: No 'alt': objeto Landmarks já calculado (ex: do cache);
+                      None calcula os marcos nesta chamada.
+    :return: Um dicionário com a distância, o caminho e o nº de vértices
+             definidos ('settled').
+    """
+
+    # --- 1. Validação e Inicialização ---
+
+    algorithm = f'Caminho ponto a ponto ({method})'
+    if method not in POINT_TO_POINT_METHODS:
+        return {
+            'success': False,
+            'algorithm': algorithm,
+            'error': f"Método desconhecido: '{method}' (use {', '.join(POINT_TO_POINT_METHODS)})."
+        }
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    for vertex in (source, target):
+        if not compact.has_vertex(vertex):
+            return {
+                'success': False,
+                'algorithm': algorithm,
+                'error': f'O vértice "{vertex}" não foi encontrado no grafo.'
+            }
+    if compact.has_negative_weights:
+        return {
+            'success': False,
+            'algorithm': algorithm,
+            'error': 'O grafo possui arestas de peso negativo. Use o Bellman-Ford.'
+        }
+
+    labels = compact.labels
+    s, t = compact.index[source], compact.index[target]
+
+    # --- 2. Busca ---
+
+    if method == 'bidirectional':
+        with phase('reverse_index'):
+            compact.reverse()
+        with phase('search'):
+            distance, path, settled = bidirectional_search(compact, s, t)
+    else:
+        h = None
+        if method == 'astar' and heuristic is not None:
+            estimate = heuristic.get if isinstance(heuristic, dict) else heuristic
+            h = lambda v: estimate(labels[v]) or 0.0
+        elif method == 'alt':
+            if landmarks is None:
+                with phase('landmarks'):
+                    landmarks = Landmarks(compact)
+            h = landmarks.heuristic(t)
+        with phase('search'):
+            distance, path, settled = astar_search(compact, s, t, h)
+    count('vertices_settled', settled)
+
+    # --- 3. Retorno ---
+
+    return {
+        'success': True,
+        'algorithm': algorithm,
+        'method': method,
+        'source': source,
+        'target': target,
+        'distance': distance,
+        'path': None if path is None else [labels[i] for i in path],
+        'settled': settled,
+        'num_vertices': compact.num_vertices()
+    }
@@ -1,85 +1,116 @@
-import heapq
 import sys
 
-def prim_mst(graph, start_vertex):
+from ..instrumentation import count, phase
+from .heap import IndexedMinHeap
+from .spanning import build_forest_result
+
+def prim_mst(graph, start_vertex=None):
     """
     Executa o algoritmo de Prim para encontrar a Árvore Geradora Mínima (MST)
     de um grafo não direcionado, ponderado e conectado.
 
-    Assume que a API do objeto 'graph' é:
-    - graph.get_vertices(): Retorna uma lista/set de todos os vértices.
-    - graph.get_neighbors(v): Retorna um dict {vizinho: peso, ...}
+    Executa sobre a forma compacta do grafo (graph.freeze()), com um heap
+    indexado (IndexedMinHeap): cada vértice fora da árvore tem uma única
+    entrada no heap, com a aresta mais leve que o liga à árvore, e ela é
+    reduzida (decrease-key) quando surge uma aresta mais leve. O heap fica
+    com no máximo V entradas, em vez de até E com o heapq.
 
-    :param graph: Objeto grafo (esperado de graph.py).
-    :param start_vertex: O vértice para iniciar a construção da MST.
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param start_vertex: O vértice para iniciar a construção da MST. Se None,
+                         a árvore cresce a partir de cada componente e o
+                         resultado é a floresta geradora mínima do grafo.
     :return: Um dicionário contendo a MST, o custo total e um status.
     """
 
     # --- 1. Validação e Inicialização ---
-    
+
+    with phase('freeze'):
+        compact = graph.freeze()
+    labels = compact.labels
+
     # Verifica se o grafo tem vértices
-    all_vertices = graph.get_vertices()
-    if not all_vertices:
+    num_vertices = compact.num_vertices()
+    if not num_vertices:
         return {
             'success': False,
+            'algorithm': 'Prim',
             'error': 'O grafo está vazio.'
         }
 
     # Verifica se o vértice inicial existe
-    if start_vertex not in all_vertices:
+    if start_vertex is not None and not compact.has_vertex(start_vertex):
         return {
             'success': False,
+            'algorithm': 'Prim',
             'error': f'O vértice inicial "{start_vertex}" não foi encontrado no grafo.'
         }
 
     mst_edges = []      # Lista para armazenar as arestas (u, v, peso) da MST
     total_cost = 0      # Custo total da MST
-    visited = set()     # Conjunto de vértices já incluídos na MST
-    
-    # Fila de prioridade (min-heap) para armazenar as arestas candidatas
-    # Formato: (peso, vértice_origem, vértice_destino)
-    min_heap = []
+    visited = bytearray(num_vertices)  # Vértices já incluídos na MST
+    parent = [-1] * num_vertices       # Vértice da árvore ligado a cada candidato
+
+    # Heap indexado com um candidato por vértice fora da árvore.
+    # Chave: (peso, rótulo de origem, rótulo de destino); com o desempate
+    # pelos rótulos, as arestas escolhidas são as mesmas da versão com heapq.
+    heap = IndexedMinHeap(num_vertices)
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+
+    if start_vertex is not None:
+        roots = [compact.index[start_vertex]]
+    else:
+        roots = range(num_vertices)
+    num_components = 0
+    heap_updates = 0    # Inserções e reduções de chave (decrease-key)
 
     # --- 2. Lógica Principal do Algoritmo ---
 
     try:
-        # Adiciona o vértice inicial ao conjunto de visitados
-        visited.add(start_vertex)
-
-        # Adiciona todas as arestas do vértice inicial à fila de prioridade
-        # (Assumindo que get_neighbors retorna um dict {vizinho: peso})
-        for neighbor, weight in graph.get_neighbors(start_vertex).items():
-            heapq.heappush(min_heap, (weight, start_vertex, neighbor))
-
-        # Loop principal: continua enquanto houver arestas na fila
-        while min_heap:
-            # Pega a aresta com o menor peso da fila
-            weight, u, v = heapq.heappop(min_heap)
-
-            # Se o vértice de destino (v) já foi visitado, pula (evita ciclos)
-            if v in visited:
-                continue
-
-            # Processa o novo vértice
-            visited.add(v)
-            mst_edges.append((u, v, weight))
-            total_cost += weight
-
-            # Adiciona as arestas do novo vértice (v) à fila
-            for neighbor, new_weight in graph.get_neighbors(v).items():
-                # Só adiciona se o vizinho ainda não foi visitado
-                if neighbor not in visited:
-                    heapq.heappush(min_heap, (new_weight, v, neighbor))
+        with phase('mst'):
+            for root in roots:
+                if visited[root]:
+                    continue
+                num_components += 1
+
+                # Adiciona o vértice inicial (raiz do componente) à árvore
+                v = root
+                while True:
+                    visited[v] = 1
+                    label = labels[v]
+
+                    # Atualiza os candidatos com as arestas do novo vértice (v)
+                    start, end = offsets[v], offsets[v + 1]
+                    for neighbor, weight in zip(targets[start:end], weights[start:end]):
+                        # Só considera vizinhos ainda não visitados
+                        if visited[neighbor]:
+                            continue
+                        if heap.push_or_decrease((weight, label, labels[neighbor]), neighbor):
+                            parent[neighbor] = v
+                            heap_updates += 1
+
+                    if not heap:
+                        break
+
+                    # Pega o candidato com a aresta de menor peso
+                    (weight, _, _), v = heap.pop()
+                    mst_edges.append((labels[parent[v]], labels[v], weight))
+                    total_cost += weight
+        count('heap_updates', heap_updates)
+        count('heap_pops', len(mst_edges))
 
         # --- 3. Verificação de Conectividade e Retorno ---
 
+        if start_vertex is None:
+            return build_forest_result('Prim', mst_edges, total_cost, num_components)
+
         # Verifica se todos os vértices foram visitados.
         # Se não, o grafo não é conectado.
-        is_connected = (len(visited) == len(all_vertices))
-        
+        is_connected = (len(mst_edges) + 1 == num_vertices)
+
         if not is_connected:
             return {
                 'success': True,
+                'algorithm': 'Prim',
                 'status': 'Grafo não conectado',
                 'message': f'MST encontrada apenas para o componente conectado de "{start_vertex}".',
                 'mst_edges': mst_edges,
@@ -88,6 +119,7 @@ def prim_mst(graph, start_vertex):
 
         return {
             'success': True,
+            'algorithm': 'Prim',
             'status': 'Conectado',
             'message': 'Árvore Geradora Mínima encontrada com sucesso.',
             'mst_edges': mst_edges,
@@ -95,9 +127,10 @@ def prim_mst(graph, start_vertex):
         }
 
     except Exception as e:
-        # Captura erros inesperados (ex: se get_neighbors não for um dict)
+        # Captura erros inesperados
         exc_type, exc_obj, exc_tb = sys.exc_info()
         return {
             'success': False,
+            'algorithm': 'Prim',
             'error': f'Erro interno durante a execução do Prim: {e} (linha {exc_tb.tb_lineno})' # type: ignore
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,78 @@
+"""
+Escolha automática do algoritmo (motor) mais adequado para cada grafo.
+"""
+import math
+
+from .floyd_warshall import HAS_NUMPY
+
+
+def choose_single_source(graph):
+    """
+    Escolhe o algoritmo de caminhos mínimos a partir de uma origem.
+
+    Usa o indicador de pesos negativos calculado no parsing (sem percorrer
+    as arestas novamente): Dijkstra se todos os pesos forem não negativos,
+    Bellman-Ford caso contrário. Em grafos acíclicos direcionados, o
+    Bellman-Ford usa a passada única em ordem topológica (modo 'dag').
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :return: 'dijkstra' ou 'bellman_ford'.
+    """
+    if graph.has_negative_weights:
+        return 'bellman_ford'
+    return 'dijkstra'
+
+
+# Quantas vezes a versão NumPy do Floyd-Warshall é mais rápida, por operação,
+# que o Dijkstra em Python puro (estimativa empírica, só para a escolha).
+NUMPY_SPEEDUP = 50
+
+
+def choose_all_pairs(graph):
+    """
+    Escolhe o algoritmo de caminhos mínimos entre todos os pares pela densidade.
+
+    Compara o custo estimado do Floyd-Warshall, V³ (dividido pelo ganho da
+    versão NumPy, se disponível), com o do Johnson, V * (V + E) * log V.
+    Grafos esparsos ficam com o Johnson; densos, com o Floyd-Warshall.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :return: 'johnson' ou 'floyd_warshall'.
+    """
+    compact = graph.freeze()
+    num_vertices = compact.num_vertices()
+    num_edges = compact.num_edges()
+    if num_vertices < 2:
+        return 'floyd_warshall'
+
+    floyd_warshall_cost = num_vertices ** 3
+    if HAS_NUMPY:
+        floyd_warshall_cost /= NUMPY_SPEEDUP
+    johnson_cost = num_vertices * (num_vertices + num_edges) * math.log2(num_vertices)
+
+    return 'johnson' if johnson_cost < floyd_warshall_cost else 'floyd_warshall'
+
+
+# Grau médio (arestas armazenadas por vértice) a partir do qual o Prim com
+# heap indexado supera o Kruskal, cuja ordenação cresce com E log E
+# (medido com benchmarks de grafos aleatórios).
+MST_DENSE_DEGREE = 32
+
+
+def choose_mst(graph):
+    """
+    Escolhe o algoritmo de floresta geradora mínima pela densidade.
+
+    Grafos esparsos ficam com o Kruskal (ordenar poucas arestas é barato);
+    densos, com o Prim (heap indexado com no máximo V entradas). O Borůvka
+    não é escolhido automaticamente: em Python puro ele só compensa quando
+    a busca de cada rodada é dividida entre vários processos.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :return: 'prim' ou 'kruskal'.
+    """
+    compact = graph.freeze()
+    num_vertices = compact.num_vertices()
+    if num_vertices and compact.num_edges() / num_vertices >= MST_DENSE_DEGREE:
+        return 'prim'
+    return 'kruskal'
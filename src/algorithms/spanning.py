@@ -0,0 +1,37 @@
+"""
+Funções auxiliares para montar a saída dos algoritmos de árvore geradora
+mínima (Prim, Kruskal e Borůvka).
+"""
+
+
+def build_forest_result(algorithm, mst_edges, total_cost, num_components):
+    """
+    Monta o resultado de uma floresta geradora mínima (todos os componentes)
+    no mesmo formato do prim_mst.
+
+    :param algorithm: Nome do algoritmo exibido no resultado.
+    :param mst_edges: Lista de arestas (u, v, peso) da floresta.
+    :param total_cost: Soma dos pesos das arestas.
+    :param num_components: Nº de componentes conexos do grafo.
+    :return: dict com 'success', 'status', 'message', 'mst_edges', etc.
+    """
+    if num_components > 1:
+        return {
+            'success': True,
+            'algorithm': algorithm,
+            'status': 'Grafo não conectado',
+            'message': f'Floresta geradora mínima encontrada ({num_components} componentes conectados).',
+            'mst_edges': mst_edges,
+            'total_cost': total_cost,
+            'components': num_components
+        }
+
+    return {
+        'success': True,
+        'algorithm': algorithm,
+        'status': 'Conectado',
+        'message': 'Árvore Geradora Mínima encontrada com sucesso.',
+        'mst_edges': mst_edges,
+        'total_cost': total_cost,
+        'components': num_components
+    }
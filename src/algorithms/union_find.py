@@ -0,0 +1,52 @@
+"""
+Estrutura union-find (conjuntos disjuntos), usada pelos algoritmos de
+árvore geradora mínima (Kruskal e Borůvka).
+"""
+from array import array
+
+
+class UnionFind:
+    """
+    Conjuntos disjuntos sobre os inteiros 0 .. n - 1, com compressão de
+    caminho e união por posto (rank): cada operação custa O(α(n)), na
+    prática constante.
+    """
+
+    def __init__(self, n):
+        """
+        :param n: Nº de elementos (cada um começa em seu próprio conjunto).
+        """
+        self.parent = array('i', range(n))
+        self.rank = bytearray(n)  # O posto nunca passa de log2(n) < 256
+        self.count = n            # Nº de conjuntos
+
+    def find(self, x):
+        """Retorna o representante do conjunto de x (comprimindo o caminho)."""
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Compressão de caminho: todos os nós visitados apontam para a raiz
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        """
+        Une os conjuntos de x e y.
+
+        :return: False se já estavam no mesmo conjunto.
+        """
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x == root_y:
+            return False
+
+        # União por posto: a árvore mais baixa fica embaixo da mais alta
+        rank = self.rank
+        if rank[root_x] < rank[root_y]:
+            root_x, root_y = root_y, root_x
+        self.parent[root_y] = root_x
+        if rank[root_x] == rank[root_y]:
+            rank[root_x] += 1
+        self.count -= 1
+        return True
@@ -0,0 +1,402 @@
+"""
+Caches em memória (LRU) usados pelo servidor para evitar trabalho repetido
+entre requisições, como o parsing dos mesmos arquivos .dot.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from .dot_parser import parse_dot
+
+# Estimativas (em bytes) do custo de um vértice e de uma aresta na lista de
+# adjacência do Graph (dict de dicts de floats). Não precisam ser exatas:
+# servem apenas para limitar a memória ocupada pelo cache.
+BYTES_PER_VERTEX = 300
+BYTES_PER_EDGE = 120
+
+
+def estimate_graph_size(graph):
+    """
+    Estima quantos bytes um objeto Graph ocupa em memória.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :return: int com o tamanho aproximado em bytes.
+    """
+    if not hasattr(graph, 'adj_list'):
+        return graph.nbytes()
+    num_vertices = len(graph.adj_list)
+    num_edges = sum(len(neighbors) for neighbors in graph.adj_list.values())
+    return num_vertices * BYTES_PER_VERTEX + num_edges * BYTES_PER_EDGE
+
+
+def estimate_result_size(result):
+    """
+    Estima quantos bytes o resultado de um algoritmo ocupa em memória,
+    percorrendo recursivamente dicionários, listas e tuplas. Objetos com o
+    método nbytes() (ex: AllPairsResult) informam o próprio tamanho.
+
+    :param result: Dicionário retornado por um algoritmo.
+    :return: int com o tamanho aproximado em bytes.
+    """
+    total = 0
+    seen = set()
+    stack = [result]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if hasattr(obj, 'nbytes') and callable(obj.nbytes):
+            total += obj.nbytes()
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+    return total
+
+
+def estimate_disk_size(result):
+    """
+    Estima quantos bytes o resultado de um algoritmo ocupa em disco: objetos
+    com o método disk_bytes() (ex: AllPairsResult com as matrizes em
+    numpy.memmap) informam o próprio tamanho.
+
+    :param result: Dicionário retornado por um algoritmo.
+    :return: int com o tamanho aproximado em bytes (0 se tudo está em memória).
+    """
+    total = 0
+    seen = set()
+    stack = [result]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if hasattr(obj, 'disk_bytes') and callable(obj.disk_bytes):
+            total += obj.disk_bytes()
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return total
+
+
+class LRUCache:
+    """
+    Cache LRU (Least Recently Used) genérico e thread-safe.
+
+    Remove as entradas usadas há mais tempo quando o número de entradas
+    ou o total estimado de bytes ultrapassa os limites configurados.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=None):
+        """
+        :param max_entries: Número máximo de entradas mantidas no cache.
+        :param max_bytes: Limite de memória (em bytes) ou None para ilimitado.
+        :param sizeof: Função que estima o tamanho (em bytes) de um valor.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._entries = OrderedDict()  # chave -> (valor, tamanho)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Retorna o valor associado à chave e o marca como usado recentemente.
+
+        :param key: A chave procurada.
+        :param default: Valor retornado se a chave não estiver no cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        Armazena um valor no cache, removendo entradas antigas se necessário.
+
+        Valores maiores que o limite de memória não são armazenados.
+
+        :param key: A chave.
+        :param value: O valor a ser armazenado.
+        """
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            self._evict()
+
+    def resize(self, key):
+        """
+        Recalcula o tamanho de uma entrada cujo valor cresceu (ou diminuiu)
+        depois do put() e remove entradas antigas se necessário.
+
+        :param key: A chave (ignorada se não estiver no cache).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            value, old_size = entry
+            size = self._sizeof(value)
+            self._entries[key] = (value, size)
+            self.total_bytes += size - old_size
+            if self.max_bytes is not None and size > self.max_bytes:
+                self._remove(key)
+            self._evict()
+
+    def pop(self, key):
+        """Remove uma chave do cache (se existir) e retorna seu valor."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            return self._remove(key)
+
+    def clear(self):
+        """Esvazia o cache (os contadores são mantidos)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Retorna um dicionário com o estado e os contadores do cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _remove(self, key):
+        value, size = self._entries.pop(key)
+        self.total_bytes -= size
+        return value
+
+    def _evict(self):
+        # Remove as entradas menos usadas (início do OrderedDict)
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+
+class GraphCache:
+    """
+    Cache de objetos Graph já interpretados, indexado por
+    (caminho, tamanho, mtime) do arquivo .dot.
+
+    Se o arquivo mudar no disco, o tamanho ou o mtime mudam, a entrada
+    antiga é invalidada e o arquivo é interpretado novamente.
+
+    Grafos pré-carregados (preload) ficam fixos fora do LRU: não são
+    descartados e get() os retorna sem consultar o disco (nem o os.stat).
+    Usado no modo de produção, onde os arquivos não mudam com o servidor
+    no ar.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=256 * 1024 * 1024, loader=parse_dot):
+        """
+        :param max_entries: Número máximo de grafos mantidos em memória.
+        :param max_bytes: Limite de memória estimada para os grafos.
+        :param loader: Função que lê o arquivo e retorna o grafo.
+        """
+        self._lru = LRUCache(max_entries, max_bytes, sizeof=estimate_graph_size)
+        self._loader = loader
+        self._current_keys = {}  # caminho -> chave atualmente em cache
+        self._pinned = {}        # caminho -> grafo pré-carregado
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def get(self, filepath):
+        """
+        Retorna o grafo do arquivo, usando o cache quando possível.
+
+        :param filepath: Caminho do arquivo .dot.
+        :return: Um objeto da classe Graph.
+        :raises FileNotFoundError: Se o arquivo não existir.
+        """
+        path = os.path.abspath(filepath)
+        graph = self._pinned.get(path)
+        if graph is not None:
+            return graph
+
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+
+        # Invalida a versão antiga se o arquivo foi alterado
+        with self._lock:
+            old_key = self._current_keys.get(path)
+            if old_key is not None and old_key != key:
+                self._lru.pop(old_key)
+                del self._current_keys[path]
+                self.invalidations += 1
+
+        graph = self._lru.get(key)
+        if graph is not None:
+            return graph
+
+        graph = self._loader(path)
+        self._lru.put(key, graph)
+        with self._lock:
+            self._current_keys[path] = key
+        return graph
+
+    def preload(self, filepath):
+        """
+        Carrega o grafo do arquivo e o fixa no cache (ver a descrição da classe).
+
+        :param filepath: Caminho do arquivo.
+        :return: O grafo carregado.
+        """
+        path = os.path.abspath(filepath)
+        graph = self._loader(path)
+        with self._lock:
+            self._pinned[path] = graph
+        return graph
+
+    def is_preloaded(self, filepath):
+        """Verifica se o grafo do arquivo foi pré-carregado (sem acessar o disco)."""
+        return os.path.abspath(filepath) in self._pinned
+
+    def invalidate(self, filepath):
+        """Remove do cache o grafo de um arquivo."""
+        path = os.path.abspath(filepath)
+        with self._lock:
+            key = self._current_keys.pop(path, None)
+        if key is not None:
+            self._lru.pop(key)
+            self.invalidations += 1
+
+    def clear(self):
+        """Esvazia o cache (os grafos pré-carregados continuam)."""
+        with self._lock:
+            self._current_keys.clear()
+        self._lru.clear()
+
+    def stats(self):
+        """Retorna os contadores do cache (hits, misses, evictions, ...)."""
+        stats = self._lru.stats()
+        stats['invalidations'] = self.invalidations
+        with self._lock:
+            pinned = list(self._pinned.values())
+        stats['preloaded'] = len(pinned)
+        stats['preloaded_bytes'] = sum(estimate_graph_size(graph) for graph in pinned)
+        return stats
+
+
+class ResultCache:
+    """
+    Cache dos resultados dos algoritmos, indexado por
+    (hash do conteúdo do grafo, algoritmo, vértice inicial).
+
+    Os algoritmos são funções puras do grafo e do vértice inicial, então
+    o mesmo resultado pode ser reaproveitado por qualquer requisição
+    (HTML ou JSON) sobre o mesmo grafo.
+
+    Resultados maiores que 'max_bytes' (ex: a matriz de um Floyd-Warshall
+    com milhares de vértices) não cabem no LRU, mas são justamente os que
+    a página consulta em blocos (/api/all-pairs/tile, /pair, /stream): os
+    'large_entries' mais recentes ficam num LRU à parte, só por contagem,
+    para que cada bloco não execute o algoritmo de novo.
+
+    Resultados com matrizes em disco (Floyd-Warshall em blocos) quase não
+    ocupam memória, mas cada um mantém arquivos de 12 bytes por par de
+    vértices: ficam num terceiro LRU, limitado pelos bytes em disco
+    ('max_disk_bytes'). Os que sozinhos passam desse limite não são
+    guardados, e o espaço é liberado assim que a requisição termina.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=256 * 1024 * 1024, large_entries=2,
+                 max_disk_bytes=8 * 1024 * 1024 * 1024):
+        """
+        :param max_entries: Número máximo de resultados mantidos em memória.
+        :param max_bytes: Limite de memória estimada para os resultados.
+        :param large_entries: Nº de resultados acima de 'max_bytes' mantidos
+                              (os mais recentes); 0 = nenhum.
+        :param max_disk_bytes: Limite dos arquivos (matrizes em disco) dos
+                               resultados mantidos; None = ilimitado.
+        """
+        self.max_bytes = max_bytes
+        self._lru = LRUCache(max_entries, max_bytes, sizeof=estimate_result_size)
+        self._large = LRUCache(large_entries, None, sizeof=estimate_result_size)
+        self._spilled = LRUCache(max_entries, max_disk_bytes, sizeof=estimate_disk_size)
+
+    def get_or_compute(self, graph, algorithm, start_vertex, compute):
+        """
+        Retorna o resultado em cache ou executa 'compute' e armazena o retorno.
+
+        O dicionário retornado é uma cópia rasa: quem chama pode adicionar
+        chaves (ex: 'filename') sem alterar a entrada em cache.
+
+        :param graph: Objeto grafo (esperado de graph.py).
+        :param algorithm: Nome do algoritmo (ex: 'floyd_warshall').
+        :param start_vertex: Vértice inicial (ou None).
+        :param compute: Função sem argumentos que executa o algoritmo.
+        :return: Um dicionário com o resultado do algoritmo.
+        """
+        key = (graph.content_hash(), algorithm, start_vertex)
+        result = self._lru.get(key)
+        if result is None:
+            result = self._large.get(key)
+        if result is None:
+            result = self._spilled.get(key)
+        if result is None:
+            result = compute()
+            if estimate_disk_size(result) > 0:
+                self._spilled.put(key, result)
+            elif self.max_bytes is not None and estimate_result_size(result) > self.max_bytes:
+                if self._large.max_entries > 0:
+                    self._large.put(key, result)
+            else:
+                self._lru.put(key, result)
+        return dict(result)
+
+    def clear(self):
+        """Esvazia o cache."""
+        self._lru.clear()
+        self._large.clear()
+        self._spilled.clear()
+
+    def stats(self):
+        """Retorna os contadores do cache (hits, misses, evictions, ...)."""
+        stats = self._lru.stats()
+        large = self._large.stats()
+        stats['large_entries'] = large['entries']
+        stats['large_bytes'] = large['bytes']
+        stats['large_hits'] = large['hits']
+        spilled = self._spilled.stats()
+        stats['spilled_entries'] = spilled['entries']
+        stats['spilled_disk_bytes'] = spilled['bytes']
+        stats['spilled_hits'] = spilled['hits']
+        return stats
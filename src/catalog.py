@@ -0,0 +1,305 @@
+"""
+Catálogo (índice em memória) dos grafos disponíveis nos diretórios.
+
+Em vez de listar os diretórios e consultar o disco a cada requisição, o
+catálogo mantém, para cada grafo:
+- tamanho e mtime do arquivo;
+- tipo (direcionado ou não), nº de vértices e de arestas;
+- indicador de pesos negativos, faixa de pesos e nº de componentes conexos;
+- se o grafo é acíclico (DAG, ver CompactGraph.topological_order());
+- hash do conteúdo;
+- os algoritmos recomendados (os mesmos do modo automático, ver selector.py).
+
+Um watcher (thread em segundo plano) varre os diretórios a cada 'interval'
+segundos com os.scandir, que já traz o stat de cada arquivo: só os arquivos
+novos ou alterados (tamanho/mtime diferentes) são carregados de novo para
+recalcular as estatísticas. As requisições leem apenas o índice em memória.
+
+O loader deve ler o arquivo direto (ex: snapshot.load_graph), fora do
+cache de grafos das requisições: assim o watcher não ocupa o LRU com grafos
+que ninguém pediu. Grafos pré-carregados (update(..., pinned=True)) que
+mudarem no disco ficam marcados com 'stale': o catálogo mostra o arquivo
+novo, mas o servidor continua usando a versão carregada até reiniciar.
+"""
+import os
+import threading
+import time
+
+from .algorithms.selector import choose_all_pairs, choose_mst, choose_single_source
+from .snapshot import SNAPSHOT_EXT
+
+GRAPH_EXTENSIONS = ('.dot', '.gv')
+
+# Intervalo padrão (segundos) entre duas varreduras dos diretórios
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def list_graph_files(entries):
+    """
+    Escolhe, entre os arquivos de um diretório, os grafos a listar.
+
+    Quando existe um snapshot com o mesmo nome de um .dot/.gv e ele é mais
+    recente, lista o snapshot no lugar do arquivo texto (que seria mais lento
+    de carregar). Snapshots sem o arquivo original também são listados.
+
+    :param entries: dict {nome do arquivo: os.stat_result} do diretório.
+    :return: Lista de nomes de arquivos.
+    """
+    files = sorted(entries)
+    snapshots = {os.path.splitext(f)[0]: f for f in files if f.endswith(SNAPSHOT_EXT)}
+
+    listed = []
+    for f in files:
+        if not f.endswith(GRAPH_EXTENSIONS):
+            continue
+        snapshot = snapshots.pop(os.path.splitext(f)[0], None)
+        if snapshot and entries[snapshot].st_mtime_ns >= entries[f].st_mtime_ns:
+            listed.append(snapshot)
+        else:
+            listed.append(f)
+    listed.extend(snapshots.values())
+    return listed
+
+
+def recommend_algorithms(graph, graph_type):
+    """
+    Retorna os algoritmos que o modo automático escolheria para o grafo.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param graph_type: 'directed' ou 'undirected'.
+    :return: dict {'single_source', 'all_pairs'[, 'mst']}.
+    """
+    recommended = {
+        'single_source': choose_single_source(graph),
+        'all_pairs': choose_all_pairs(graph)
+    }
+    if graph_type == 'undirected':
+        recommended['mst'] = choose_mst(graph)
+    return recommended
+
+
+class GraphCatalog:
+    """
+    Índice em memória dos grafos de um conjunto de diretórios, atualizado
+    por um watcher em segundo plano. Thread-safe.
+    """
+
+    def __init__(self, directories, loader, interval=DEFAULT_POLL_INTERVAL):
+        """
+        :param directories: dict {tipo do grafo: diretório}
+                            (ex: {'undirected': 'graphs', 'directed': 'digraphs'}).
+        :param loader: Função que recebe o caminho e retorna o grafo
+                       (ex: snapshot.load_graph).
+        :param interval: Segundos entre duas varreduras do watcher.
+        """
+        self.directories = dict(directories)
+        self.interval = interval
+        self._loader = loader
+        self._entries = {}   # caminho absoluto -> entrada (dict)
+        self._listing = {graph_type: [] for graph_type in self.directories}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.scans = 0
+        self.last_scan = None
+
+    # --- Varredura ---
+
+    def scan(self):
+        """
+        Varre os diretórios e atualiza a lista de arquivos (sem carregar os
+        grafos). Arquivos novos ou alterados ficam com as estatísticas
+        pendentes ('vertices' = None) até o próximo refresh().
+
+        :return: Lista de caminhos com estatísticas pendentes.
+        """
+        listing = {}
+        entries = {}
+        for graph_type, directory in self.directories.items():
+            try:
+                with os.scandir(directory) as it:
+                    stats = {entry.name: entry.stat() for entry in it if entry.is_file()}
+            except FileNotFoundError:
+                print(f"Aviso: Diretório '{directory}' não encontrado.")
+                stats = {}
+            except OSError as e:
+                print(f"Erro ao ler '{directory}': {e}")
+                stats = {}
+
+            names = list_graph_files(stats)
+            listing[graph_type] = names
+            for name in names:
+                path = os.path.abspath(os.path.join(directory, name))
+                entries[path] = (graph_type, name, stats[name])
+
+        pending = []
+        with self._lock:
+            current = {}
+            for path, (graph_type, name, stat) in entries.items():
+                old = entry = self._entries.get(path)
+                if entry is None or entry['size'] != stat.st_size or entry['_mtime_ns'] != stat.st_mtime_ns:
+                    pinned = old is not None and old['_pinned']
+                    entry = {
+                        'file': name,
+                        'graph_type': graph_type,
+                        'directed': graph_type == 'directed',
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime,
+                        '_mtime_ns': stat.st_mtime_ns,
+                        'vertices': None,
+                        'edges': None,
+                        'has_negative_weights': None,
+                        'min_weight': None,
+                        'max_weight': None,
+                        'components': None,
+                        'acyclic': None,
+                        'content_hash': None,
+                        'recommended': None,
+                        'error': None,
+                        # Pré-carregado e alterado depois: o servidor usa a versão antiga
+                        'stale': pinned,
+                        '_pinned': pinned
+                    }
+                if entry['vertices'] is None and entry['error'] is None:
+                    pending.append(path)
+                current[path] = entry
+            self._entries = current
+            self._listing = listing
+            self.scans += 1
+            self.last_scan = time.time()
+        return pending
+
+    def refresh(self):
+        """
+        Varre os diretórios e calcula as estatísticas dos grafos novos ou
+        alterados (carregando-os com o loader).
+
+        :return: Nº de grafos (re)calculados.
+        """
+        pending = self.scan()
+        for path in pending:
+            self.update(path)
+        return len(pending)
+
+    def update(self, filepath, graph=None, pinned=False):
+        """
+        Calcula as estatísticas de um grafo do catálogo.
+
+        :param filepath: Caminho do arquivo (já listado por scan()).
+        :param graph: Grafo já carregado (None = carrega com o loader).
+        :param pinned: Se o grafo foi pré-carregado (fixo no cache de grafos):
+                       alterações posteriores do arquivo marcam a entrada
+                       como 'stale'.
+        """
+        path = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return
+
+        stats = {}
+        try:
+            if graph is None:
+                graph = self._loader(path)
+            compact = graph.freeze()
+            num_edges = compact.num_edges()
+            if not compact.directed:
+                num_edges //= 2  # Cada aresta é armazenada nos dois sentidos
+            min_weight, max_weight = compact.weight_range()
+            stats = {
+                'vertices': compact.num_vertices(),
+                'edges': num_edges,
+                'directed': compact.directed,
+                'has_negative_weights': bool(compact.has_negative_weights),
+                'min_weight': min_weight,
+                'max_weight': max_weight,
+                'components': compact.num_components(),
+                'acyclic': compact.directed and compact.is_acyclic(),
+                'content_hash': compact.content_hash(),
+                'recommended': recommend_algorithms(compact, entry['graph_type'])
+            }
+        except (OSError, ValueError) as e:
+            print(f"Erro [Catálogo] {entry['file']}: {e}")
+            stats = {'error': str(e)}
+
+        with self._lock:
+            # O arquivo pode ter mudado durante a carga: só atualiza a mesma entrada
+            if self._entries.get(path) is entry:
+                entry.update(stats)
+                if pinned:
+                    entry['_pinned'] = True
+
+    # --- Watcher ---
+
+    def start(self):
+        """
+        Inicia o watcher, se ainda não estiver rodando neste processo.
+
+        As threads não sobrevivem ao fork: no gunicorn (preload_app), cada
+        worker deve chamar start() de novo (ex: antes de cada requisição;
+        a chamada é barata quando o watcher já está rodando).
+        """
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='graph-catalog', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Para o watcher."""
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Erro [Catálogo] na varredura: {e}")
+            self._stop.wait(self.interval)
+
+    # --- Consulta (sem acesso ao disco) ---
+
+    def listing(self):
+        """
+        Retorna os nomes dos arquivos listados, por tipo de grafo.
+
+        :return: dict {tipo do grafo: [nomes]}.
+        """
+        with self._lock:
+            return {graph_type: list(names) for graph_type, names in self._listing.items()}
+
+    def entries(self, graph_type=None):
+        """
+        Retorna as entradas do catálogo em formato serializável (JSON).
+
+        :param graph_type: Filtra por tipo ('directed' ou 'undirected'); None = todos.
+        :return: Lista de dicts, na ordem da listagem.
+        """
+        with self._lock:
+            return [
+                {key: value for key, value in entry.items() if not key.startswith('_')}
+                for entry in self._entries.values()
+                if graph_type is None or entry['graph_type'] == graph_type
+            ]
+
+    def contains(self, filepath):
+        """Verifica se o arquivo está no catálogo (sem acessar o disco)."""
+        return os.path.abspath(filepath) in self._entries
+
+    def stats(self):
+        """Retorna o estado do watcher e o nº de grafos (total e pendentes)."""
+        with self._lock:
+            pending = sum(1 for entry in self._entries.values() if entry['vertices'] is None and entry['error'] is None)
+            return {
+                'graphs': len(self._entries),
+                'pending': pending,
+                'scans': self.scans,
+                'last_scan': self.last_scan,
+                'interval': self.interval,
+                'watching': self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+            }
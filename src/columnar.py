@@ -0,0 +1,168 @@
+"""
+Saída compacta (colunar) dos resultados dos algoritmos, para a API JSON.
+
+O contexto do results.html é pensado para o template: distâncias com o
+marcador 'Infinito' e o caminho completo de cada vértice (O(V²) rótulos no
+pior caso). Aqui o resultado vira colunas indexadas por inteiros:
+- 'vertices': lista de rótulos (índice -> rótulo);
+- 'distances': lista plana de floats (null se inalcançável); entre todos
+  os pares, em ordem de linhas (origem i, destino j -> i * V + j);
+- 'predecessors' (ou 'next_hops' no Floyd-Warshall): índices inteiros,
+  -1 se não houver; os caminhos são reconstruídos pelo cliente;
+- MST: 'edge_sources', 'edge_targets' e 'edge_weights'.
+
+O payload pode ser codificado em JSON ou MessagePack (opcional) e
+comprimido com gzip (encode_payload).
+"""
+import gzip
+import json
+import math
+
+from .algorithms.all_pairs import NO_HOP, PREDECESSOR, AllPairsResult
+from .algorithms.paths import SingleSourcePaths
+
+# MessagePack é opcional: sem ele, só o formato JSON fica disponível.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+HAS_MSGPACK = msgpack is not None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+# Abaixo deste tamanho (bytes), a compressão não compensa
+GZIP_MIN_BYTES = 1024
+
+# Campos do contexto copiados como estão para o payload
+SCALAR_FIELDS = (
+    'success', 'algorithm', 'engine', 'auto_selected', 'message', 'error', 'status',
+    'negative_cycle', 'start_vertex', 'heap', 'stats', 'total_cost', 'components', 'profile',
+    'longest', 'critical_path'
+)
+
+# Linhas da matriz entre todos os pares convertidas por vez
+ROW_BLOCK = 64
+
+
+def to_columnar(context, max_all_pairs_vertices=None):
+    """
+    Converte o contexto de um algoritmo (o mesmo do results.html) no
+    formato colunar.
+
+    :param context: Dicionário de resultado (ver execute_algorithm).
+    :param max_all_pairs_vertices: Acima deste nº de vértices, a matriz
+                                   entre todos os pares não é incluída
+                                   ('matrix_omitted': True); None = sem limite.
+    :return: dict serializável (JSON/MessagePack).
+    """
+    payload = {key: context[key] for key in SCALAR_FIELDS if key in context}
+    results = context.get('results')
+
+    if isinstance(results, AllPairsResult):
+        payload.update(_all_pairs_columns(results, max_all_pairs_vertices))
+    elif 'mst_edges' in context:
+        payload.update(_mst_columns(context['mst_edges']))
+    elif results:
+        payload.update(_single_source_columns(results, context.get('start_vertex')))
+    return payload
+
+
+def _single_source_columns(results, start_vertex):
+    """Distâncias e predecessores de uma única origem (Dijkstra, Bellman-Ford)."""
+    distances = results['distances']
+    paths = results['paths']
+    vertices = list(distances)
+
+    if isinstance(paths, SingleSourcePaths):
+        # Predecessores inteiros direto do algoritmo, sem montar os caminhos
+        source = paths.source
+        predecessors = paths.predecessor_indices(NO_HOP)
+    else:
+        index = {label: i for i, label in enumerate(vertices)}
+        source = index.get(start_vertex)
+        predecessors = []
+        for label in vertices:
+            path = paths.get(label)
+            # O predecessor é o penúltimo vértice do caminho até o vértice
+            predecessors.append(index[path[-2]] if path and len(path) > 1 else NO_HOP)
+
+    return {
+        'vertices': vertices,
+        'source': source,
+        'distances': [None if d == 'Infinito' else d for d in distances.values()],
+        'predecessors': predecessors
+    }
+
+
+def _all_pairs_columns(results, max_vertices):
+    """Matrizes de distâncias e de saltos, achatadas em ordem de linhas."""
+    vertices = results.vertices
+    columns = {'vertices': vertices}
+    if results.sources != vertices:
+        columns['sources'] = results.sources
+    hop_key = 'predecessors' if results.hops == PREDECESSOR else 'next_hops'
+
+    if max_vertices is not None and len(vertices) > max_vertices:
+        columns['matrix_omitted'] = True
+        return columns
+
+    num_rows, num_cols = len(results.sources), len(vertices)
+    distances = []
+    hops = []
+    for start in range(0, num_rows, ROW_BLOCK):
+        stop = start + ROW_BLOCK
+        for row in results.distance_block(start, stop, 0, num_cols):
+            distances.extend(None if d == math.inf else d for d in row)
+        for row in results.hop_block(start, stop, 0, num_cols):
+            hops.extend(row)
+
+    columns['distances'] = distances
+    columns[hop_key] = hops
+    return columns
+
+
+def _mst_columns(mst_edges):
+    """Arestas da árvore/floresta como três colunas (origem, destino, peso)."""
+    index = {}
+    sources, targets, weights = [], [], []
+    for u, v, weight in mst_edges:
+        sources.append(index.setdefault(u, len(index)))
+        targets.append(index.setdefault(v, len(index)))
+        weights.append(weight)
+    return {
+        # Só os vértices citados nas arestas, na ordem em que aparecem
+        'vertices': list(index),
+        'edge_sources': sources,
+        'edge_targets': targets,
+        'edge_weights': weights
+    }
+
+
+def encode_payload(payload, fmt='json', compress=False):
+    """
+    Codifica o payload.
+
+    :param payload: dict retornado por to_columnar.
+    :param fmt: 'json' ou 'msgpack'.
+    :param compress: Se True, comprime com gzip (se o corpo passar de
+                     GZIP_MIN_BYTES).
+    :return: Tupla (corpo em bytes, mimetype, True se foi comprimido).
+    :raises ValueError: Formato desconhecido ou MessagePack não instalado.
+    """
+    if fmt == 'msgpack':
+        if not HAS_MSGPACK:
+            raise ValueError('O formato msgpack exige o pacote msgpack (pip install msgpack).')
+        body = msgpack.packb(payload, use_bin_type=True)
+        mimetype = MSGPACK_MIMETYPE
+    elif fmt == 'json':
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        mimetype = JSON_MIMETYPE
+    else:
+        raise ValueError(f"Formato desconhecido: '{fmt}' (use 'json' ou 'msgpack').")
+
+    compressed = compress and len(body) >= GZIP_MIN_BYTES
+    if compressed:
+        body = gzip.compress(body, compresslevel=6)
+    return body, mimetype, compressed
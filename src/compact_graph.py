@@ -0,0 +1,446 @@
+"""
+Representação compacta e somente leitura de um grafo, no formato CSR
+(Compressed Sparse Row), com vértices indexados por inteiros.
+
+Em vez de um dicionário de dicionários, as arestas ficam em três arrays
+contíguos (módulo 'array'):
+- offsets[i] .. offsets[i + 1]: faixa das arestas que saem do vértice i
+- targets[k]: índice do vértice de destino da aresta k
+- weights[k]: peso (float64) da aresta k
+
+Cada aresta ocupa 12 bytes (4 do destino + 8 do peso), contra centenas de
+bytes no Graph. Os rótulos ficam em 'labels' (índice -> rótulo) e em
+'index' (rótulo -> índice).
+
+Metadados derivados usados por vários algoritmos (origem de cada aresta,
+graus, faixa de pesos, componentes conexos, ordem topológica) são calculados no primeiro
+acesso e guardados junto do grafo. Como o grafo é somente leitura, nunca
+ficam desatualizados: no Graph, add_vertex/add_edge/remove_edge descartam
+a forma compacta inteira (ver Graph.freeze()).
+"""
+import hashlib
+from array import array
+
+from .algorithms.union_find import UnionFind
+
+
+class CompactGraph:
+    def __init__(self, labels, offsets, targets, weights, directed=False, has_negative_weights=None):
+        """
+        Inicializa o grafo compacto a partir de arrays já montados.
+
+        :param labels: Sequência de rótulos dos vértices (índice -> rótulo).
+        :param offsets: array('q') com len(labels) + 1 posições.
+        :param targets: array('i') com o índice do destino de cada aresta.
+        :param weights: array('d') com o peso de cada aresta.
+        :param directed: Define se o grafo é direcionado (True) ou não (False).
+        :param has_negative_weights: Se já for conhecido (ex: gravado em um
+                                     snapshot), evita percorrer 'weights'.
+        """
+        if len(offsets) != len(labels) + 1:
+            raise ValueError("CSR inválido: 'offsets' deve ter len(labels) + 1 posições.")
+        if len(targets) != len(weights):
+            raise ValueError("CSR inválido: 'targets' e 'weights' devem ter o mesmo tamanho.")
+
+        self.labels = labels
+        self._index = None
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+        # Verificado uma única vez, na construção (ver selector.py)
+        if has_negative_weights is None:
+            has_negative_weights = bool(len(weights)) and min(weights) < 0
+        self.has_negative_weights = has_negative_weights
+        self._content_hash = None
+        self._reverse = None
+        self._derived = {}   # Metadados derivados (ver _cached)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Constrói a forma compacta de um Graph (mesma ordem de vértices e arestas).
+
+        :param graph: Objeto grafo (esperado de graph.py).
+        :return: Um objeto CompactGraph.
+        """
+        labels = list(graph.adj_list.keys())
+        index = {label: i for i, label in enumerate(labels)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        for u in labels:
+            neighbors = graph.adj_list[u]
+            targets.extend(index[v] for v in neighbors)
+            weights.extend(neighbors.values())
+            offsets.append(len(targets))
+
+        return cls(labels, offsets, targets, weights, directed=graph.directed)
+
+    @property
+    def index(self):
+        """Dicionário rótulo -> índice, montado no primeiro acesso."""
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    # --- API compatível com graph.Graph ---
+
+    def get_vertices(self):
+        """
+        Retorna uma lista de todos os vértices no grafo.
+
+        :return: list
+        """
+        return list(self.labels)
+
+    def get_neighbors(self, vertex_label):
+        """
+        Retorna um dicionário dos vizinhos e pesos para um dado vértice.
+
+        O dicionário é montado a cada chamada a partir dos arrays CSR.
+
+        :param vertex_label: O rótulo do vértice.
+        :return: dict no formato {vizinho: peso, ...}
+                 Retorna um dicionário vazio se o vértice não existir.
+        """
+        i = self.index.get(vertex_label)
+        if i is None:
+            return {}
+        labels = self.labels
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {labels[j]: w for j, w in zip(self.targets[start:end], self.weights[start:end])}
+
+    def freeze(self):
+        """O grafo já é compacto: retorna ele mesmo."""
+        return self
+
+    def content_hash(self):
+        """
+        Retorna um hash (SHA-1) do conteúdo do grafo (tipo, rótulos e arrays).
+
+        :return: str hexadecimal.
+        """
+        if self._content_hash is None:
+            digest = hashlib.sha1()
+            digest.update(b'digraph' if self.directed else b'graph')
+            digest.update(repr(list(self.labels)).encode('utf-8'))
+            for buffer in (self.offsets, self.targets, self.weights):
+                digest.update(memoryview(buffer).cast('B'))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def __getstate__(self):
+        """Ao serializar (pickle), omite o índice rótulo -> inteiro (refeito no primeiro acesso)."""
+        state = self.__dict__.copy()
+        state['_index'] = None
+        state['_reverse'] = None
+        state['_derived'] = {}
+        return state
+
+    # --- API indexada por inteiros (usada pelos algoritmos) ---
+
+    def num_vertices(self):
+        """Retorna o número de vértices."""
+        return len(self.offsets) - 1
+
+    def num_edges(self):
+        """Retorna o número de arestas armazenadas (ida e volta contam 2x se não direcionado)."""
+        return len(self.targets)
+
+    def has_vertex(self, vertex_label):
+        """Verifica em O(1) se o vértice existe."""
+        return vertex_label in self.index
+
+    def neighbor_slice(self, i):
+        """
+        Retorna (targets, weights) das arestas que saem do vértice de índice i.
+
+        :param i: Índice do vértice.
+        :return: Tupla de dois arrays (destinos, pesos).
+        """
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    # --- Metadados derivados (calculados no primeiro acesso) ---
+
+    def _cached(self, name, compute):
+        """Retorna o metadado 'name', calculando-o com compute() no primeiro acesso."""
+        value = self._derived.get(name)
+        if value is None:
+            value = self._derived[name] = compute()
+        return value
+
+    def edge_sources(self):
+        """
+        Retorna um array('i') com o índice de origem de cada aresta
+        (o complemento de 'targets' no formato COO).
+
+        O array é compartilhado entre as chamadas: não deve ser alterado.
+        """
+        def compute():
+            sources = array('i')
+            offsets = self.offsets
+            for i in range(self.num_vertices()):
+                sources.extend([i] * (offsets[i + 1] - offsets[i]))
+            return sources
+        return self._cached('edge_sources', compute)
+
+    def out_degrees(self):
+        """Retorna um array('i') com o nº de arestas que saem de cada vértice."""
+        def compute():
+            offsets = self.offsets
+            return array('i', (offsets[i + 1] - offsets[i] for i in range(self.num_vertices())))
+        return self._cached('out_degrees', compute)
+
+    def in_degrees(self):
+        """
+        Retorna um array('i') com o nº de arestas que chegam em cada vértice
+        (igual a out_degrees() se o grafo não for direcionado).
+        """
+        if not self.directed:
+            return self.out_degrees()
+
+        def compute():
+            degrees = array('i', bytes(4 * self.num_vertices()))
+            for v in self.targets:
+                degrees[v] += 1
+            return degrees
+        return self._cached('in_degrees', compute)
+
+    def weight_range(self):
+        """
+        Retorna o menor e o maior peso das arestas.
+
+        :return: Tupla (mínimo, máximo), ou (None, None) se não houver arestas.
+        """
+        def compute():
+            weights = self.weights
+            if not len(weights):
+                return (None, None)
+            return (min(weights), max(weights))
+        return self._cached('weight_range', compute)
+
+    def connected_components(self):
+        """
+        Retorna os componentes conexos do grafo (fracamente conexos, se for
+        direcionado), com um union-find sobre as arestas.
+
+        :return: Tupla (nº de componentes, array('i') com o componente de
+                 cada vértice, numerados de 0 na ordem dos vértices).
+        """
+        def compute():
+            num_vertices = self.num_vertices()
+            components = UnionFind(num_vertices)
+            for u, v in zip(self.edge_sources(), self.targets):
+                components.union(u, v)
+
+            numbering = {}
+            component = array('i', (numbering.setdefault(components.find(x), len(numbering))
+                                     for x in range(num_vertices)))
+            return (components.count, component)
+        return self._cached('connected_components', compute)
+
+    def num_components(self):
+        """Retorna o nº de componentes conexos (ver connected_components())."""
+        return self.connected_components()[0]
+
+    def topological_order(self):
+        """
+        Retorna uma ordem topológica dos vértices (algoritmo de Kahn: remove
+        repetidamente os vértices sem arestas de entrada restantes).
+
+        Num grafo não direcionado, cada aresta é um ciclo (u -> v -> u): só
+        um grafo sem arestas tem ordem topológica.
+
+        :return: array('i') com os índices em ordem topológica, ou None se o
+                 grafo tiver ciclo.
+        """
+        def compute():
+            num_vertices = self.num_vertices()
+            offsets, targets = self.offsets, self.targets
+            remaining = array('i', self.in_degrees())  # Arestas de entrada ainda não removidas
+            order = array('i', (v for v in range(num_vertices) if not remaining[v]))
+            i = 0
+            while i < len(order):
+                u = order[i]
+                i += 1
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    remaining[v] -= 1
+                    if not remaining[v]:
+                        order.append(v)
+            # Guardado em uma tupla: None (com ciclo) também é um resultado
+            return (order if len(order) == num_vertices else None,)
+        return self._cached('topological_order', compute)[0]
+
+    def is_acyclic(self):
+        """Verifica se o grafo é acíclico (DAG), ver topological_order()."""
+        return self.topological_order() is not None
+
+    def reverse(self):
+        """
+        Retorna o grafo reverso (cada aresta u -> v vira v -> u), usado nas
+        buscas que partem do destino (ex: Dijkstra bidirecional).
+
+        É montado no primeiro acesso (ordenação por contagem, O(V + E)) e
+        guardado junto do grafo. Um grafo não direcionado é o próprio reverso.
+
+        :return: Um objeto CompactGraph (rótulos e índices compartilhados).
+        """
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            num_vertices = self.num_vertices()
+            targets, weights = self.targets, self.weights
+
+            # offsets do reverso: soma acumulada dos graus de entrada
+            offsets = array('q', bytes(8 * (num_vertices + 1)))
+            for i, degree in enumerate(self.in_degrees()):
+                offsets[i + 1] = offsets[i] + degree
+
+            reverse_targets = array('i', bytes(4 * len(targets)))
+            reverse_weights = array('d', bytes(8 * len(targets)))
+            position = offsets[:-1].tolist()
+            for k, (u, v) in enumerate(zip(self.edge_sources(), targets)):
+                p = position[v]
+                reverse_targets[p] = u
+                reverse_weights[p] = weights[k]
+                position[v] = p + 1
+
+            reverse = CompactGraph(
+                self.labels, offsets, reverse_targets, reverse_weights,
+                directed=True, has_negative_weights=self.has_negative_weights
+            )
+            reverse._index = self._index
+            reverse._reverse = self
+            # Os graus e os componentes do reverso são os do grafo, trocados
+            reverse._derived['out_degrees'] = self.in_degrees()
+            reverse._derived['in_degrees'] = self.out_degrees()
+            if 'connected_components' in self._derived:
+                reverse._derived['connected_components'] = self._derived['connected_components']
+            self._reverse = reverse
+        return self._reverse
+
+    def nbytes(self):
+        """
+        Estima quantos bytes o grafo ocupa em memória (arrays + rótulos).
+
+        :return: int
+        """
+        arrays = sum(buffer.itemsize * len(buffer) for buffer in (self.offsets, self.targets, self.weights))
+        # Metadados já calculados (origens das arestas, graus, componentes)
+        for value in self._derived.values():
+            for item in (value if isinstance(value, tuple) else (value,)):
+                if isinstance(item, array):
+                    arrays += item.itemsize * len(item)
+        # Rótulo (str) + entrada no dicionário 'index' + posição em 'labels'
+        return arrays + self.num_vertices() * 150
+
+    def __str__(self):
+        """Retorna uma representação em string do grafo (lista de adjacência)."""
+        output = ""
+        for u in self.labels:
+            output += f"{u} -> {self.get_neighbors(u)}\n"
+        return output
+
+
+class CompactGraphBuilder:
+    """
+    Monta um CompactGraph aresta por aresta, sem passar por um Graph.
+
+    As arestas são acumuladas em arrays (formato COO) e convertidas para CSR
+    em build(). O resultado é idêntico a Graph.freeze() para a mesma
+    sequência de add_vertex/add_edge: mesma ordem de vértices e de vizinhos,
+    e uma aresta repetida mantém a posição da primeira e o peso da última.
+    """
+
+    def __init__(self, directed=False):
+        """
+        :param directed: Define se o grafo é direcionado (True) ou não (False).
+        """
+        self.directed = directed
+        self.labels = []
+        self.index = {}
+        self._sources = array('i')
+        self._targets = array('i')
+        self._weights = array('d')
+
+    def add_vertex(self, vertex_label):
+        """
+        Adiciona um vértice (se ainda não existir) e retorna seu índice.
+
+        :param vertex_label: O rótulo (nome) do vértice.
+        :return: int
+        """
+        i = self.index.get(vertex_label)
+        if i is None:
+            i = self.index[vertex_label] = len(self.labels)
+            self.labels.append(vertex_label)
+        return i
+
+    def add_edge(self, u, v, weight=1.0):
+        """
+        Adiciona uma aresta (e a reversa, se o grafo não for direcionado).
+
+        :param u: Vértice de origem.
+        :param v: Vértice de destino.
+        :param weight: Peso da aresta (float). Padrão é 1.0.
+        """
+        # Consulta direta ao índice: add_edge é chamado uma vez por aresta
+        index = self.index
+        i = index.get(u)
+        if i is None:
+            i = self.add_vertex(u)
+        j = index.get(v)
+        if j is None:
+            j = self.add_vertex(v)
+        weight = float(weight)
+        self._sources.append(i)
+        self._targets.append(j)
+        self._weights.append(weight)
+        if not self.directed:
+            self._sources.append(j)
+            self._targets.append(i)
+            self._weights.append(weight)
+
+    def build(self):
+        """
+        Converte as arestas acumuladas para CSR (ordenação por contagem,
+        estável) e retorna o CompactGraph.
+
+        :return: Um objeto CompactGraph.
+        """
+        n = len(self.labels)
+        sources, targets, weights = self._sources, self._targets, self._weights
+
+        # 1. Conta as arestas de cada origem e calcula as posições iniciais
+        counts = [0] * (n + 1)
+        for i in sources:
+            counts[i + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+
+        # 2. Distribui as arestas (mantendo a ordem de inserção por origem)
+        position = counts[:-1]
+        sorted_targets = array('i', bytes(4 * len(targets)))
+        sorted_weights = array('d', bytes(8 * len(weights)))
+        for k in range(len(sources)):
+            i = sources[k]
+            p = position[i]
+            sorted_targets[p] = targets[k]
+            sorted_weights[p] = weights[k]
+            position[i] = p + 1
+
+        # 3. Remove arestas repetidas (como o dict do Graph faria)
+        offsets = array('q', [0])
+        out_targets = array('i')
+        out_weights = array('d')
+        for i in range(n):
+            start, end = counts[i], counts[i + 1]
+            neighbors = dict(zip(sorted_targets[start:end], sorted_weights[start:end]))
+            out_targets.extend(neighbors.keys())
+            out_weights.extend(neighbors.values())
+            offsets.append(len(out_targets))
+
+        return CompactGraph(self.labels, offsets, out_targets, out_weights, directed=self.directed)
@@ -16,10 +16,11 @@ GRAPH_TYPE_RE = re.compile(r'^\s*(di)?graph', re.IGNORECASE)
 #    a -- b;
 #    a -> b [weight=5];
 #    a -> b [weight=5.5];
+#    a -> b [weight=-2];
 EDGE_RE = re.compile(
     r'^\s*(\w+)\s*(--|->)\s*(\w+)'  # Grupo 1 (u), 2 (op), 3 (v)
-    # Grupo 4 (peso) opcional, permite inteiros ou floats
-    r'\s*(?:\[.*?weight\s*=\s*(\d+(?:\.\d+)?)\])?' 
+    # Grupo 4 (peso) opcional, permite inteiros ou floats (inclusive negativos)
+    r'\s*(?:\[.*?weight\s*=\s*(-?\d+(?:\.\d+)?)\])?' 
     r'\s*;?\s*$'  # Final da linha, ponto e vírgula opcional
 )
 
@@ -0,0 +1,487 @@
+"""
+Parser de arquivos DOT em fluxo (streaming), com tokenizador escrito à mão.
+
+Diferente do parse_dot (uma expressão regular por linha), este parser:
+- lê o arquivo em blocos (chunks) com buffer, sem carregar tudo na memória;
+- aceita vários comandos por linha (a -- b; b -- c;);
+- aceita cadeias de arestas (a -> b -> c [weight=2]);
+- aceita IDs entre aspas ("São Paulo") e listas de atributos em várias linhas;
+- ignora comentários (//, /* */ e linhas iniciadas por #), atributos do
+  grafo/nós e subgrafos (cujos comandos são incluídos no grafo principal);
+- envia as arestas direto para um Graph ou para um CompactGraph (compact=True).
+
+Arquivos no formato simples (um comando por linha, sem aspas, portas,
+subgrafos nem atributos de grafo/nó) são lidos primeiro por um caminho
+rápido, com uma expressão regular por linha (como o parse_dot). Na primeira
+linha fora desse formato, o arquivo é relido pelo tokenizador.
+"""
+import itertools
+import re
+
+from .compact_graph import CompactGraphBuilder
+from .graph import Graph
+
+# Tamanho padrão dos blocos lidos do arquivo (em caracteres)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Pontuação que forma tokens de um caractere
+PUNCTUATION = frozenset('{}[]=;,:')
+
+# Caminho rápido: sem aspas, comentários ou HTML, basta separar a pontuação
+# e os operadores com espaços e usar str.split() (tudo em C). Uma sequência
+# de str.replace é bem mais rápida que str.translate com substituições.
+_PADDING = tuple((c, f' {c} ') for c in ('--', '->', *sorted(PUNCTUATION)))
+_SLOW_PATH_CHARS = ('"', '/', '#', '<', '\\')
+
+# Palavras-chave do DOT (não diferenciam maiúsculas de minúsculas)
+KEYWORDS = frozenset(('strict', 'graph', 'digraph', 'subgraph', 'node', 'edge'))
+
+# Todas as grafias (Node, NODE, ...) -> palavra-chave: uma consulta ao dict
+# por comando, em vez de um tok.lower() para cada ID
+_KEYWORD_FORMS = {
+    ''.join(chars): keyword
+    for keyword in KEYWORDS
+    for chars in itertools.product(*((c, c.upper()) for c in keyword))
+}
+
+EDGE_OPS = ('--', '->')
+
+
+# Caminho rápido por linha (ver _parse_lines). A lista de atributos não
+# pode ter aspas, HTML, comentários nem outros colchetes/chaves/portas.
+_HEADER_LINE_RE = re.compile(r'\s*(di)?graph(?:\s+\w+)?\s*\{\s*$', re.IGNORECASE)
+_EDGE_LINE_RE = re.compile(
+    r'\s*(\w+)\s*(--|->)\s*(\w+)'
+    r'\s*(?:\[([^\[\]{}:"<>#/\\]*)\])?'
+    r'\s*;?\s*$'
+)
+_VERTEX_LINE_RE = re.compile(r'\s*(\w+)\s*;?\s*$')
+_CLOSING_LINE_RE = re.compile(r'\s*\}\s*;?\s*$')
+_WEIGHT_VALUE_RE = re.compile(r'weight\s*=\s*([^\s,;=]+)')
+_WEIGHT_ATTR_RE = re.compile(r'(?:^|[\s,;])weight\s*=\s*([^\s,;=\[\]{}:"<>#/\\]+)')
+
+
+class QuotedID(str):
+    """ID entre aspas ou HTML (<...>): nunca é palavra-chave nem pontuação."""
+    __slots__ = ()
+
+
+def tokenize(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Divide o conteúdo de um arquivo DOT em tokens, lendo em blocos.
+
+    Os blocos são cortados no último '\\n', para que nenhum token simples
+    fique dividido entre dois blocos; strings e comentários que atravessam
+    o corte continuam no bloco seguinte.
+
+    :param stream: Objeto de arquivo (modo texto) com o método read().
+    :param chunk_size: Quantidade de caracteres lidos por vez.
+    :return: Iterador de tokens (str; QuotedID para IDs entre aspas).
+    """
+    pending = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        text = pending + chunk
+        pending = ''
+
+        if not final:
+            cut = text.rfind('\n') + 1
+            if cut == 0:
+                # Nenhuma quebra de linha ainda: acumula mais um bloco
+                pending = text
+                continue
+            text, pending = text[:cut], text[cut:]
+
+        if not any(c in text for c in _SLOW_PATH_CHARS):
+            for c, padded in _PADDING:
+                if c in text:
+                    text = text.replace(c, padded)
+            yield from text.split()
+        else:
+            tokens, consumed = _scan(text, final)
+            yield from tokens
+            pending = text[consumed:] + pending
+
+        if final:
+            return
+
+
+def _scan(text, final):
+    """
+    Tokenizador caractere a caractere (caminho lento: aspas, comentários, HTML).
+
+    :param text: Trecho a ser tokenizado.
+    :param final: True se for o último trecho do arquivo.
+    :return: Tupla (tokens, consumed): se um token ficar incompleto no fim do
+             trecho (e não for o final), 'consumed' aponta para seu início.
+    """
+    tokens = []
+    append = tokens.append
+    i = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+            continue
+        start = i
+
+        if c == '"':
+            # String entre aspas: procura a aspa de fechamento não escapada
+            j = i + 1
+            while True:
+                j = text.find('"', j)
+                if j == -1:
+                    if final:
+                        raise ValueError("Erro de sintaxe: string entre aspas não terminada.")
+                    return tokens, start
+                backslashes = 0
+                k = j - 1
+                while k > i and text[k] == '\\':
+                    backslashes += 1
+                    k -= 1
+                if backslashes % 2 == 0:
+                    break
+                j += 1
+            value = text[i + 1:j].replace('\\\n', '').replace('\\"', '"')
+            append(QuotedID(value))
+            i = j + 1
+
+        elif c == '<':
+            # String HTML: <...> com sinais < > balanceados
+            depth = 0
+            j = i
+            while j < n:
+                if text[j] == '<':
+                    depth += 1
+                elif text[j] == '>':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j += 1
+            if j >= n:
+                if final:
+                    raise ValueError("Erro de sintaxe: string HTML (<...>) não terminada.")
+                return tokens, start
+            append(QuotedID(text[i + 1:j]))
+            i = j + 1
+
+        elif c == '/' and text.startswith('/*', i):
+            j = text.find('*/', i + 2)
+            if j == -1:
+                if final:
+                    raise ValueError("Erro de sintaxe: comentário /* */ não terminado.")
+                return tokens, start
+            i = j + 2
+
+        elif c == '#' or (c == '/' and text.startswith('//', i)):
+            # Comentário até o fim da linha
+            j = text.find('\n', i)
+            i = n if j == -1 else j + 1
+
+        elif c in PUNCTUATION:
+            append(c)
+            i += 1
+
+        elif c == '-' and text.startswith(EDGE_OPS, i):
+            append(text[i:i + 2])
+            i += 2
+
+        else:
+            # ID alfanumérico ou número (possivelmente negativo)
+            j = i + 1 if c == '-' else i
+            while j < n:
+                ch = text[j]
+                if ch.isalnum() or ch == '_' or ch == '.' or ch > '\x7f':
+                    j += 1
+                else:
+                    break
+            if j == i or (c == '-' and j == i + 1):
+                raise ValueError(f"Erro de sintaxe: caractere inesperado '{c}'.")
+            append(text[i:j])
+            i = j
+
+    return tokens, n
+
+
+# Tokens de pontuação e operadores (todo o resto é ID)
+SPECIAL_TOKENS = PUNCTUATION | frozenset(EDGE_OPS)
+
+
+def _is_special(tok):
+    """Verifica se o token é pontuação/operador (e não um QuotedID)."""
+    return type(tok) is str and tok in SPECIAL_TOKENS
+
+
+def _parse_tokens(tokens, compact):
+    """
+    Constrói o grafo a partir dos tokens, em uma única passada.
+
+    Cada comando é lido direto do iterador (next), sem pilha de chamadas
+    por token: o caso comum 'a -> b [weight=N];' passa por um único laço.
+
+    :param tokens: Iterável de tokens (ver tokenize).
+    :param compact: Se True, monta um CompactGraph; senão, um Graph.
+    :return: Um objeto Graph ou CompactGraph.
+    """
+    it = iter(tokens)
+
+    # --- 1. Cabeçalho: [strict] (graph | digraph) [nome] '{' ---
+
+    tok = next(it, None)
+    if type(tok) is str and tok.lower() == 'strict':
+        tok = next(it, None)
+    keyword = tok.lower() if type(tok) is str else None
+    if keyword not in ('graph', 'digraph'):
+        if tok is None:
+            raise ValueError("Não foi possível criar o grafo. O arquivo está vazio ou em formato inválido.")
+        raise ValueError(f"Arquivo DOT inválido: 'graph' ou 'digraph' não encontrado no início. Token: '{tok}'")
+    directed = (keyword == 'digraph')
+
+    tok = next(it, None)
+    if tok is not None and not _is_special(tok):
+        tok = next(it, None)  # Nome do grafo (ignorado)
+    if not (type(tok) is str and tok == '{'):
+        raise ValueError(f"Erro de sintaxe: '{{' esperado após o cabeçalho do grafo, encontrado '{tok}'.")
+
+    target = CompactGraphBuilder(directed=directed) if compact else Graph(directed=directed)
+    add_vertex, add_edge = target.add_vertex, target.add_edge
+    edge_op, wrong_op = ('->', '--') if directed else ('--', '->')
+    default_weight = 1.0
+    depth = 1
+
+    # --- 2. Comandos ---
+
+    tok = next(it, None)
+    while tok is not None:
+        if type(tok) is str:
+            if tok in SPECIAL_TOKENS:
+                if tok == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif tok == '{':
+                    depth += 1  # Subgrafo anônimo
+                elif tok != ';' and tok != ',':
+                    raise ValueError(f"Erro de sintaxe: token inesperado '{tok}'.")
+                tok = next(it, None)
+                continue
+
+            keyword = _KEYWORD_FORMS.get(tok)
+            if keyword is not None:
+                tok = next(it, None)
+                if keyword == 'subgraph':
+                    # Os comandos do subgrafo entram no grafo principal
+                    if tok is not None and not _is_special(tok):
+                        tok = next(it, None)
+                    if not (type(tok) is str and tok == '{'):
+                        raise ValueError("Erro de sintaxe: '{' esperado após 'subgraph'.")
+                    depth += 1
+                    tok = next(it, None)
+                elif keyword in ('graph', 'node', 'edge'):
+                    attrs = {}
+                    while type(tok) is str and tok == '[':
+                        tok = _parse_attr_list(it, attrs)
+                    if keyword == 'edge' and 'weight' in attrs:
+                        default_weight = _parse_weight(attrs['weight'])
+                else:
+                    raise ValueError(f"Erro de sintaxe: palavra-chave '{keyword}' inesperada.")
+                continue
+
+        # Comando de vértice ou de aresta: ID [porta] (op ID [porta])* [atributos]
+        chain = [str(tok)]
+        tok = next(it, None)
+        while type(tok) is str and tok in SPECIAL_TOKENS:
+            if tok == edge_op:
+                tok = next(it, None)
+                if tok is None or (type(tok) is str and tok in SPECIAL_TOKENS):
+                    if tok == '{':
+                        raise ValueError("Erro de sintaxe: subgrafos como extremidade de aresta não são suportados.")
+                    raise ValueError(f"Erro de sintaxe: vértice esperado após a aresta, encontrado '{tok}'.")
+                chain.append(str(tok))
+            elif tok == ':':
+                tok = next(it, None)  # Porta do vértice (ignorada)
+                if tok is None or _is_special(tok):
+                    raise ValueError(f"Erro de sintaxe: porta esperada após ':', encontrado '{tok}'.")
+            elif tok == wrong_op:
+                kind = "'--' (não direcionada)" if directed else "'->' (direcionada)"
+                graph_type = "'digraph'" if directed else "'graph'"
+                raise ValueError(f"Erro de sintaxe: Aresta {kind} usada em um {graph_type} (em '{chain[-1]} {tok} ...').")
+            else:
+                break
+            tok = next(it, None)
+
+        if type(tok) is str and tok == '=' and len(chain) == 1:
+            # 'ID = valor': atributo do grafo (ignorado)
+            tok = next(it, None)
+            if tok is None or _is_special(tok):
+                raise ValueError(f"Erro de sintaxe: valor esperado após '=', encontrado '{tok}'.")
+            tok = next(it, None)
+            continue
+
+        weight = default_weight
+        if type(tok) is str and tok == '[':
+            attrs = {}
+            while type(tok) is str and tok == '[':
+                tok = _parse_attr_list(it, attrs)
+            if 'weight' in attrs:
+                weight = _parse_weight(attrs['weight'])
+
+        if len(chain) == 2:
+            add_edge(chain[0], chain[1], weight)
+        elif len(chain) == 1:
+            add_vertex(chain[0])
+        else:
+            for k in range(len(chain) - 1):
+                add_edge(chain[k], chain[k + 1], weight)
+
+    # --- 3. Fim do arquivo ---
+
+    if depth != 0:
+        raise ValueError("Erro de sintaxe: fim do arquivo antes do '}' final.")
+    tok = next(it, None)
+    if tok is not None:
+        raise ValueError(f"Erro de sintaxe: conteúdo após o '}}' final: '{tok}'.")
+
+    if compact:
+        return target.build()
+    return target
+
+
+def _parse_attr_list(it, attrs):
+    """
+    Lê uma lista de atributos '[k=v, ...]' (o '[' já foi consumido).
+
+    :param it: Iterador de tokens.
+    :param attrs: Dicionário onde os atributos são acumulados.
+    :return: O token seguinte ao ']' (ou None no fim do arquivo).
+    """
+    tok = next(it, None)
+    while True:
+        if tok is None:
+            raise ValueError("Erro de sintaxe: fim do arquivo dentro de uma lista de atributos.")
+        if type(tok) is str and tok in SPECIAL_TOKENS:
+            if tok == ']':
+                return next(it, None)
+            if tok != ',' and tok != ';':
+                raise ValueError(f"Erro de sintaxe: atributo esperado, encontrado '{tok}'.")
+            tok = next(it, None)
+            continue
+
+        key = str(tok)
+        tok = next(it, None)
+        if type(tok) is str and tok == '=':
+            value = next(it, None)
+            if value is None or (type(value) is str and value in SPECIAL_TOKENS):
+                raise ValueError(f"Erro de sintaxe: valor esperado para o atributo '{key}', encontrado '{value}'.")
+            attrs[key] = str(value)
+            tok = next(it, None)
+        else:
+            attrs[key] = 'true'  # Atributo sem valor (ex: [bold])
+
+
+def _parse_weight(value):
+    """Converte o valor do atributo 'weight' para float."""
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Peso inválido: '{value}'.") from None
+
+
+def _parse_lines(lines, compact):
+    """
+    Caminho rápido: monta o grafo linha a linha, com uma expressão regular
+    por linha, quando o arquivo tem um comando por linha no formato simples
+    (cabeçalho, 'a -> b [atributos];', 'a;', comentários # e //, '}').
+
+    :param lines: Iterável de linhas (ex: o objeto de arquivo).
+    :param compact: Se True, monta um CompactGraph; senão, um Graph.
+    :return: O grafo, ou None se alguma linha sair do formato simples (o
+             arquivo deve então ser lido pelo tokenizador).
+    """
+    target = None
+    closed = False
+    edge_match = _EDGE_LINE_RE.match
+    vertex_match = _VERTEX_LINE_RE.match
+    keywords = _KEYWORD_FORMS
+    for line in lines:
+        if closed or target is None:
+            if not line or line.isspace() or line.lstrip().startswith(('#', '//')):
+                continue
+            if closed:
+                return None  # Conteúdo após o '}' final
+            match = _HEADER_LINE_RE.match(line)
+            if match is None:
+                return None
+            directed = match.group(1) is not None
+            target = CompactGraphBuilder(directed=directed) if compact else Graph(directed=directed)
+            add_vertex, add_edge = target.add_vertex, target.add_edge
+            edge_op = '->' if directed else '--'
+            continue
+
+        match = edge_match(line)
+        if match is not None:
+            u, op, v, attrs = match.groups()
+            if op != edge_op or u in keywords or v in keywords:
+                return None
+            weight = 1.0
+            if attrs:
+                # Como no dict de atributos, vale o último 'weight'
+                k = attrs.rfind('weight')
+                if k != -1:
+                    value = _WEIGHT_VALUE_RE.match(attrs, k) if k == 0 or attrs[k - 1] in ' \t,;' else None
+                    if value is None:
+                        values = _WEIGHT_ATTR_RE.findall(attrs)
+                        value = values[-1] if values else None
+                    else:
+                        value = value.group(1)
+                    if value is None:
+                        return None  # Ex: [weight] sem valor: o tokenizador decide
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        return None
+            add_edge(u, v, weight)
+            continue
+
+        match = vertex_match(line)
+        if match is not None:
+            if match.group(1) in keywords:
+                return None
+            add_vertex(match.group(1))
+            continue
+
+        if line.isspace() or line.lstrip().startswith(('#', '//')):
+            continue
+        if _CLOSING_LINE_RE.match(line):
+            closed = True
+            continue
+        return None
+
+    if not closed:
+        return None
+    if compact:
+        return target.build()
+    return target
+
+
+def parse_dot_stream(filepath, compact=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lê um arquivo .dot e o converte em um Graph (ou CompactGraph).
+
+    Tenta primeiro o caminho rápido por linha (_parse_lines); se o arquivo
+    não estiver no formato simples, relê tudo em blocos pelo tokenizador.
+
+    :param filepath: O caminho completo para o arquivo .dot.
+    :param compact: Se True, monta direto a forma compacta (CompactGraph),
+                    sem criar o dicionário de adjacência do Graph.
+    :param chunk_size: Quantidade de caracteres lidos por vez (tokenizador).
+    :return: Um objeto Graph ou CompactGraph.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        graph = _parse_lines(f, compact)
+        if graph is not None:
+            return graph
+        f.seek(0)
+        return _parse_tokens(tokenize(f, chunk_size), compact)
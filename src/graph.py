@@ -1,6 +1,10 @@
 """
 Usa uma lista de adjacência (implementada com dicionários) para armazenar os vértices e arestas
 """
+
+from .compact_graph import CompactGraph
+
+
 class Graph:
     def __init__(self, directed=False):
         """
@@ -16,6 +20,12 @@ class Graph:
         """
         self.adj_list = {}
         self.directed = directed
+        # Vira True ao adicionar uma aresta de peso negativo (ex: durante o
+        # parsing), sem precisar percorrer as arestas depois. Não volta a
+        # False se essa aresta for sobrescrita: o valor é conservador.
+        self.has_negative_weights = False
+        # Dados derivados, calculados sob demanda e descartados a cada alteração
+        self._frozen = None  # ver freeze()
 
     def add_vertex(self, vertex_label):
         """
@@ -25,6 +35,7 @@ class Graph:
         """
         if vertex_label not in self.adj_list:
             self.adj_list[vertex_label] = {}
+            self._invalidate_caches()
             # print(f"[Graph] Vértice adicionado: {vertex_label}") # Debug
 
     def add_edge(self, u, v, weight=1.0):
@@ -43,7 +54,10 @@ class Graph:
         self.add_vertex(v)
 
         # Adiciona a aresta de u para v
+        self._invalidate_caches()
         self.adj_list[u][v] = float(weight)
+        if weight < 0:
+            self.has_negative_weights = True
         # print(f"[Graph] Aresta adicionada: {u} -> {v} (peso {weight})") # Debug
 
         # Se o grafo não for direcionado, adiciona a aresta de volta
@@ -51,6 +65,57 @@ class Graph:
             self.adj_list[v][u] = float(weight)
             # print(f"[Graph] Aresta adicionada: {v} -> {u} (peso {weight})") # Debug
 
+    def remove_edge(self, u, v):
+        """
+        Remove a aresta entre os vértices 'u' e 'v' (e a reversa, se o grafo
+        não for direcionado). Os vértices continuam no grafo.
+
+        'has_negative_weights' não volta a False (o valor é conservador).
+
+        :param u: Vértice de origem.
+        :param v: Vértice de destino.
+        :return: O peso da aresta removida.
+        :raises KeyError: Se a aresta não existir.
+        """
+        if v not in self.adj_list.get(u, {}):
+            raise KeyError((u, v))
+
+        self._invalidate_caches()
+        weight = self.adj_list[u].pop(v)
+        if not self.directed:
+            self.adj_list[v].pop(u, None)
+        return weight
+
+    def copy(self):
+        """
+        Retorna uma cópia independente do grafo (alterações em uma não
+        afetam a outra).
+
+        :return: Um objeto Graph.
+        """
+        clone = Graph(directed=self.directed)
+        clone.adj_list = {u: dict(neighbors) for u, neighbors in self.adj_list.items()}
+        clone.has_negative_weights = self.has_negative_weights
+        return clone
+
+    @classmethod
+    def from_compact(cls, compact):
+        """
+        Constrói um Graph (alterável) a partir de um CompactGraph, na mesma
+        ordem de vértices e arestas.
+
+        :param compact: Objeto CompactGraph.
+        :return: Um objeto Graph.
+        """
+        graph = cls(directed=compact.directed)
+        labels = compact.labels
+        for i, u in enumerate(labels):
+            targets, weights = compact.neighbor_slice(i)
+            # Cada sentido de uma aresta não direcionada já está armazenado
+            graph.adj_list[u] = {labels[j]: w for j, w in zip(targets, weights)}
+        graph.has_negative_weights = compact.has_negative_weights
+        return graph
+
     def get_vertices(self):
         """
         Retorna uma lista de todos os vértices no grafo.
@@ -69,6 +134,38 @@ class Graph:
         """
         return self.adj_list.get(vertex_label, {})
 
+    def freeze(self):
+        """
+        Retorna a forma compacta (CSR, somente leitura) do grafo.
+
+        O resultado é reaproveitado até a próxima chamada de add_vertex/add_edge/
+        remove_edge.
+
+        :return: Um objeto CompactGraph.
+        """
+        if self._frozen is None:
+            self._frozen = CompactGraph.from_graph(self)
+        return self._frozen
+
+    def content_hash(self):
+        """
+        Retorna um hash (SHA-1) do conteúdo do grafo: tipo, vértices e arestas
+        com pesos, na ordem de inserção.
+
+        É o hash da forma compacta (freeze()), para que o mesmo grafo tenha
+        o mesmo hash lido como Graph ou direto como CompactGraph (ex: nas
+        chaves do cache de resultados). O valor é reaproveitado até a próxima
+        chamada de add_vertex/add_edge/remove_edge. Alterações feitas
+        diretamente em self.adj_list não invalidam o hash.
+
+        :return: str hexadecimal.
+        """
+        return self.freeze().content_hash()
+
+    def _invalidate_caches(self):
+        """Descarta os dados derivados (hash, forma compacta) após uma alteração."""
+        self._frozen = None
+
     def __str__(self):
         """Retorna uma representação em string do grafo (lista de adjacência)."""
         output = ""
@@ -0,0 +1,245 @@
+"""
+Instrumentação por etapa (fase) das requisições e dos algoritmos.
+
+Uma medição (Profile) é ativada com 'profiling()' e fica em uma ContextVar:
+cada thread (requisição do Flask ou job) tem a sua. Dentro dela, o código
+marca as etapas com 'phase(nome)' e soma contadores com 'count(nome, n)'.
+Fora de uma medição, phase() e count() não fazem nada (custo desprezível),
+então os algoritmos podem ser chamados normalmente.
+
+Cada etapa registra:
+- tempo de relógio (wall) e de CPU da thread;
+- pico de memória alocada (só se o tracemalloc estiver ativo; ver
+  start_memory_tracing()).
+
+O Profile vira o cabeçalho Server-Timing (server_timing()) e é somado no
+MetricsRegistry, exposto em formato texto do Prometheus (render()).
+"""
+import contextlib
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+
+_current_profile = ContextVar('profile', default=None)
+
+# Retornado por phase() fora de uma medição
+_NO_PHASE = contextlib.nullcontext()
+
+
+class Profile:
+    """Etapas e contadores medidos durante uma requisição ou um job."""
+
+    def __init__(self):
+        self.phases = []    # Registros das etapas, na ordem em que começaram
+        self.counters = {}
+        self._stack = []    # Etapas abertas (para o aninhamento e a memória)
+
+    def to_dict(self):
+        """Retorna as etapas e os contadores em formato serializável (JSON)."""
+        return {
+            'phases': [{key: value for key, value in record.items() if not key.startswith('_')}
+                       for record in self.phases],
+            'counters': dict(self.counters)
+        }
+
+    def server_timing(self):
+        """
+        Retorna o valor do cabeçalho Server-Timing (uma entrada por etapa).
+
+        :return: str no formato 'nome;dur=1.23, ...' (duração em ms).
+        """
+        return ', '.join(
+            f"{record['name']};dur={record['wall_ms']:.2f}"
+            for record in self.phases if 'wall_ms' in record
+        )
+
+
+class _Phase:
+    """Context manager de uma etapa dentro de um Profile."""
+
+    __slots__ = ('_profile', '_record')
+
+    def __init__(self, profile, name):
+        self._profile = profile
+        self._record = {'name': name, 'depth': len(profile._stack)}
+
+    def __enter__(self):
+        profile, record = self._profile, self._record
+        profile.phases.append(record)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # O reset_peak abaixo apaga o pico da etapa de fora: guarda-o antes
+            if profile._stack:
+                parent = profile._stack[-1]
+                parent['_max_peak'] = max(parent.get('_max_peak', 0), peak)
+            record['_start_memory'] = current
+            tracemalloc.reset_peak()
+        profile._stack.append(record)
+        record['_start_cpu'] = time.thread_time()
+        record['_start_wall'] = time.perf_counter()
+        return record
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        profile, record = self._profile, self._record
+        record['wall_ms'] = round((wall - record.pop('_start_wall')) * 1000, 3)
+        record['cpu_ms'] = round((cpu - record.pop('_start_cpu')) * 1000, 3)
+        profile._stack.pop()
+
+        if '_start_memory' in record and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], record.pop('_max_peak', 0))
+            record['alloc_peak_kb'] = round((peak - record.pop('_start_memory')) / 1024, 1)
+            if profile._stack:
+                parent = profile._stack[-1]
+                parent['_max_peak'] = max(parent.get('_max_peak', 0), peak)
+        return False
+
+
+@contextlib.contextmanager
+def profiling():
+    """
+    Ativa uma medição para o bloco (na thread/contexto atual).
+
+    Uso:
+        with profiling() as profile:
+            ...
+        profile.server_timing()
+    """
+    profile = Profile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def current_profile():
+    """Retorna a medição ativa (ou None)."""
+    return _current_profile.get()
+
+
+def phase(name):
+    """
+    Marca uma etapa: 'with phase("relax"): ...'. Sem medição ativa, não faz nada.
+
+    :param name: Nome da etapa (sem espaços; vai para o Server-Timing).
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return _NO_PHASE
+    return _Phase(profile, name)
+
+
+def count(name, amount=1):
+    """
+    Soma 'amount' ao contador 'name' da medição ativa (se houver).
+
+    Os algoritmos acumulam em variáveis locais e chamam count() uma vez por
+    etapa, nunca dentro dos laços internos.
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.counters[name] = profile.counters.get(name, 0) + amount
+
+
+def start_memory_tracing():
+    """
+    Ativa o tracemalloc (picos de memória por etapa).
+
+    O tracemalloc deixa as alocações bem mais lentas e mede o processo
+    inteiro: com várias requisições simultâneas, os picos se misturam.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+class MetricsRegistry:
+    """
+    Soma as medições (Profile) por etapa e por algoritmo e as exporta no
+    formato texto do Prometheus. Thread-safe.
+    """
+
+    def __init__(self, prefix='graph_app'):
+        """
+        :param prefix: Prefixo dos nomes das métricas.
+        """
+        self.prefix = prefix
+        self._phases = {}    # (etapa, algoritmo) -> [nº, wall (s), cpu (s), pico (bytes)]
+        self._counters = {}  # (contador, algoritmo) -> total
+        self._lock = threading.Lock()
+
+    def record(self, profile, algorithm=None):
+        """
+        Soma uma medição.
+
+        :param profile: Objeto Profile.
+        :param algorithm: Rótulo 'algorithm' das métricas (ex: 'Dijkstra').
+        """
+        algorithm = algorithm or ''
+        with self._lock:
+            for record in profile.phases:
+                if 'wall_ms' not in record:
+                    continue  # Etapa ainda aberta
+                entry = self._phases.setdefault((record['name'], algorithm), [0, 0.0, 0.0, 0])
+                entry[0] += 1
+                entry[1] += record['wall_ms'] / 1000
+                entry[2] += record['cpu_ms'] / 1000
+                if 'alloc_peak_kb' in record:
+                    entry[3] = max(entry[3], int(record['alloc_peak_kb'] * 1024))
+            for name, value in profile.counters.items():
+                key = (name, algorithm)
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def render(self, gauges=None):
+        """
+        Retorna as métricas no formato texto do Prometheus (versão 0.0.4).
+
+        :param gauges: dict opcional {nome: (ajuda, valor)} com métricas
+                       instantâneas extras (ex: tamanho dos caches).
+        :return: str
+        """
+        p = self.prefix
+        lines = []
+        with self._lock:
+            phases = sorted(self._phases.items())
+            counters = sorted(self._counters.items())
+
+        def labels(phase_name, algorithm):
+            return f'{{phase="{_escape(phase_name)}",algorithm="{_escape(algorithm)}"}}'
+
+        lines.append(f'# HELP {p}_phase_seconds Tempo de relógio por etapa.')
+        lines.append(f'# TYPE {p}_phase_seconds summary')
+        for (name, algorithm), (calls, wall, _, _) in phases:
+            lines.append(f'{p}_phase_seconds_sum{labels(name, algorithm)} {wall:.6f}')
+            lines.append(f'{p}_phase_seconds_count{labels(name, algorithm)} {calls}')
+
+        lines.append(f'# HELP {p}_phase_cpu_seconds_total Tempo de CPU (da thread) por etapa.')
+        lines.append(f'# TYPE {p}_phase_cpu_seconds_total counter')
+        for (name, algorithm), (_, _, cpu, _) in phases:
+            lines.append(f'{p}_phase_cpu_seconds_total{labels(name, algorithm)} {cpu:.6f}')
+
+        peaks = [(key, entry[3]) for key, entry in phases if entry[3]]
+        if peaks:
+            lines.append(f'# HELP {p}_phase_alloc_peak_bytes Maior pico de memória alocada por etapa (tracemalloc).')
+            lines.append(f'# TYPE {p}_phase_alloc_peak_bytes gauge')
+            for (name, algorithm), peak in peaks:
+                lines.append(f'{p}_phase_alloc_peak_bytes{labels(name, algorithm)} {peak}')
+
+        lines.append(f'# HELP {p}_operations_total Contadores dos algoritmos (relaxamentos, operações de heap, ...).')
+        lines.append(f'# TYPE {p}_operations_total counter')
+        for (name, algorithm), value in counters:
+            lines.append(f'{p}_operations_total{{counter="{_escape(name)}",algorithm="{_escape(algorithm)}"}} {value}')
+
+        for name, (help_text, value) in (gauges or {}).items():
+            lines.append(f'# HELP {p}_{name} {help_text}')
+            lines.append(f'# TYPE {p}_{name} gauge')
+            lines.append(f'{p}_{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    """Escapa um valor de rótulo do Prometheus."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
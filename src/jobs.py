@@ -0,0 +1,197 @@
+"""
+Fila de jobs em memória para execuções longas dos algoritmos.
+
+Em vez de executar o algoritmo dentro da requisição (prendendo o worker do
+Flask e estourando o timeout de proxies), o servidor cria um job e devolve
+seu id; o navegador consulta o status/progresso e busca o resultado no fim.
+
+- Os jobs rodam em um ThreadPoolExecutor com nº limitado de threads.
+- A fila tem profundidade máxima: acima dela, submit() lança QueueFullError.
+- O cancelamento é cooperativo: a função do job recebe um callback
+  'progress(fração)', que lança JobCancelled quando o job foi cancelado.
+- Jobs concluídos ficam disponíveis até serem descartados (os mais antigos
+  primeiro) quando passam de 'max_finished'.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Estados de um job
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class QueueFullError(Exception):
+    """A fila atingiu a profundidade máxima (max_queued)."""
+
+
+class JobCancelled(Exception):
+    """Lançada pelo callback de progresso quando o job foi cancelado."""
+
+
+class Job:
+    """Um job da fila: estado, progresso e resultado de uma execução."""
+
+    def __init__(self, description=None):
+        """
+        :param description: Texto/dict livre que descreve o job (ex: parâmetros).
+        """
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.status = QUEUED
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_requested = threading.Event()
+        self._finished = threading.Event()
+        self._future = None
+
+    def report_progress(self, fraction):
+        """
+        Callback passado à função do job: atualiza o progresso e interrompe a
+        execução (JobCancelled) se o cancelamento foi pedido.
+
+        :param fraction: Fração concluída (0 a 1).
+        """
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+
+    def wait(self, timeout=None):
+        """
+        Espera o job terminar (usado pelo long-polling).
+
+        :param timeout: Tempo máximo de espera em segundos.
+        :return: True se o job terminou.
+        """
+        return self._finished.wait(timeout)
+
+    def to_dict(self):
+        """Retorna o estado do job em formato serializável (JSON)."""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': round(self.progress, 4),
+            'error': self.error,
+            'description': self.description,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobQueue:
+    """Fila de jobs com um pool de threads limitado e profundidade máxima."""
+
+    def __init__(self, max_workers=2, max_queued=16, max_finished=100):
+        """
+        :param max_workers: Nº máximo de jobs executando ao mesmo tempo.
+        :param max_queued: Nº máximo de jobs esperando na fila.
+        :param max_finished: Nº de jobs concluídos mantidos para consulta.
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, description=None, **kwargs):
+        """
+        Cria um job que executa function(*args, progress=callback, **kwargs).
+
+        :param function: Função a executar; deve aceitar o argumento 'progress'.
+        :param description: Descrição do job (retornada no status).
+        :return: O objeto Job criado.
+        :raises QueueFullError: Se já houver max_queued jobs esperando.
+        """
+        with self._lock:
+            # Jobs além das threads disponíveis ficam aguardando na fila
+            active = sum(1 for job in self._jobs.values() if job.status in (QUEUED, RUNNING))
+            if active >= self.max_workers + self.max_queued:
+                raise QueueFullError(f'A fila de jobs está cheia ({active - self.max_workers} aguardando).')
+            job = Job(description)
+            self._jobs[job.id] = job
+            self._discard_old_jobs()
+            # Dentro do lock: _run (e cancel) só veem o job com o future definido
+            job._future = self._executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def _run(self, job, function, args, kwargs):
+        """Executa o job na thread do pool e registra o resultado."""
+        with self._lock:
+            if job._cancel_requested.is_set():
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        try:
+            result = function(*args, progress=job.report_progress, **kwargs)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            print(f"Erro [Jobs] no job {job.id}: {e}")
+            self._finish(job, FAILED, error=str(e))
+        else:
+            job.progress = 1.0
+            self._finish(job, DONE, result=result)
+
+    def _finish(self, job, status, result=None, error=None):
+        with self._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+        job._finished.set()
+
+    def get(self, job_id):
+        """Retorna o job pelo id (ou None se não existir)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancela um job: se ainda estiver na fila, ele nem começa; se estiver
+        executando, é interrompido no próximo relato de progresso.
+
+        :return: O job (ou None se não existir).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job._cancel_requested.set()
+            if job.status == QUEUED:
+                job._future.cancel()
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                job._finished.set()
+        return job
+
+    def _discard_old_jobs(self):
+        """Descarta os jobs concluídos mais antigos (chamado com o lock)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        """Retorna a contagem de jobs por estado e os limites da fila."""
+        with self._lock:
+            counts = {state: 0 for state in (QUEUED, RUNNING) + FINISHED_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return {
+            'max_workers': self.max_workers,
+            'max_queued': self.max_queued,
+            **counts
+        }
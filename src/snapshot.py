@@ -0,0 +1,232 @@
+"""
+Snapshots binários de grafos (.grs), carregados com mmap.
+
+Reinterpretar um .dot de centenas de MB a cada início do servidor é caro.
+O snapshot guarda o CompactGraph já pronto (arrays CSR e rótulos) e é aberto
+com mmap: os arrays do grafo são memoryviews sobre o próprio arquivo, sem
+cópia, e o sistema operacional só lê as páginas efetivamente usadas.
+
+Formato (little-endian, seções alinhadas em 8 bytes):
+- cabeçalho (HEADER): assinatura, direcionado, pesos negativos, nº de
+  vértices (n), nº de arestas (m), tamanho da tabela de rótulos e o
+  content_hash() do grafo;
+- offsets: n + 1 inteiros de 64 bits;
+- targets: m inteiros de 32 bits;
+- weights: m floats de 64 bits;
+- rótulos: UTF-8, separados por '\\0'.
+
+Exportar arquivos .dot (gera <nome>.grs ao lado de cada um):
+    python -m src.snapshot export graphs/graph01.dot [...]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .compact_graph import CompactGraph
+from .dot_stream_parser import parse_dot_stream
+
+# Extensão dos arquivos de snapshot
+SNAPSHOT_EXT = '.grs'
+
+MAGIC = b'GRSNAP\x00\x01'
+
+# Assinatura, direcionado, pesos negativos, n, m, bytes dos rótulos, hash (SHA-1)
+HEADER = struct.Struct('<8sBB6xQQQ20s4x')
+
+LABEL_SEPARATOR = '\0'
+
+
+def _align(size):
+    """Arredonda 'size' para o próximo múltiplo de 8."""
+    return (size + 7) & ~7
+
+
+class SnapshotGraph(CompactGraph):
+    """
+    CompactGraph somente leitura apoiado em um arquivo mapeado em memória.
+
+    offsets/targets/weights são memoryviews sobre o mmap (cópia zero). Os
+    rótulos só são decodificados no primeiro acesso a 'labels', e o índice
+    rótulo -> inteiro só é montado no primeiro acesso a 'index'.
+    """
+
+    def __init__(self, filepath, mapped, label_bytes, offsets, targets, weights,
+                 directed, has_negative_weights, content_hash):
+        if len(targets) != len(weights):
+            raise ValueError("CSR inválido: 'targets' e 'weights' devem ter o mesmo tamanho.")
+
+        self.filepath = filepath
+        self._mmap = mapped
+        self._label_bytes = label_bytes
+        self._labels = None
+        self._index = None
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+        self.has_negative_weights = has_negative_weights
+        self._content_hash = content_hash
+        self._reverse = None
+        self._derived = {}
+
+    @property
+    def labels(self):
+        """Lista de rótulos (índice -> rótulo), decodificada no primeiro acesso."""
+        if self._labels is None:
+            if self.num_vertices() == 0:
+                self._labels = []
+            else:
+                self._labels = bytes(self._label_bytes).decode('utf-8').split(LABEL_SEPARATOR)
+        return self._labels
+
+    def __reduce__(self):
+        """
+        Ao serializar (pickle), envia apenas o caminho: quem recebe (ex: um
+        processo do pool em multi_source.py) mapeia o mesmo arquivo.
+        """
+        return load_snapshot, (self.filepath,)
+
+
+def load_snapshot(filepath):
+    """
+    Abre um snapshot .grs com mmap e retorna o grafo (sem cópia dos arrays).
+
+    :param filepath: O caminho do arquivo .grs.
+    :return: Um objeto SnapshotGraph.
+    """
+    with open(filepath, 'rb') as f:
+        # O mapeamento continua válido depois que o arquivo é fechado
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < HEADER.size:
+        raise ValueError(f"Snapshot inválido (arquivo muito pequeno): {filepath}")
+    magic, directed, has_negative, n, m, label_size, digest = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Snapshot inválido (assinatura desconhecida): {filepath}")
+
+    # --- Posição de cada seção ---
+    offsets_start = HEADER.size
+    targets_start = offsets_start + 8 * (n + 1)
+    weights_start = targets_start + _align(4 * m)
+    labels_start = weights_start + 8 * m
+    if len(mapped) != labels_start + label_size:
+        raise ValueError(f"Snapshot inválido (tamanho inconsistente): {filepath}")
+
+    view = memoryview(mapped)
+    offsets = view[offsets_start:targets_start].cast('q')
+    targets = view[targets_start:targets_start + 4 * m].cast('i')
+    weights = view[weights_start:labels_start].cast('d')
+    labels = view[labels_start:]
+
+    if sys.byteorder != 'little':
+        # Máquina big-endian: sem cópia zero, converte para arrays nativos
+        offsets, targets, weights = array('q', offsets), array('i', targets), array('d', weights)
+        for buffer in (offsets, targets, weights):
+            buffer.byteswap()
+
+    return SnapshotGraph(
+        filepath, mapped, labels, offsets, targets, weights,
+        directed=bool(directed),
+        has_negative_weights=bool(has_negative),
+        content_hash=digest.hex()
+    )
+
+
+def save_snapshot(graph, filepath):
+    """
+    Grava o grafo em um snapshot .grs.
+
+    O arquivo é escrito com outro nome e renomeado no fim, para que um
+    servidor em execução nunca mapeie um snapshot pela metade.
+
+    :param graph: Objeto grafo (Graph ou CompactGraph).
+    :param filepath: O caminho do arquivo .grs a ser criado.
+    """
+    compact = graph.freeze()
+    labels = list(compact.labels)
+    for label in labels:
+        if not isinstance(label, str) or LABEL_SEPARATOR in label:
+            raise ValueError(f"Rótulo não suportado no snapshot: {label!r}")
+    label_bytes = LABEL_SEPARATOR.join(labels).encode('utf-8')
+
+    offsets = array('q', compact.offsets)
+    targets = array('i', compact.targets)
+    weights = array('d', compact.weights)
+    if sys.byteorder != 'little':
+        for buffer in (offsets, targets, weights):
+            buffer.byteswap()
+
+    header = HEADER.pack(
+        MAGIC, compact.directed, compact.has_negative_weights,
+        len(labels), len(targets), len(label_bytes),
+        bytes.fromhex(compact.content_hash())
+    )
+
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(offsets)
+        f.write(targets)
+        f.write(b'\0' * (_align(4 * len(targets)) - 4 * len(targets)))
+        f.write(weights)
+        f.write(label_bytes)
+    os.replace(tmp_path, filepath)
+
+
+def snapshot_path(filepath):
+    """Retorna o caminho do snapshot correspondente a um .dot/.gv."""
+    return os.path.splitext(filepath)[0] + SNAPSHOT_EXT
+
+
+def is_snapshot(filepath):
+    """Verifica, pela extensão, se o arquivo é um snapshot."""
+    return filepath.endswith(SNAPSHOT_EXT)
+
+
+def load_graph(filepath):
+    """
+    Carrega um grafo de um snapshot (.grs) ou de um arquivo DOT (.dot/.gv).
+
+    :param filepath: O caminho do arquivo.
+    :return: Um objeto CompactGraph (SnapshotGraph, no caso de um .grs).
+    """
+    if is_snapshot(filepath):
+        return load_snapshot(filepath)
+    return parse_dot_stream(filepath, compact=True)
+
+
+def export(paths, output=None):
+    """
+    Converte arquivos DOT em snapshots.
+
+    :param paths: Lista de caminhos de arquivos .dot/.gv.
+    :param output: Caminho de saída (apenas quando há um único arquivo);
+                   por padrão, <nome>.grs ao lado do original.
+    """
+    if output and len(paths) != 1:
+        raise ValueError("A opção -o só pode ser usada com um único arquivo.")
+
+    for path in paths:
+        target = output or snapshot_path(path)
+        graph = parse_dot_stream(path, compact=True)
+        save_snapshot(graph, target)
+        print(f"[Snapshot] {path} -> {target} ({graph.num_vertices()} vértices, {graph.num_edges()} arestas)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.snapshot', description='Snapshots binários (.grs) de grafos.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help='Converte arquivos .dot/.gv em snapshots.')
+    export_parser.add_argument('paths', nargs='+', help='Arquivos .dot/.gv.')
+    export_parser.add_argument('-o', '--output', help='Arquivo de saída (com um único arquivo de entrada).')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        export(args.paths, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 /**
  * Busca a lista de grafos disponíveis no servidor.
- * @returns {Promise<Object>} Uma promessa que resolve para o objeto { graphs: [], digraphs: [] }.
+ * @returns {Promise<Object>} Uma promessa que resolve para o objeto { graphs: [], digraphs: [], details: {} },
+ *   onde details[pasta][arquivo] traz as estatísticas do catálogo (vértices, arestas, ...).
  */
 export async function fetchAvailableGraphs() {
     try {
@@ -19,6 +20,112 @@ export async function fetchAvailableGraphs() {
     } catch (error) {
         console.error('Erro ao buscar lista de grafos:', error);
         // Retorna um objeto vazio em caso de falha para a UI não quebrar
-        return { graphs: [], digraphs: [] };
+        return { graphs: [], digraphs: [], details: { graphs: {}, digraphs: {} } };
     }
-}
\ No newline at end of file
+}
+
+/**
+ * Monta a query string com os parâmetros que identificam o resultado
+ * entre todos os pares (arquivo, tipo do grafo e algoritmo).
+ * @param {Object} source - { graphFile, graphType, algorithm }.
+ * @param {Object} extra - Parâmetros adicionais.
+ * @returns {string}
+ */
+function allPairsQuery(source, extra) {
+    return new URLSearchParams({
+        graph_file: source.graphFile,
+        graph_type: source.graphType,
+        algorithm: source.algorithm,
+        ...extra
+    }).toString();
+}
+
+/**
+ * Busca um bloco (tile) da matriz de distâncias entre todos os pares.
+ * @param {Object} source - { graphFile, graphType, algorithm }.
+ * @param {number} rowStart - Primeira linha do bloco.
+ * @param {number} colStart - Primeira coluna do bloco.
+ * @param {number} size - Lado do bloco (linhas e colunas).
+ * @returns {Promise<Object>} { rows: [], cols: [], distances: [[]], num_rows, num_cols, ... }.
+ */
+export async function fetchTile(source, rowStart, colStart, size) {
+    const query = allPairsQuery(source, { row_start: rowStart, col_start: colStart, rows: size, cols: size });
+    const response = await fetch(`/api/all-pairs/tile?${query}`);
+    const data = await response.json();
+    if (!response.ok || !data.success) {
+        throw new Error(data.error || `Erro de rede: ${response.statusText}`);
+    }
+    return data;
+}
+
+/**
+ * Busca a distância e o caminho mínimo de um único par (u, v).
+ * @param {Object} source - { graphFile, graphType, algorithm }.
+ * @param {string} u - Vértice de origem.
+ * @param {string} v - Vértice de destino.
+ * @returns {Promise<Object>} { distance, path, ... }.
+ */
+export async function fetchPair(source, u, v) {
+    const query = allPairsQuery(source, { source: u, target: v });
+    const response = await fetch(`/api/pair?${query}`);
+    const data = await response.json();
+    if (!response.ok || !data.success) {
+        throw new Error(data.error || `Erro de rede: ${response.statusText}`);
+    }
+    return data;
+}
+
+
+/**
+ * Cria um job no servidor para executar o algoritmo fora da requisição.
+ * @param {Object} data - O mesmo JSON enviado para /run-algorithm.
+ * @returns {Promise<Object>} Estado inicial do job ({ job_id, status, progress, ... }).
+ */
+export async function submitJob(data) {
+    const response = await fetch('/api/jobs', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    });
+    const job = await response.json();
+    if (!response.ok || !job.success) {
+        throw new Error(job.error || `Erro de rede: ${response.statusText}`);
+    }
+    return job;
+}
+
+/**
+ * Consulta o status de um job (long-polling: o servidor segura a resposta
+ * por até 'waitSeconds' segundos ou até o job terminar).
+ * @param {string} jobId
+ * @param {number} waitSeconds
+ * @returns {Promise<Object>} { job_id, status, progress, error, ... }.
+ */
+export async function fetchJobStatus(jobId, waitSeconds = 20) {
+    const response = await fetch(`/api/jobs/${jobId}?wait=${waitSeconds}`);
+    const job = await response.json();
+    if (!response.ok || !job.success) {
+        throw new Error(job.error || `Erro de rede: ${response.statusText}`);
+    }
+    return job;
+}
+
+/**
+ * Busca a página de resultados (HTML) de um job concluído.
+ * @param {string} jobId
+ * @returns {Promise<string>}
+ */
+export async function fetchJobResult(jobId) {
+    const response = await fetch(`/api/jobs/${jobId}/result`);
+    return response.text();
+}
+
+/**
+ * Pede o cancelamento de um job.
+ * @param {string} jobId
+ * @returns {Promise<Object>} Estado do job após o pedido.
+ */
+export async function cancelJob(jobId) {
+    const response = await fetch(`/api/jobs/${jobId}`, { method: 'DELETE' });
+    return response.json();
+}
@@ -3,12 +3,24 @@
  */
 
 // Importa a função de responsabilidade única do api.js
-import { fetchAvailableGraphs } from './api.js';
+import { fetchAvailableGraphs, submitJob, fetchJobStatus, fetchJobResult, cancelJob } from './api.js';
+import { initTiledResults } from './results-tiles.js';
 
 // --- Variáveis Globais ---
 let availableGraphs = {
     graphs: [],
-    digraphs: []
+    digraphs: [],
+    details: { graphs: {}, digraphs: {} }
+};
+
+// Nomes exibidos dos algoritmos recomendados pelo catálogo
+const ALGORITHM_NAMES = {
+    prim: 'Prim',
+    kruskal: 'Kruskal',
+    dijkstra: 'Dijkstra',
+    bellman_ford: 'Bellman-Ford',
+    floyd_warshall: 'Floyd-Warshall',
+    johnson: 'Johnson'
 };
 
 // --- Referências aos elementos do DOM ---
@@ -20,6 +32,7 @@ const fileContainer = document.getElementById('graph-file-container');
 const startVertexDiv = document.getElementById('start-vertex-selection');
 const startVertexInput = document.getElementById('start-vertex-input');
 const submitButton = document.getElementById('submit-button');
+const cancelButton = document.getElementById('cancel-button');
 const algorithmForm = document.getElementById('algorithm-form');
 
 // --- Definições das Funções de Lógica ---
@@ -32,7 +45,7 @@ function handleAlgorithmChange(event) {
     resetStep(3);
     resetStep(4);
 
-    if (selectedAlgorithm === 'prim') {
+    if (['prim', 'kruskal', 'boruvka', 'auto_mst'].includes(selectedAlgorithm)) {
         // Pula direto para a Etapa 3, forçando "Não Direcionado"
         typeSelectionDiv.style.display = 'none';
         document.getElementById('graph_type_undirected').checked = true;
@@ -41,17 +54,29 @@ function handleAlgorithmChange(event) {
         populateGraphFiles('graphs');
         fileSelectionDiv.style.display = 'block';
 
+        // MOSTRA a Etapa 4 (Vértice Inicial) só para o Prim; os demais
+        // montam a floresta de todos os componentes
+        startVertexDiv.style.display = (selectedAlgorithm === 'prim') ? 'block' : 'none';
+
+    } else if (selectedAlgorithm === 'dag_longest') {
+        // Só grafos direcionados podem ser acíclicos: pula para a Etapa 3
+        typeSelectionDiv.style.display = 'none';
+        document.getElementById('graph_type_directed').checked = true;
+
+        populateGraphFiles('digraphs');
+        fileSelectionDiv.style.display = 'block';
+
         // MOSTRA a Etapa 4 (Vértice Inicial)
         startVertexDiv.style.display = 'block';
 
-    } else if (selectedAlgorithm === 'bellman_ford') {
+    } else if (['bellman_ford', 'dijkstra', 'auto'].includes(selectedAlgorithm)) {
         // Mostra a Etapa 2
         typeSelectionDiv.style.display = 'block';
         
         // MOSTRA a Etapa 4 (Vértice Inicial)
         startVertexDiv.style.display = 'block';
 
-    } else if (selectedAlgorithm === 'floyd_warshall') {
+    } else if (['floyd_warshall', 'johnson', 'auto_all_pairs'].includes(selectedAlgorithm)) {
         // Mostra a Etapa 2
         typeSelectionDiv.style.display = 'block';
         
@@ -74,6 +99,7 @@ function handleGraphTypeChange(event) {
  */
 function populateGraphFiles(folder) {
     const files = availableGraphs[folder]; // Lê da var global
+    const details = (availableGraphs.details || {})[folder] || {};
     fileContainer.innerHTML = ''; // Limpa a lista anterior
     
     if (!files || files.length === 0) {
@@ -95,16 +121,68 @@ function populateGraphFiles(folder) {
         files.forEach(file => {
             const option = document.createElement('option');
             option.value = file;
-            option.text = file;
+            option.text = describeGraph(file, details[file]);
             selectList.appendChild(option);
         });
 
+        const hint = document.createElement('div');
+        hint.id = 'graph-recommendation';
+        hint.className = 'form-text';
+
         selectList.addEventListener('change', () => {
             submitButton.disabled = (selectList.value === "");
+            hint.textContent = recommendationText(details[selectList.value]);
         });
 
         fileContainer.appendChild(selectList);
+        fileContainer.appendChild(hint);
+    }
+}
+
+/**
+ * Formata o tamanho de um arquivo (bytes) para exibição.
+ */
+function formatSize(bytes) {
+    if (bytes < 1024) return `${bytes} B`;
+    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+}
+
+/**
+ * Texto da opção de um grafo: nome, vértices, arestas e tamanho do arquivo
+ * (estatísticas do catálogo; só o nome enquanto não foram calculadas).
+ */
+function describeGraph(file, entry) {
+    if (!entry || entry.vertices === null) {
+        return file;
     }
+    return `${file} (${entry.vertices} vértices, ${entry.edges} arestas, ${formatSize(entry.size)})`;
+}
+
+/**
+ * Texto com o algoritmo recomendado pelo catálogo para o grafo e o
+ * algoritmo escolhido na Etapa 1 (o mesmo que o modo automático usaria).
+ */
+function recommendationText(entry) {
+    const selected = document.querySelector('input[name="algorithm"]:checked');
+    if (!entry || !entry.recommended || !selected) {
+        return '';
+    }
+    if (selected.value === 'dag_longest') {
+        return entry.acyclic ? 'Grafo acíclico (DAG): caminhos mais longos disponíveis' : 'O grafo possui ciclos: escolha um grafo acíclico';
+    }
+    let family = 'all_pairs';
+    if (['prim', 'kruskal', 'boruvka', 'auto_mst'].includes(selected.value)) {
+        family = 'mst';
+    } else if (['bellman_ford', 'dijkstra', 'auto'].includes(selected.value)) {
+        family = 'single_source';
+    }
+    const recommended = entry.recommended[family];
+    if (!recommended) {
+        return '';
+    }
+    const weights = entry.has_negative_weights ? 'com pesos negativos' : 'sem pesos negativos';
+    return `Recomendado para este grafo (${weights}): ${ALGORITHM_NAMES[recommended] || recommended}`;
 }
 
 /**
@@ -129,8 +207,26 @@ function resetStep(step) {
 
 
 /**
- * Intercepta o envio do formulário, envia os dados como JSON via fetch
- * e exibe a página de resultados.
+ * Acompanha um job até ele terminar, mostrando o progresso no botão.
+ * Usa long-polling: cada consulta fica aberta no servidor até o job
+ * terminar ou o tempo de espera acabar.
+ * @param {string} jobId
+ * @returns {Promise<Object>} O estado final do job.
+ */
+async function waitForJob(jobId) {
+    while (true) {
+        const job = await fetchJobStatus(jobId);
+        if (['done', 'failed', 'cancelled'].includes(job.status)) {
+            return job;
+        }
+        const label = (job.status === 'queued') ? 'Na fila...' : `Executando... ${Math.round(job.progress * 100)}%`;
+        submitButton.textContent = label;
+    }
+}
+
+/**
+ * Intercepta o envio do formulário, cria um job com os dados em JSON,
+ * acompanha o progresso e exibe a página de resultados.
  */
 async function handleFormSubmit(event) {
     // 1. Impede o envio padrão do formulário
@@ -165,26 +261,32 @@ async function handleFormSubmit(event) {
     console.log("Enviando JSON para o servidor:", JSON.stringify(data, null, 2));
 
     try {
-        // 4. Envia os dados como JSON usando fetch
-        const response = await fetch(algorithmForm.action, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(data)
-        });
+        // 4. Cria o job no servidor (a execução não prende a requisição)
+        const job = await submitJob(data);
 
-        // 5. Pega a resposta. O servidor enviará a página HTML de resultados
-        const resultHtml = await response.text();
+        // Permite cancelar enquanto o job estiver na fila ou executando
+        cancelButton.style.display = 'inline-block';
+        cancelButton.onclick = () => cancelJob(job.job_id);
+
+        // 5. Espera o job terminar e busca a página HTML de resultados
+        await waitForJob(job.job_id);
+        const resultHtml = await fetchJobResult(job.job_id);
 
         // 6. Substitui o conteúdo da página atual pela página de resultados
         document.body.innerHTML = resultHtml;
+
+        // 7. Matrizes grandes vêm em blocos: inicia a busca dos tiles
+        const tiledResults = document.getElementById('tiled-results');
+        if (tiledResults) {
+            initTiledResults(tiledResults);
+        }
         
     } catch (error) {
         console.error('Erro ao submeter o formulário:', error);
         alert('Ocorreu um erro ao processar sua solicitação. Verifique o console.');
         submitButton.disabled = false;
         submitButton.textContent = 'Executar Algoritmo';
+        cancelButton.style.display = 'none';
     }
 }
 
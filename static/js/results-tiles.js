@@ -0,0 +1,106 @@
+/**
+ * Exibição paginada da matriz de distâncias entre todos os pares.
+ *
+ * Para grafos grandes, a página de resultados traz apenas um contêiner
+ * (#tiled-results); a matriz é buscada em blocos (tiles) conforme o usuário
+ * navega, e o caminho de um par só é buscado quando a célula é clicada.
+ */
+
+import { fetchTile, fetchPair } from './api.js';
+
+/**
+ * Inicializa a navegação por blocos dentro do contêiner.
+ * @param {HTMLElement} root - O elemento #tiled-results.
+ */
+export function initTiledResults(root) {
+    const source = {
+        graphFile: root.dataset.graphFile,
+        graphType: root.dataset.graphType,
+        algorithm: root.dataset.algorithm
+    };
+    const size = parseInt(root.dataset.tileSize, 10);
+    const table = root.querySelector('.tile-table');
+    const position = root.querySelector('.tile-position');
+    const pathInfo = root.querySelector('.tile-path');
+
+    let rowStart = 0;
+    let colStart = 0;
+    let numRows = parseInt(root.dataset.numVertices, 10);
+    let numCols = numRows;
+
+    async function load() {
+        position.textContent = 'Carregando...';
+        try {
+            const tile = await fetchTile(source, rowStart, colStart, size);
+            numRows = tile.num_rows;
+            numCols = tile.num_cols;
+            renderTile(table, tile);
+            const rowEnd = rowStart + tile.rows.length;
+            const colEnd = colStart + tile.cols.length;
+            position.textContent = `Linhas ${rowStart + 1}-${rowEnd} de ${numRows}, colunas ${colStart + 1}-${colEnd} de ${numCols}`;
+        } catch (error) {
+            console.error('Erro ao buscar bloco da matriz:', error);
+            position.textContent = `Erro: ${error.message}`;
+        }
+    }
+
+    // Navegação entre blocos
+    root.querySelectorAll('.tile-nav button').forEach(button => {
+        button.addEventListener('click', () => {
+            const move = button.dataset.move;
+            if (move === 'up') rowStart = Math.max(0, rowStart - size);
+            if (move === 'down' && rowStart + size < numRows) rowStart += size;
+            if (move === 'left') colStart = Math.max(0, colStart - size);
+            if (move === 'right' && colStart + size < numCols) colStart += size;
+            load();
+        });
+    });
+
+    // Caminho sob demanda: um clique em uma célula busca apenas aquele par
+    table.addEventListener('click', async (event) => {
+        const cell = event.target.closest('td');
+        if (!cell) return;
+        try {
+            const pair = await fetchPair(source, cell.dataset.u, cell.dataset.v);
+            pathInfo.textContent = pair.path
+                ? `${pair.source} → ${pair.target}: ${pair.path.join(' → ')} (custo ${pair.distance.toFixed(2)})`
+                : `${pair.source} → ${pair.target}: Inacessível`;
+        } catch (error) {
+            console.error('Erro ao buscar caminho:', error);
+            pathInfo.textContent = `Erro: ${error.message}`;
+        }
+    });
+
+    load();
+}
+
+/**
+ * Desenha um bloco na tabela (substitui o bloco anterior).
+ * @param {HTMLTableElement} table
+ * @param {Object} tile - Resposta de fetchTile.
+ */
+function renderTile(table, tile) {
+    table.innerHTML = '';
+
+    const header = table.createTHead().insertRow();
+    header.appendChild(cellWithText('th', 'De \\ Para'));
+    tile.cols.forEach(v => header.appendChild(cellWithText('th', v)));
+
+    const body = table.createTBody();
+    tile.rows.forEach((u, i) => {
+        const row = body.insertRow();
+        row.appendChild(cellWithText('th', u));
+        tile.distances[i].forEach((d, j) => {
+            const cell = cellWithText('td', d === null ? '∞' : d.toFixed(2));
+            cell.dataset.u = u;
+            cell.dataset.v = tile.cols[j];
+            row.appendChild(cell);
+        });
+    });
+}
+
+function cellWithText(tag, text) {
+    const cell = document.createElement(tag);
+    cell.textContent = text;
+    return cell;
+}
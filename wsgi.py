@@ -0,0 +1,22 @@
+"""
+Ponto de entrada WSGI para o modo de produção.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Ao importar o app com PRELOAD_GRAPHS=1, todos os grafos de GRAPH_DIR e
+DIGRAPH_DIR são carregados (ver preload_graphs em app.py). Com o
+preload_app do gunicorn, isso acontece uma única vez no processo mestre;
+os workers são criados por fork e compartilham essa memória.
+"""
+import gc
+import os
+
+os.environ.setdefault('PRELOAD_GRAPHS', '1')
+
+from app import app  # noqa: E402  (carrega os grafos)
+
+# Move os objetos já criados (grafos, rótulos, índices) para a geração
+# permanente do coletor de lixo: as coletas nos workers não percorrem esses
+# objetos, então as páginas de memória deles não são tocadas e continuam
+# compartilhadas com o mestre (copy-on-write) em vez de serem copiadas.
+gc.freeze()